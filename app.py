@@ -1,8 +1,10 @@
 # app.py
 
-from fastapi import FastAPI, Request
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, File, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from starlette.responses import HTMLResponse, RedirectResponse
@@ -10,13 +12,117 @@ from uvicorn import run as app_run
 
 from typing import Optional
 
-from AutoClaimML.constants import APP_HOST, APP_PORT
+from AutoClaimML.constants import APP_HOST, APP_PORT, TRAINING_PIPELINE_STAGES
+from AutoClaimML.configuration.configuration import ConfigurationManager
 from AutoClaimML.pipeline.prediction_pipeline import VehicleData, VehicleDataClassifier
-from AutoClaimML.pipeline.training_pipeline import TrainingPipeline
+from AutoClaimML.serving.model_holder import model_holder
+from AutoClaimML.serving.model_watcher import ModelWatcher
+from AutoClaimML.serving.micro_batcher import PredictionBatcher
+from AutoClaimML.serving.arrow_ipc import (ARROW_STREAM_CONTENT_TYPE, is_arrow_stream,
+                                            read_arrow_batch, write_arrow_predictions)
+from AutoClaimML.serving.admission import AdmissionController, AdmissionMiddleware
+from AutoClaimML.serving.metrics import (PREDICTION_BATCH_QUEUE_DEPTH, PREDICTION_CACHE_HIT_RATIO,
+                                         observe_stage, render_metrics)
+from AutoClaimML.serving.request_metrics import RequestMetricsMiddleware
+from AutoClaimML.serving.server_timing import ServerTimingMiddleware
+from AutoClaimML.serving.prediction_cache import PredictionCache
+from AutoClaimML.serving.executors import ExecutorSaturatedError, create_inference_executor
+from AutoClaimML.serving.training_jobs import TrainingJobManager
+from AutoClaimML.serving.batch_prediction import (BatchRecordValidator,
+                                                  BatchValidationError,
+                                                  format_batch_predictions)
+from AutoClaimML.serving.file_scoring import FileScorer, UnsupportedFileError, detect_file_format
 from AutoClaimML.logger import logging
+from AutoClaimML.utils.stage_timing import add_stage_observer, record_request_stage, timed_stage
+
+serving_config = ConfigurationManager().get_serving_config()
+
+# Per-stage latencies (parse, encode, transform, predict, model_load) go to Prometheus
+add_stage_observer(observe_stage)
+if serving_config.server_timing_enabled:
+    add_stage_observer(record_request_stage)
+batch_record_validator = BatchRecordValidator(max_records=serving_config.batch_prediction_max_records)
+
+# Blocking work runs on bounded pools so the event loop only does I/O
+inference_executor = create_inference_executor(
+    max_workers=serving_config.inference_executor_workers,
+    max_queue_size=serving_config.inference_executor_max_queue
+)
+
+# Repeated form submissions are answered without evaluating the forest
+if serving_config.prediction_cache_enabled:
+    model_holder.attach_prediction_cache(PredictionCache(
+        max_entries=serving_config.prediction_cache_max_entries,
+        ttl_seconds=serving_config.prediction_cache_ttl_seconds
+    ))
+
+# Training runs as background jobs in isolated processes; the training stack
+# (mlflow, imblearn, pymongo, components) is only imported there, keeping
+# this module's import graph small for fast worker startup
+training_jobs = TrainingJobManager(
+    stages=TRAINING_PIPELINE_STAGES,
+    history_size=serving_config.training_job_history_size,
+    poll_interval_seconds=serving_config.training_job_poll_interval_seconds,
+    cancel_grace_seconds=serving_config.training_job_cancel_grace_seconds,
+    state_dir=serving_config.training_job_state_dir
+)
+
+# Coalesces concurrent single-row form predictions into one model call
+prediction_batcher = PredictionBatcher(
+    predict_fn=lambda records: inference_executor.run(
+        VehicleDataClassifier(decision_threshold=serving_config.decision_threshold).predict_records, records
+    ),
+    max_batch_size=serving_config.prediction_batch_max_size,
+    max_wait_seconds=serving_config.prediction_batch_max_wait_seconds,
+    max_concurrent_batches=serving_config.inference_executor_workers
+)
+
+
+def score_batch(vehicle_df, threshold=None):
+    """
+    Scores a validated batch with the served model (runs on the inference executor).
+    """
+    served_model = model_holder.get_served_model()
+    labels, probabilities = served_model.estimator.loaded_model.predict_with_proba(vehicle_df, threshold=threshold)
+    return labels, probabilities, served_model.model_version
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Loads and warms up the production model once per worker before serving traffic.
+    A failed load is not fatal: readiness reports it and requests retry the load.
+    The model watcher then hot-swaps newly pushed models in the background.
+    """
+    try:
+        model_holder.load()
+    except Exception as e:
+        logging.error(f"Production model could not be loaded at startup: {e}")
+
+    model_watcher = None
+    if serving_config.model_watcher_enabled:
+        model_watcher = ModelWatcher(
+            holder=model_holder,
+            poll_interval_seconds=serving_config.model_watcher_poll_interval_seconds
+        )
+        model_watcher.start()
+
+    if serving_config.prediction_batching_enabled:
+        prediction_batcher.start()
+
+    yield
+
+    if serving_config.prediction_batching_enabled:
+        await prediction_batcher.stop()
+
+    if model_watcher is not None:
+        await model_watcher.stop()
+
+    await training_jobs.shutdown()
+    inference_executor.shutdown()
 
 # Initialize FastAPI application
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Mount the 'static' directory for serving static files (like CSS)
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -27,6 +133,22 @@ templates = Jinja2Templates(directory='templates')
 # Allow all origins for Cross-Origin Resource Sharing (CORS)
 origins = ["*"]
 
+# Load shedding: prediction requests beyond the in-flight and queue limits are
+# answered 503 with Retry-After at once; the queue depth is exported for autoscaling
+admission_controller = None
+if serving_config.admission_control_enabled:
+    admission_controller = AdmissionController(
+        max_in_flight=serving_config.admission_max_in_flight,
+        max_queue=serving_config.admission_max_queue,
+        max_queue_wait_seconds=serving_config.admission_max_queue_wait_seconds
+    )
+    app.add_middleware(
+        AdmissionMiddleware,
+        controller=admission_controller,
+        routes=[("POST", "/"), ("POST", "/predict/batch"), ("POST", "/predict/file")],
+        retry_after_seconds=serving_config.admission_retry_after_seconds
+    )
+
 # Configure middleware to handle CORS, allowing requests from any origin
 app.add_middleware(
     CORSMiddleware,
@@ -36,6 +158,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request counts, error counts and latency per route
+app.add_middleware(RequestMetricsMiddleware)
+
+# Optional per-request stage breakdown for clients and load-test traces
+if serving_config.server_timing_enabled:
+    app.add_middleware(ServerTimingMiddleware)
+
+def overloaded_response(error: Exception) -> JSONResponse:
+    """
+    503 response for a request shed because the inference executor is saturated.
+    """
+    return JSONResponse(
+        {"status": False, "error": f"{error}"},
+        status_code=503,
+        headers={"Retry-After": str(serving_config.admission_retry_after_seconds)}
+    )
+
 class DataForm:
     """
     DataForm class to handle and process incoming form data.
@@ -81,22 +220,74 @@ async def index(request: Request):
     Renders the main HTML form page for vehicle data input.
     """
     return templates.TemplateResponse(
-            "vehicledata.html",{"request": request, "context": "Rendering"})
+            request, "vehicledata.html", {"context": "Rendering"})
+
+# Readiness probe for load balancers and orchestrators
+@app.get("/health/ready")
+async def readiness():
+    """
+    Reports whether the production model is loaded and ready to serve predictions.
+    """
+    status = model_holder.status()
+    if admission_controller is not None:
+        status["admission"] = admission_controller.stats()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+# Prometheus scrape endpoint
+@app.get("/metrics")
+async def metrics():
+    """
+    Exposes serving metrics in the Prometheus text format.
+    """
+    # Values derived from serving state are sampled when scraped
+    cache = model_holder.prediction_cache
+    if cache is not None:
+        PREDICTION_CACHE_HIT_RATIO.set(cache.stats()["hit_rate"] or 0.0)
+    PREDICTION_BATCH_QUEUE_DEPTH.set(prediction_batcher.queue_depth)
+
+    payload, content_type = render_metrics()
+    return Response(payload, media_type=content_type)
 
 # Route to trigger the model training process
 @app.get("/train")
 async def trainRouteClient():
     """
-    Endpoint to initiate the model training pipeline.
+    Endpoint to start the model training pipeline as a background job.
+    Returns the job id immediately; a request made while a job is already
+    queued or running returns that job instead of starting another.
     """
     try:
-        train_pipeline = TrainingPipeline()
-        train_pipeline.run_pipeline()
-        return Response("Training successful!!!")
+        job, created = training_jobs.submit()
+        return JSONResponse(
+            {"job_id": job.job_id, "status": job.status, "created": created},
+            status_code=202 if created else 200
+        )
 
     except Exception as e:
         return Response(f"Error Occurred! {e}")
 
+# Route to report the progress of a training job
+@app.get("/train/{job_id}")
+async def trainStatusRouteClient(job_id: str):
+    """
+    Returns the status and per-stage progress of a training job.
+    """
+    job = training_jobs.get(job_id)
+    if job is None:
+        return JSONResponse({"status": False, "error": f"Unknown training job {job_id}"}, status_code=404)
+    return job.to_dict()
+
+# Route to cancel a training job
+@app.delete("/train/{job_id}")
+async def trainCancelRouteClient(job_id: str):
+    """
+    Cancels a queued or running training job.
+    """
+    job = await training_jobs.cancel(job_id)
+    if job is None:
+        return JSONResponse({"status": False, "error": f"Unknown training job {job_id}"}, status_code=404)
+    return job.to_dict()
+
 # Route to handle form submission and make predictions
 @app.post("/")
 async def predictRouteClient(request: Request):
@@ -105,7 +296,8 @@ async def predictRouteClient(request: Request):
     """
     try:
         form = DataForm(request)
-        await form.get_vehicle_data()
+        with timed_stage("parse"):
+            await form.get_vehicle_data()
         
         vehicle_data = VehicleData(
                                 Gender= form.Gender,
@@ -121,27 +313,171 @@ async def predictRouteClient(request: Request):
                                 Vehicle_Damage_Yes = form.Vehicle_Damage_Yes
                                 )
 
-        # Convert form data into a DataFrame for the model
-        vehicle_df = vehicle_data.get_vehicle_input_data_frame()
-
-        # Initialize the prediction pipeline
-        model_predictor = VehicleDataClassifier()
+        if serving_config.prediction_batching_enabled:
+            # Score together with other concurrent requests
+            # Scored in the batcher's task: its stages are reported as one "batch" stage
+            with timed_stage("batch"):
+                value = await prediction_batcher.predict(vehicle_data.get_vehicle_record())
+        else:
+            # Initialize the prediction pipeline
+            model_predictor = VehicleDataClassifier(decision_threshold=serving_config.decision_threshold)
 
-        # Make a prediction and retrieve the result
-        value = model_predictor.predict(dataframe=vehicle_df)[0]
+            # Make a prediction off the event loop and retrieve the result
+            records = [vehicle_data.get_vehicle_record()]
+            value = (await inference_executor.run(model_predictor.predict_records, records))[0]
 
         # Interpret the prediction result as 'Response-Yes' or 'Response-No'
         status = "Response-Yes" if value == 1 else "Response-No"
 
         # Render the same HTML page with the prediction result
         return templates.TemplateResponse(
+            request,
             "vehicledata.html",
-            {"request": request, "context": status},
+            {"context": status},
         )
-        
+
+    except ExecutorSaturatedError as e:
+        return overloaded_response(e)
     except Exception as e:
         return {"status": False, "error": f"{e}"}
 
+# Route to score many records in one vectorized model call (JSON or Arrow IPC)
+@app.post("/predict/batch")
+async def predictBatchRouteClient(request: Request):
+    """
+    Endpoint to receive a batch of records, validate them against the
+    prediction schema and return predictions and probabilities keyed by id.
+
+    Expected JSON body: {"records": [{"id": 1, "Gender": 1, "Age": 44, ...}, ...]}
+    An optional "threshold" (0-1) overrides the configured decision threshold.
+
+    Bulk clients may instead send an Arrow IPC stream with one column per field
+    (Content-Type: application/vnd.apache.arrow.stream, threshold as a query
+    parameter) and ask for an Arrow stream of id/prediction/probability back
+    with the same media type in Accept.
+    """
+    try:
+        if is_arrow_stream(request.headers.get("content-type")):
+            with timed_stage("parse"):
+                body = await request.body()
+            threshold = request.query_params.get("threshold")
+            if threshold is not None:
+                try:
+                    threshold = float(threshold)
+                except ValueError:
+                    raise BatchValidationError(f"'threshold' must be a number between 0 and 1, got {threshold!r}.")
+            with timed_stage("encode"):
+                vehicle_df = read_arrow_batch(body, batch_record_validator)
+        else:
+            with timed_stage("parse"):
+                payload = await request.json()
+            records = payload.get("records") if isinstance(payload, dict) else payload
+            threshold = payload.get("threshold") if isinstance(payload, dict) else None
+            with timed_stage("encode"):
+                vehicle_df = batch_record_validator.to_dataframe(records)
+        if threshold is None:
+            threshold = serving_config.decision_threshold
+        elif isinstance(threshold, bool) or not isinstance(threshold, (int, float)) or not 0 <= threshold <= 1:
+            raise BatchValidationError(f"'threshold' must be a number between 0 and 1, got {threshold!r}.")
+    except UnsupportedFileError as e:
+        return JSONResponse({"status": False, "error": f"{e}"}, status_code=415)
+    except BatchValidationError as e:
+        return JSONResponse({"status": False, "error": f"{e}"}, status_code=422)
+    except ValueError as e:
+        return JSONResponse({"status": False, "error": f"Invalid JSON body: {e}"}, status_code=400)
+
+    try:
+        labels, probabilities, model_version = await inference_executor.run(score_batch, vehicle_df, threshold)
+
+        if is_arrow_stream(request.headers.get("accept")):
+            try:
+                content = write_arrow_predictions(labels, probabilities, model_version, threshold)
+            except UnsupportedFileError as e:
+                return JSONResponse({"status": False, "error": f"{e}"}, status_code=406)
+            return Response(content, media_type=ARROW_STREAM_CONTENT_TYPE)
+
+        return {
+            "status": True,
+            "model_version": model_version,
+            "threshold": threshold,
+            "predictions": format_batch_predictions(labels, probabilities),
+        }
+
+    except ExecutorSaturatedError as e:
+        return overloaded_response(e)
+    except Exception as e:
+        return JSONResponse({"status": False, "error": f"{e}"}, status_code=500)
+
+# Route to score a large CSV/Parquet upload, streaming results back chunk by chunk
+@app.post("/predict/file")
+async def predictFileRouteClient(file: UploadFile = File(...)):
+    """
+    Endpoint to score an uploaded CSV or Parquet file of any size. The file is
+    read and scored in chunks of `file_prediction_chunk_rows` rows and the
+    `id,prediction,probability` rows are streamed back as each chunk finishes,
+    so memory use does not grow with the file.
+
+    Rows may hold either the raw data columns or the model input columns.
+    Errors in the first chunk are returned as JSON; an error in a later chunk
+    aborts the stream, leaving the response incomplete.
+    """
+    try:
+        file_format = detect_file_format(file.filename, file.content_type)
+    except UnsupportedFileError as e:
+        await file.close()
+        return JSONResponse({"status": False, "error": f"{e}"}, status_code=415)
+
+    try:
+        # One model snapshot for the whole file, even if a new model is swapped in meanwhile
+        served_model = await inference_executor.run(model_holder.get_served_model)
+        scorer = FileScorer(
+            model=served_model.estimator.loaded_model,
+            validator=batch_record_validator,
+            chunk_rows=serving_config.file_prediction_chunk_rows,
+            threshold=serving_config.decision_threshold
+        )
+        pieces = scorer.iter_csv(file.file, file_format)
+        first_piece = await inference_executor.run(next, pieces)
+    except (BatchValidationError, UnsupportedFileError) as e:
+        await file.close()
+        return JSONResponse({"status": False, "error": f"{e}"}, status_code=422)
+    except ExecutorSaturatedError as e:
+        await file.close()
+        return overloaded_response(e)
+    except Exception as e:
+        await file.close()
+        logging.error(f"Scoring uploaded file {file.filename!r} failed: {e}")
+        return JSONResponse({"status": False, "error": f"{e}"}, status_code=500)
+
+    async def stream_predictions():
+        try:
+            yield first_piece
+            while True:
+                # Each chunk is read and scored off the event loop
+                piece = await inference_executor.run(next, pieces, None)
+                if piece is None:
+                    break
+                yield piece
+        except Exception as e:
+            logging.error(f"Scoring uploaded file {file.filename!r} failed mid-stream: {e}")
+            raise
+        finally:
+            try:
+                pieces.close()
+            except ValueError:
+                # Still running on a worker thread (client went away); closing the file stops it
+                pass
+            await file.close()
+
+    return StreamingResponse(
+        stream_predictions(),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": 'attachment; filename="predictions.csv"',
+            "X-Model-Version": served_model.model_version or "",
+        },
+    )
+
 # Main entry point to start the FastAPI server
 if __name__ == "__main__":
     app_run(app, host=APP_HOST, port=APP_PORT)
\ No newline at end of file
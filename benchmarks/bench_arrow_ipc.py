@@ -0,0 +1,90 @@
+# bench_arrow_ipc.py
+"""
+Measures the serialization overhead of /predict/batch for JSON versus Arrow IPC.
+
+For each batch size the script times, without the model:
+  - request decoding: request body bytes to the validated DataFrame MyModel
+    receives (json.loads + BatchRecordValidator.to_dataframe, versus
+    read_arrow_batch), and
+  - response encoding: predictions to response body bytes
+    (format_batch_predictions + json.dumps, versus write_arrow_predictions),
+and reports the best of --repeats runs with the JSON/Arrow ratio.
+
+Usage:
+    python benchmarks/bench_arrow_ipc.py [--sizes 100,1000,10000] [--repeats 5]
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from bench_mmap_model import make_rows
+
+from AutoClaimML.constants import BATCH_PREDICTION_MAX_RECORDS
+from AutoClaimML.serving.arrow_ipc import read_arrow_batch, write_arrow_predictions
+from AutoClaimML.serving.batch_prediction import BatchRecordValidator, format_batch_predictions
+
+
+def best_of(repeats: int, function, *args) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def arrow_body(rows: pd.DataFrame) -> bytes:
+    table = pa.Table.from_pandas(rows, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100,1000,10000", help="Comma-separated batch sizes.")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    validator = BatchRecordValidator(max_records=max(sizes + [BATCH_PREDICTION_MAX_RECORDS]))
+
+    print(f"{'rows':>7} {'stage':>8} {'json ms':>9} {'arrow ms':>9} {'ratio':>7} {'json KB':>9} {'arrow KB':>9}")
+    for size in sizes:
+        rows = make_rows(size, seed=size)
+        rows.insert(0, "id", np.arange(size))
+        json_request = json.dumps({"records": json.loads(rows.to_json(orient="records"))}).encode()
+        arrow_request = arrow_body(rows)
+
+        labels = pd.Series(np.random.default_rng(0).integers(0, 2, size).astype(float), index=rows["id"])
+        probabilities = pd.Series(np.random.default_rng(1).random(size), index=rows["id"])
+
+        def decode_json():
+            return validator.to_dataframe(json.loads(json_request)["records"])
+
+        def encode_json():
+            return json.dumps({"predictions": format_batch_predictions(labels, probabilities)}).encode()
+
+        def encode_arrow():
+            return write_arrow_predictions(labels, probabilities, "version", None)
+
+        stages = [
+            ("decode", decode_json, lambda: read_arrow_batch(arrow_request, validator),
+             len(json_request), len(arrow_request)),
+            ("encode", encode_json, encode_arrow, len(encode_json()), len(encode_arrow())),
+        ]
+        for stage, json_function, arrow_function, json_size, arrow_size in stages:
+            json_ms = best_of(args.repeats, json_function)
+            arrow_ms = best_of(args.repeats, arrow_function)
+            print(f"{size:>7} {stage:>8} {json_ms:>9.2f} {arrow_ms:>9.2f} {json_ms / arrow_ms:>6.1f}x "
+                  f"{json_size / 1024:>9.1f} {arrow_size / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
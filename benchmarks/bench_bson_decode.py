@@ -0,0 +1,170 @@
+# bench_bson_decode.py
+"""
+Compares the two VehicleDB export decoders on the same documents:
+  python  pymongo decodes every document into a dict, which
+          VehicleDB.documents_to_dataframe turns into a DataFrame chunk
+  arrow   pymongoarrow decodes each raw BSON batch into typed Arrow columns
+          (RawBatchDecoder), with no dict per document
+
+Without --mongodb-url, synthetic documents shaped like the raw collection
+(config/schema.yaml `columns`, with "na" in some numeric fields) are
+BSON-encoded into batches of --batch-size documents, as find_raw_batches
+returns them, and only decoding is timed. mongomock is no substitute here:
+it has no find_raw_batches. With --mongodb-url (e.g. a local mongod), the
+documents are inserted into a scratch collection, which is exported with
+VehicleDB.iter_collection_chunks using each decoder and then dropped.
+
+Both decoders must produce the same values and numeric dtypes; the script
+checks this first, and checks that the arrow decoder rejects documents whose
+values have unexpected types instead of decoding them as nulls.
+
+Usage:
+    python benchmarks/bench_bson_decode.py [--rows 200000] [--batch-size 50000]
+                                           [--repeats 3] [--mongodb-url URL]
+"""
+
+import argparse
+import os
+import time
+
+import bson
+import numpy as np
+import pandas as pd
+
+from AutoClaimML.data_access.raw_batches import RawBatchDecoder, pymongoarrow_available
+
+
+def make_documents(n_rows: int, seed: int = 11) -> list:
+    rng = np.random.default_rng(seed)
+    premiums = rng.uniform(2000, 80000, n_rows).round(1)
+    documents = []
+    for i in range(n_rows):
+        documents.append({
+            "id": i,
+            "Gender": "Male" if rng.random() < 0.54 else "Female",
+            "Age": "na" if i % 89 == 0 else int(rng.integers(20, 85)),
+            "Driving_License": 1,
+            "Region_Code": float(rng.integers(0, 53)),
+            "Previously_Insured": int(rng.integers(0, 2)),
+            "Vehicle_Age": ("< 1 Year", "1-2 Year", "> 2 Years")[int(rng.integers(0, 3))],
+            "Vehicle_Damage": "Yes" if rng.random() < 0.5 else "No",
+            "Annual_Premium": "na" if i % 101 == 0 else float(premiums[i]),
+            "Policy_Sales_Channel": float(rng.integers(1, 160)),
+            "Vintage": int(rng.integers(10, 300)),
+            "Response": int(rng.random() < 0.12),
+        })
+    return documents
+
+
+def raw_batches(documents: list, batch_size: int) -> list:
+    return [
+        b"".join(bson.encode(document) for document in documents[start:start + batch_size])
+        for start in range(0, len(documents), batch_size)
+    ]
+
+
+def decode_python(batches: list) -> pd.DataFrame:
+    from AutoClaimML.data_access.vehicle_db import VehicleDB
+    return pd.concat([VehicleDB.documents_to_dataframe(bson.decode_all(batch)) for batch in batches],
+                     ignore_index=True)
+
+
+def decode_arrow(batches: list, decoder: RawBatchDecoder) -> pd.DataFrame:
+    return pd.concat([decoder.decode(batch) for batch in batches], ignore_index=True)
+
+
+def same_values(left: pd.DataFrame, right: pd.DataFrame) -> bool:
+    right = right[left.columns]
+    for column in left.columns:
+        a, b = left[column], right[column]
+        if pd.api.types.is_numeric_dtype(a) or pd.api.types.is_numeric_dtype(b):
+            if a.dtype.kind != b.dtype.kind:
+                return False
+            a, b = (pd.to_numeric(values).to_numpy(float, na_value=np.nan) for values in (a, b))
+            if not np.allclose(a, b, equal_nan=True):
+                return False
+        elif not a.astype(object).where(a.notna(), None).equals(b.astype(object).where(b.notna(), None)):
+            return False
+    return True
+
+
+def check_invalid_values(decoder: RawBatchDecoder) -> list:
+    """
+    Returns the problems found when decoding documents with values of unexpected types.
+    """
+    document = make_documents(1)[0]
+    problems = []
+    # Integral doubles in int fields decode as ints, like the dict-based export infers them
+    chunk = decoder.decode(bson.encode({**document, "Age": 71.0}))
+    if chunk["Age"].dtype != np.int64 or chunk["Age"][0] != 71:
+        problems.append(f"Age 71.0 decoded as {chunk['Age'][0]!r} ({chunk['Age'].dtype})")
+
+    for field, value in (("Age", "seventy"), ("Age", 71.5), ("Annual_Premium", "n/a"), ("Gender", 1)):
+        try:
+            decoder.decode(bson.encode({**document, field: value}))
+        except ValueError:
+            continue
+        problems.append(f"{field}={value!r} was decoded instead of rejected")
+    return problems
+
+
+def best_of(repeats: int, function, *args) -> tuple:
+    timings, result = [], None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--batch-size", type=int, default=50000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--mongodb-url", help="Benchmark against this MongoDB server instead of in-memory batches.")
+    args = parser.parse_args()
+
+    if not pymongoarrow_available():
+        parser.exit(1, "The arrow decoder needs the optional 'pymongoarrow' package.\n")
+    decoder = RawBatchDecoder()
+    problems = check_invalid_values(decoder)
+    if problems:
+        parser.exit(1, "Invalid values are not handled: " + "; ".join(problems) + "\n")
+    documents = make_documents(args.rows)
+
+    if args.mongodb_url:
+        os.environ["MONGODB_URL"] = args.mongodb_url
+        from AutoClaimML.data_access.vehicle_db import VehicleDB
+        vehicle_db = VehicleDB()
+        collection_name = f"bench-bson-decode-{os.getpid()}"
+        collection = vehicle_db.mongo_client.database[collection_name]
+        collection.insert_many(documents)
+        try:
+            def export(raw_batch_decoder):
+                chunks = vehicle_db.iter_collection_chunks(
+                    collection_name, args.batch_size, raw_batch_decoder=raw_batch_decoder
+                )
+                return pd.concat(list(chunks), ignore_index=True)
+            python_seconds, python_frame = best_of(args.repeats, export, None)
+            arrow_seconds, arrow_frame = best_of(args.repeats, export, decoder)
+        finally:
+            collection.drop()
+        source = "mongodb"
+    else:
+        batches = raw_batches(documents, args.batch_size)
+        python_seconds, python_frame = best_of(args.repeats, decode_python, batches)
+        arrow_seconds, arrow_frame = best_of(args.repeats, decode_arrow, batches, decoder)
+        source = "in-memory raw batches"
+
+    if not same_values(python_frame, arrow_frame):
+        parser.exit(1, "The decoders produced different values.\n")
+
+    print(f"{args.rows} documents from {source}, batches of {args.batch_size} (best of {args.repeats}):")
+    print(f"  python  {python_seconds:7.3f} s  {args.rows / python_seconds:>12,.0f} docs/s")
+    print(f"  arrow   {arrow_seconds:7.3f} s  {args.rows / arrow_seconds:>12,.0f} docs/s  "
+          f"({python_seconds / arrow_seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# bench_forest_engine.py
+"""
+Benchmarks the compiled forest engine against sklearn's RandomForestClassifier.
+
+By default a forest is trained on synthetic model-input rows with the
+hyperparameters from config/model.yaml (200 trees, depth 10); pass
+--model-path to benchmark a saved MyModel (model.pkl) instead.
+
+Usage:
+    python benchmarks/bench_forest_engine.py [--model-path PATH] [--batch-sizes 1 10 100 1000 10000 50000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from AutoClaimML.constants import COMPILED_FOREST_MAX_ROWS, MODEL_TRAINER_MODEL_CONFIG_FILE_PATH
+from AutoClaimML.entity.compiled_forest import CompiledForest
+from AutoClaimML.utils.main_utils import load_object, read_yaml_file
+
+
+N_FEATURES = 11
+
+
+def make_features(n_rows: int, seed: int) -> np.ndarray:
+    """
+    Random rows shaped like the preprocessed model input: scaled Age, Vintage
+    and Annual_Premium followed by the passthrough columns.
+    """
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.normal(size=n_rows),                 # Age (standard scaled)
+        rng.normal(size=n_rows),                 # Vintage (standard scaled)
+        rng.uniform(size=n_rows),                # Annual_Premium (min-max scaled)
+        rng.integers(0, 2, n_rows),              # Gender
+        rng.integers(0, 2, n_rows),              # Driving_License
+        rng.integers(0, 53, n_rows),             # Region_Code
+        rng.integers(0, 2, n_rows),              # Previously_Insured
+        rng.integers(1, 164, n_rows),            # Policy_Sales_Channel
+        rng.integers(0, 2, n_rows),              # Vehicle_Age_lt_1_Year
+        rng.integers(0, 2, n_rows),              # Vehicle_Age_gt_2_Years
+        rng.integers(0, 2, n_rows),              # Vehicle_Damage_Yes
+    ]).astype(np.float64)
+
+
+def train_forest(n_rows: int) -> RandomForestClassifier:
+    params = read_yaml_file(MODEL_TRAINER_MODEL_CONFIG_FILE_PATH)["model_params"]
+    X = make_features(n_rows, seed=0)
+    y = ((X[:, 10] == 1) & (X[:, 6] == 0) | (X[:, 0] > 1.0)).astype(float)
+    return RandomForestClassifier(**params).fit(X, y)
+
+
+def time_call(fn, X: np.ndarray, min_seconds: float = 0.5) -> float:
+    """
+    Returns the median wall time of `fn(X)` in milliseconds.
+    """
+    fn(X)
+    timings = []
+    started = time.perf_counter()
+    while time.perf_counter() - started < min_seconds or len(timings) < 5:
+        t0 = time.perf_counter()
+        fn(X)
+        timings.append(time.perf_counter() - t0)
+    return float(np.median(timings)) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-path", help="Saved MyModel to benchmark (default: train on synthetic data).")
+    parser.add_argument("--train-rows", type=int, default=20000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 100, 1000, 10000, 50000])
+    args = parser.parse_args()
+
+    if args.model_path:
+        forest = load_object(args.model_path).trained_model_object
+    else:
+        forest = train_forest(args.train_rows)
+
+    t0 = time.perf_counter()
+    compiled = CompiledForest.from_sklearn(forest)
+    print(f"{compiled} compiled in {(time.perf_counter() - t0) * 1000:.1f} ms\n")
+
+    print(f"{'rows':>8} {'sklearn ms':>12} {'compiled ms':>12} {'speedup':>9}  {'model.pkl uses':>14}  identical")
+    for n_rows in args.batch_sizes:
+        X = make_features(n_rows, seed=n_rows)
+        identical = (
+            np.array_equal(forest.predict(X), compiled.predict(X))
+            and np.array_equal(forest.predict_proba(X), compiled.predict_proba(X))
+        )
+        sklearn_ms = time_call(forest.predict, X)
+        compiled_ms = time_call(compiled.predict, X)
+        engine = "compiled" if n_rows <= COMPILED_FOREST_MAX_ROWS else "sklearn"
+        print(
+            f"{n_rows:>8} {sklearn_ms:>12.3f} {compiled_ms:>12.3f} "
+            f"{sklearn_ms / compiled_ms:>8.1f}x  {engine:>14}  {identical}"
+        )
+    print("\nmodel.mmap holds only the compiled forest and scores every batch with it.")
+
+
+if __name__ == "__main__":
+    main()
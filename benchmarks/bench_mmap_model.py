@@ -0,0 +1,144 @@
+# bench_mmap_model.py
+"""
+Measures per-worker memory with the pickled model versus the memory-mapped model.
+
+N worker processes are started per format. Each one loads the model, scores a
+few rows and then reports its RSS and PSS (proportional set size, which splits
+shared pages between the processes mapping them) while all workers are alive.
+
+By default a MyModel is trained on synthetic rows with the hyperparameters from
+config/model.yaml; pass --model-path to measure a saved model.pkl instead.
+
+Usage:
+    python benchmarks/bench_mmap_model.py [--workers 4] [--model-path PATH]
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+from AutoClaimML.constants import MODEL_TRAINER_MODEL_CONFIG_FILE_PATH
+from AutoClaimML.entity.estimator import MyModel
+from AutoClaimML.utils.main_utils import (load_mmap_object, load_object, read_yaml_file,
+                                          save_mmap_object, save_object)
+
+
+def make_rows(n_rows: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Gender": rng.integers(0, 2, n_rows),
+        "Age": rng.integers(20, 85, n_rows),
+        "Driving_License": rng.integers(0, 2, n_rows),
+        "Region_Code": rng.integers(0, 53, n_rows).astype(float),
+        "Previously_Insured": rng.integers(0, 2, n_rows),
+        "Annual_Premium": rng.uniform(2630, 90000, n_rows).round(1),
+        "Policy_Sales_Channel": rng.integers(1, 164, n_rows).astype(float),
+        "Vintage": rng.integers(10, 300, n_rows),
+        "Vehicle_Age_lt_1_Year": rng.integers(0, 2, n_rows),
+        "Vehicle_Age_gt_2_Years": rng.integers(0, 2, n_rows),
+        "Vehicle_Damage_Yes": rng.integers(0, 2, n_rows),
+    })
+
+
+def train_model(n_rows: int) -> MyModel:
+    params = read_yaml_file(MODEL_TRAINER_MODEL_CONFIG_FILE_PATH)["model_params"]
+    rows = make_rows(n_rows, seed=0)
+    noise = np.random.default_rng(1).random(n_rows)
+    target = (((rows.Vehicle_Damage_Yes == 1) & (rows.Previously_Insured == 0)) ^ (noise < 0.15)).astype(float)
+
+    preprocessor = Pipeline(steps=[("Preprocessor", ColumnTransformer(
+        transformers=[
+            ("StandardScaler", StandardScaler(), ["Age", "Vintage"]),
+            ("MinMaxScaler", MinMaxScaler(), ["Annual_Premium"]),
+        ],
+        remainder="passthrough",
+    ))])
+    forest = RandomForestClassifier(**params).fit(preprocessor.fit_transform(rows), target)
+    return MyModel(preprocessing_object=preprocessor, trained_model_object=forest)
+
+
+def memory_kb() -> dict:
+    """
+    Returns this process's RSS and PSS in kB (Linux only).
+    """
+    usage = {}
+    with open("/proc/self/smaps_rollup") as smaps:
+        for line in smaps:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Pss"):
+                usage[key.lower()] = int(rest.split()[0])
+    return usage
+
+
+def worker(model_format: str, model_path: str, ready, release, results) -> None:
+    before = memory_kb()
+    model = load_mmap_object(model_path) if model_format == "mmap" else load_object(model_path)
+    model.predict(make_rows(64, seed=os.getpid()))
+
+    ready.wait()
+    after = memory_kb()
+    results.put({
+        "rss": after["rss"],
+        "pss": after["pss"],
+        "rss_delta": after["rss"] - before["rss"],
+    })
+    release.wait()
+
+
+def measure(model_format: str, model_path: str, n_workers: int) -> list:
+    context = multiprocessing.get_context("spawn")
+    ready, release = context.Barrier(n_workers + 1), context.Barrier(n_workers + 1)
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(model_format, model_path, ready, release, results))
+        for _ in range(n_workers)
+    ]
+    for process in processes:
+        process.start()
+
+    ready.wait()
+    reports = [results.get() for _ in processes]
+    release.wait()
+    for process in processes:
+        process.join()
+    return reports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-path", help="Saved MyModel to measure (default: train on synthetic data).")
+    parser.add_argument("--train-rows", type=int, default=300000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    model = load_object(args.model_path) if args.model_path else train_model(args.train_rows)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = {"pickle": os.path.join(tmp_dir, "model.pkl"), "mmap": os.path.join(tmp_dir, "model.mmap")}
+        save_object(paths["pickle"], model)
+        save_mmap_object(paths["mmap"], model.to_compiled())
+
+        print(f"{model.compiled_forest()}, {args.workers} workers\n")
+        print(f"{'format':>8} {'file MB':>9} {'model RSS MB':>13} {'RSS MB':>8} {'PSS MB':>8} {'total PSS MB':>13}")
+        for model_format, path in paths.items():
+            reports = measure(model_format, path, args.workers)
+            mean = {key: np.mean([report[key] for report in reports]) / 1024 for key in reports[0]}
+            total_pss = sum(report["pss"] for report in reports) / 1024
+            print(
+                f"{model_format:>8} {os.path.getsize(path) / 2**20:>9.1f} {mean['rss_delta']:>13.1f} "
+                f"{mean['rss']:>8.1f} {mean['pss']:>8.1f} {total_pss:>13.1f}"
+            )
+
+    print("\nmodel RSS: growth of each worker's RSS from loading the model; RSS/PSS: per worker, averaged.")
+
+
+if __name__ == "__main__":
+    main()
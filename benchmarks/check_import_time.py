@@ -0,0 +1,115 @@
+# check_import_time.py
+"""
+Import-time budget check for the serving application.
+
+Imports `app` in fresh interpreters with `python -X importtime` and fails
+(exit status 1) when:
+  - the cumulative import time of `app` (best of --runs) exceeds --budget-ms,
+  - a training-only module (mlflow, imblearn, pymongo, the training pipeline
+    or its components) is imported by the serving path, or
+  - importing `app` creates files in the log directory.
+
+The budget is wall-clock time and depends on the machine; set it for the CI
+runner or container size it protects (AUTOCLAIM_IMPORT_BUDGET_MS overrides
+the default).
+
+Usage:
+    python benchmarks/check_import_time.py [--budget-ms 3000] [--runs 3] [--module app]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET_MS = float(os.getenv("AUTOCLAIM_IMPORT_BUDGET_MS", 3000))
+
+# Loaded only when a training job runs (in its own process)
+TRAINING_ONLY_MODULES = (
+    "mlflow",
+    "imblearn",
+    "pymongo",
+    "AutoClaimML.pipeline.training_pipeline",
+    "AutoClaimML.components",
+    "AutoClaimML.data_access",
+)
+
+
+def import_times(module: str) -> Dict[str, int]:
+    """
+    Imports `module` in a fresh interpreter and returns its -X importtime
+    report as {module: cumulative microseconds}.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [os.path.join(REPO_ROOT, "src"), REPO_ROOT, env.get("PYTHONPATH")])
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = int(cumulative_us)
+    return cumulative
+
+
+def log_files() -> set:
+    # Same directory the application logs to; importing the logger itself creates nothing
+    sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+    from AutoClaimML.logger import log_dir_path
+    return set(os.listdir(log_dir_path)) if os.path.isdir(log_dir_path) else set()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app", help="Module to import (default: app).")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=3, help="Imports to run; the fastest one is checked.")
+    parser.add_argument("--top", type=int, default=15, help="Heaviest modules listed in the report.")
+    args = parser.parse_args()
+
+    failures = []
+    logs_before = log_files()
+    runs = [import_times(args.module) for _ in range(args.runs)]
+    new_logs = log_files() - logs_before
+    if new_logs:
+        failures.append(f"importing {args.module} created log files: {sorted(new_logs)}")
+
+    cumulative = min(runs, key=lambda run: run[args.module])
+    total_ms = cumulative[args.module] / 1000
+
+    training_modules = sorted(
+        name for name in cumulative
+        if any(name == prefix or name.startswith(prefix + ".") for prefix in TRAINING_ONLY_MODULES)
+    )
+    if training_modules:
+        failures.append(f"training-only modules imported: {', '.join(training_modules[:10])}")
+    if total_ms > args.budget_ms:
+        failures.append(f"import time {total_ms:.0f} ms exceeds the budget of {args.budget_ms:.0f} ms")
+
+    print(f"import {args.module}: {total_ms:.0f} ms (best of {args.runs}, budget {args.budget_ms:.0f} ms)")
+    top_level = sorted(
+        ((us, name) for name, us in cumulative.items() if "." not in name and name != args.module),
+        reverse=True,
+    )
+    print("\nHeaviest top-level packages (cumulative ms):")
+    for us, name in top_level[:args.top]:
+        print(f"  {us / 1000:>8.1f}  {name}")
+
+    if failures:
+        print("\nFAILED:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
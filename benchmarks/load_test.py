@@ -0,0 +1,285 @@
+# load_test.py
+"""
+Load test for the serving application, runnable on a laptop without AWS credentials.
+
+The script:
+  1. starts a moto S3 server and publishes a MyModel to the model bucket
+     (model.pkl and model.mmap, as the model pusher does),
+  2. starts `uvicorn app:app` against it (AWS_ENDPOINT_URL points boto3 at moto),
+  3. drives it with --concurrency closed-loop clients for --duration seconds
+     per scenario, and
+  4. prints a JSON report (and writes it to --output): throughput, rows/s,
+     p50/p95/p99 latency and error rate per scenario and request type.
+
+Scenarios:
+  single  single-row form posts to "/" (micro-batched by the app)
+  batch   POST /predict/batch with --batch-size records
+  mixed   single-row traffic with a --mixed-batch-ratio share of batch requests
+
+A request counts as an error on a transport failure, a non-2xx status or a
+JSON body with "status": false. Serving options can be changed per run with
+--env KEY=VALUE (e.g. --env PREDICTION_CACHE_ENABLED=false). Training uses
+MongoDB; serving does not, so no Mongo stand-in is needed here.
+
+By default a MyModel is trained on synthetic rows with the hyperparameters from
+config/model.yaml; pass --model-path to serve a saved model.pkl instead.
+
+Usage:
+    python benchmarks/load_test.py [--scenarios single,batch,mixed] [--concurrency 16]
+                                   [--duration 20] [--workers 1] [--output results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+import boto3
+import httpx
+import numpy as np
+from moto.server import ThreadedMotoServer
+
+from bench_mmap_model import make_rows, train_model
+
+from AutoClaimML.constants import MMAP_MODEL_FILE_NAME, MODEL_BUCKET_NAME, MODEL_FILE_NAME, REGION_NAME
+from AutoClaimML.utils.main_utils import load_object, save_mmap_object, save_object
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIOS = ("single", "batch", "mixed")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def publish_model(model, endpoint_url: str) -> None:
+    """
+    Uploads the pickled and memory-mapped forms of `model` to the moto bucket.
+    """
+    s3 = boto3.client("s3", endpoint_url=endpoint_url, region_name=REGION_NAME)
+    s3.create_bucket(Bucket=MODEL_BUCKET_NAME)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pickle_path, mmap_path = os.path.join(tmp_dir, "model.pkl"), os.path.join(tmp_dir, "model.mmap")
+        save_object(pickle_path, model)
+        save_mmap_object(mmap_path, model.to_compiled())
+        s3.upload_file(mmap_path, MODEL_BUCKET_NAME, MMAP_MODEL_FILE_NAME)
+        s3.upload_file(pickle_path, MODEL_BUCKET_NAME, MODEL_FILE_NAME)
+
+
+def start_app(port: int, workers: int, env: dict) -> subprocess.Popen:
+    command = [
+        sys.executable, "-m", "uvicorn", "app:app",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+    ]
+    return subprocess.Popen(command, cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+
+def wait_until_ready(base_url: str, process: subprocess.Popen, timeout: float = 180.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            sys.exit(f"The app exited during startup:\n{process.stderr.read().decode()[-3000:]}")
+        try:
+            if httpx.get(f"{base_url}/health/ready", timeout=2.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    sys.exit(f"The app was not ready after {timeout:.0f}s.")
+
+
+class Payloads:
+    """
+    Request bodies drawn from a pool of synthetic rows (repeats are expected
+    with a large enough run, as with real traffic hitting the prediction cache).
+    """
+
+    def __init__(self, n_rows: int, batch_size: int, seed: int = 7) -> None:
+        rows = make_rows(n_rows, seed=seed)
+        self.forms = [{key: str(value) for key, value in record.items()} for record in rows.to_dict("records")]
+        self.records = [dict(record, id=i) for i, record in enumerate(json.loads(rows.to_json(orient="records")))]
+        self.batch_size = batch_size
+
+    def form(self, rng: random.Random) -> dict:
+        return rng.choice(self.forms)
+
+    def batch(self, rng: random.Random) -> dict:
+        start = rng.randrange(0, len(self.records) - self.batch_size + 1)
+        return {"records": self.records[start:start + self.batch_size]}
+
+
+async def send(client: httpx.AsyncClient, kind: str, payloads: Payloads, rng: random.Random) -> tuple:
+    """
+    Sends one request and returns (kind, seconds, outcome), where outcome is
+    the HTTP status or the exception class name.
+    """
+    start = time.perf_counter()
+    try:
+        if kind == "single":
+            response = await client.post("/", data=payloads.form(rng))
+        else:
+            response = await client.post("/predict/batch", json=payloads.batch(rng))
+        ok = response.is_success
+        if ok and response.headers.get("content-type", "").startswith("application/json"):
+            ok = response.json().get("status", True) is not False
+        outcome = response.status_code if ok else f"error_{response.status_code}"
+    except httpx.HTTPError as e:
+        outcome = type(e).__name__
+    return kind, time.perf_counter() - start, outcome
+
+
+async def run_scenario(base_url: str, scenario: str, args, payloads: Payloads) -> list:
+    """
+    Runs `args.concurrency` closed-loop clients for `args.duration` seconds.
+    """
+    results = []
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        async def client_loop(worker: int) -> None:
+            rng = random.Random(worker)
+            deadline = time.perf_counter() + args.duration
+            while time.perf_counter() < deadline:
+                if scenario == "mixed":
+                    kind = "batch" if rng.random() < args.mixed_batch_ratio else "single"
+                else:
+                    kind = scenario
+                results.append(await send(client, kind, payloads, rng))
+
+        # Warm up connections and the app's lazy paths before measuring
+        await asyncio.gather(*(send(client, kind, payloads, random.Random(i))
+                               for i, kind in enumerate(["single", "batch"] * 4)))
+        await asyncio.gather(*(client_loop(worker) for worker in range(args.concurrency)))
+    return results
+
+
+def summarize(results: list, duration: float, batch_size: int) -> dict:
+    latencies = np.array([seconds for _, seconds, _ in results]) * 1000
+    errors = [outcome for _, _, outcome in results if not isinstance(outcome, int)]
+    rows = sum(batch_size if kind == "batch" else 1 for kind, _, outcome in results if isinstance(outcome, int))
+    summary = {
+        "requests": len(results),
+        "errors": len(errors),
+        "error_rate": len(errors) / len(results) if results else None,
+        "throughput_rps": len(results) / duration,
+        "rows_per_second": rows / duration,
+        "latency_ms": {
+            "mean": float(latencies.mean()) if len(latencies) else None,
+            "p50": float(np.percentile(latencies, 50)) if len(latencies) else None,
+            "p95": float(np.percentile(latencies, 95)) if len(latencies) else None,
+            "p99": float(np.percentile(latencies, 99)) if len(latencies) else None,
+            "max": float(latencies.max()) if len(latencies) else None,
+        },
+        "outcomes": {str(outcome): count for outcome, count in Counter(o for _, _, o in results).items()},
+    }
+    return summary
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated subset of single,batch,mixed.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent closed-loop clients.")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds of measured load per scenario.")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes.")
+    parser.add_argument("--batch-size", type=int, default=100, help="Records per /predict/batch request.")
+    parser.add_argument("--mixed-batch-ratio", type=float, default=0.1, help="Share of batch requests in 'mixed'.")
+    parser.add_argument("--payload-rows", type=int, default=5000, help="Distinct synthetic rows to draw from.")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds.")
+    parser.add_argument("--model-path", help="Saved MyModel to serve (default: train on synthetic data).")
+    parser.add_argument("--train-rows", type=int, default=300000)
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="Environment override for the app, e.g. PREDICTION_BATCHING_ENABLED=false.")
+    parser.add_argument("--output", help="Also write the JSON report to this file.")
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    overrides = dict(item.split("=", 1) for item in args.env)
+
+    model = load_object(args.model_path) if args.model_path else train_model(args.train_rows)
+
+    moto_port, app_port = free_port(), free_port()
+    moto_server = ThreadedMotoServer(ip_address="127.0.0.1", port=moto_port)
+    moto_server.start()
+    endpoint_url = f"http://127.0.0.1:{moto_port}"
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+
+    app_env = dict(os.environ)
+    app_env.update({
+        "AWS_ENDPOINT_URL": endpoint_url,
+        "PYTHONPATH": os.pathsep.join(filter(None, [os.path.join(REPO_ROOT, "src"), app_env.get("PYTHONPATH")])),
+    })
+    app_env.update(overrides)
+
+    process = None
+    try:
+        publish_model(model, endpoint_url)
+        process = start_app(app_port, args.workers, app_env)
+        base_url = f"http://127.0.0.1:{app_port}"
+        wait_until_ready(base_url, process)
+        payloads = Payloads(args.payload_rows, args.batch_size)
+
+        report = {
+            "meta": {
+                "commit": git_commit(),
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "cpu_count": os.cpu_count(),
+                "workers": args.workers,
+                "concurrency": args.concurrency,
+                "duration_seconds": args.duration,
+                "batch_size": args.batch_size,
+                "mixed_batch_ratio": args.mixed_batch_ratio,
+                "model": repr(model),
+                "env": overrides,
+            },
+            "scenarios": {},
+        }
+        for scenario in scenarios:
+            print(f"Running '{scenario}' for {args.duration:.0f}s with {args.concurrency} clients...", file=sys.stderr)
+            results = asyncio.run(run_scenario(base_url, scenario, args, payloads))
+            summary = summarize(results, args.duration, args.batch_size)
+            if scenario == "mixed":
+                summary["by_type"] = {
+                    kind: summarize([r for r in results if r[0] == kind], args.duration, args.batch_size)
+                    for kind in ("single", "batch")
+                }
+            report["scenarios"][scenario] = summary
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+        moto_server.stop()
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as report_file:
+            report_file.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
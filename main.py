@@ -4,6 +4,10 @@ import os
 import joblib
 from AutoClaimML.utils.artifact_io import save_artifact, load_artifact
 from AutoClaimML.pipeline.training_pipeline import TrainingPipeline
+from AutoClaimML.pipeline.batch_scoring_pipeline import BatchScoringPipeline
+from AutoClaimML.pipeline.collection_scoring_pipeline import CollectionScoringPipeline
+from AutoClaimML.configuration.configuration import ConfigurationManager
+from AutoClaimML.constants import COLLECTION_NAME
 from AutoClaimML.exception import CustomException
 from AutoClaimML.logger import logging
 
@@ -160,6 +164,62 @@ def run_pipeline(stage: str):
         print(f"Pipeline failed: {e}")
 
 
+# Offline scoring of CSV/Parquet files, sharded across worker processes
+def run_batch_scoring(args):
+    try:
+        logging.info("Stage: Batch Scoring started.")
+        batch_scoring_config = ConfigurationManager().get_batch_scoring_config(
+            input_path=args.input,
+            output_path=args.output,
+            model_path=args.model,
+            n_workers=args.workers,
+            chunk_rows=args.chunk_rows,
+            output_format=args.output_format
+        )
+        artifact = BatchScoringPipeline(batch_scoring_config).run_pipeline()
+
+        for pid, stats in sorted(artifact.worker_stats.items()):
+            print(f"   - Worker {pid}: {stats['rows']} rows in {stats['shards']} shards, "
+                  f"{stats['rows_per_second']:.0f} rows/s")
+        print(f"   - Scored Rows:      {artifact.n_rows} ({artifact.rows_per_second:.0f} rows/s overall)")
+        print(f"   - Output Path:      {artifact.output_path} ({artifact.n_partitions} partitions)")
+        if artifact.n_rejected:
+            print(f"   - Rejected Rows:    {artifact.n_rejected} (rejects-*.csv in the output path)")
+        if artifact.failed_shards:
+            for failure in artifact.failed_shards:
+                print(f"   - {failure}")
+            print(f"Batch scoring failed for {len(artifact.failed_shards)} shards.")
+            sys.exit(1)
+
+        logging.info("Stage: Batch Scoring completed.")
+    except Exception as e:
+        logging.error(f"Batch scoring failed: {e}")
+        print(f"Batch scoring failed: {e}")
+        sys.exit(1)
+
+
+# Scoring of a MongoDB collection, with predictions written back to its documents
+def run_collection_scoring(args):
+    try:
+        logging.info("Stage: Collection Scoring started.")
+        collection_scoring_config = ConfigurationManager().get_collection_scoring_config(
+            collection_name=args.collection,
+            model_path=args.model,
+            batch_size=args.batch_size,
+            resume=not args.no_resume
+        )
+        artifact = CollectionScoringPipeline(collection_scoring_config).run_pipeline()
+
+        print(f"   - Collection:       {artifact.collection_name}")
+        print(f"   - Model Version:    {artifact.model_version}")
+        print(f"   - Scored Documents: {artifact.n_scored} ({artifact.documents_per_second:.0f} docs/s)")
+
+        logging.info("Stage: Collection Scoring completed.")
+    except Exception as e:
+        logging.error(f"Collection scoring failed: {e}")
+        print(f"Collection scoring failed: {e}")
+        sys.exit(1)
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
@@ -169,9 +229,28 @@ if __name__ == "__main__":
         required=True,
         choices=[
             "data_ingestion", "data_validation", "data_transformation",
-            "model_trainer", "model_evaluation", "model_pusher", "all"
+            "model_trainer", "model_evaluation", "model_pusher", "all", "score", "score_collection"
         ],
         help="Specify which pipeline stage to run"
     )
+    # Options of the "score" stage
+    parser.add_argument("--input", help="CSV/Parquet file, or a directory of them, to score")
+    parser.add_argument("--output", help="Directory receiving the part-*.csv/.parquet predictions")
+    parser.add_argument("--model", help="Local model.pkl/model.mmap (default: the model in the S3 registry)")
+    parser.add_argument("--workers", type=int, help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--chunk-rows", type=int, help="Rows read and scored at a time by each worker")
+    parser.add_argument("--output-format", choices=["csv", "parquet"], help="Format of the output partitions")
+    # Options of the "score_collection" stage
+    parser.add_argument("--collection", default=COLLECTION_NAME, help="MongoDB collection to score in place")
+    parser.add_argument("--batch-size", type=int, help="Documents read, scored and written per batch")
+    parser.add_argument("--no-resume", action="store_true", help="Ignore the checkpoint and rescore every document")
     args = parser.parse_args()
-    run_pipeline(args.stage)
+
+    if args.stage == "score_collection":
+        run_collection_scoring(args)
+    elif args.stage == "score":
+        if not args.input or not args.output:
+            parser.error("--stage score requires --input and --output")
+        run_batch_scoring(args)
+    else:
+        run_pipeline(args.stage)
@@ -4,7 +4,7 @@ import os
 import boto3
 
 from io import StringIO
-from typing import Union, List
+from typing import Union, List, Optional
 import sys
 import pickle
 from pathlib import Path
@@ -70,6 +70,28 @@ class SimpleStorageService:
         except Exception as e:
             raise CustomException(e, sys)
         
+    def get_object_etag(self, bucket_name: str, s3_key: str) -> Optional[str]:
+        """
+        Returns the ETag of an S3 object using a HEAD request, without
+        downloading the object body.
+
+        Args:
+            bucket_name (str): S3 bucket name.
+            s3_key (str): S3 object key (file path).
+
+        Returns:
+            Optional[str]: ETag of the object, or None if it does not exist.
+        """
+        try:
+            response = self.s3_client.head_object(Bucket=bucket_name, Key=s3_key)
+            return response["ETag"].strip('"')
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise CustomException(e, sys)
+        except Exception as e:
+            raise CustomException(e, sys)
+
     def get_file_object(self, filename: str, bucket_name: str) -> Union[List[object], object]:
         """
         Retrieves one or multiple S3 objects matching a prefix.
@@ -163,6 +185,20 @@ class SimpleStorageService:
         except Exception as e:
             raise CustomException(e, sys)
         
+    def download_file(self, bucket_name: str, s3_key: str, to_filename: str) -> None:
+        """
+        Downloads an S3 object to a local file.
+
+        Args:
+            bucket_name (str): Bucket name.
+            s3_key (str): S3 source key.
+            to_filename (str): Local destination path.
+        """
+        try:
+            self.s3_resource.meta.client.download_file(bucket_name, s3_key, to_filename)
+        except Exception as e:
+            raise CustomException(e, sys)
+
     def upload_df_as_csv(self, data_frame: DataFrame, local_filename: str, bucket_filename: str, bucket_name: str) -> None:
         """
         Uploads a DataFrame to S3 as a CSV.
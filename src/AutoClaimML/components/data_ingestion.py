@@ -10,6 +10,8 @@ from sklearn.model_selection import train_test_split
 
 
 from AutoClaimML.logger import logging
+from AutoClaimML.data_access.feature_store import PartitionedFeatureStore
+from AutoClaimML.data_access.pushdown import read_column_types
 from AutoClaimML.data_access.vehicle_db import VehicleDB
 from AutoClaimML.entity.config_entity import DataIngestionConfig
 from AutoClaimML.entity.artifact_entity import DataIngestionArtifact
@@ -39,13 +41,39 @@ class DataIngestion:
         try:
             logging.info("Exporting data from MongoDB collection.")
             proj_data = VehicleDB()
+            feature_store_path = self.data_ingestion_config.feature_store_file_path
+
+            if self.data_ingestion_config.incremental:
+                dataframe = self.merge_changes_into_feature_store(proj_data)
+                os.makedirs(os.path.dirname(feature_store_path), exist_ok=True)
+                dataframe.to_csv(feature_store_path, index=False)
+                logging.info(f"Data saved to feature store at: {feature_store_path}")
+                return dataframe
+
+            if self.data_ingestion_config.streaming_export or self.data_ingestion_config.pushdown:
+                # Written chunk by chunk, then read back as one typed frame for the split
+                proj_data.export_collection_to_csv(
+                    collection_name=self.data_ingestion_config.collection_name,
+                    file_path=feature_store_path,
+                    batch_size=self.data_ingestion_config.export_batch_size,
+                    workers=self.data_ingestion_config.export_workers,
+                    partition_field=self.data_ingestion_config.export_partition_field,
+                    decoder=self.data_ingestion_config.export_decoder,
+                    pushdown=self.data_ingestion_config.pushdown,
+                    query=self.data_ingestion_config.export_filter,
+                    sample_size=self.data_ingestion_config.sample_size
+                )
+                dataframe = pd.read_csv(feature_store_path)
+                logging.info(f"Exported data shape: {dataframe.shape}")
+                logging.info(f"Data saved to feature store at: {feature_store_path}")
+                return dataframe
+
             dataframe = proj_data.export_collection_as_dataframe(
                 collection_name=self.data_ingestion_config.collection_name
             )
             logging.info(f"Exported data shape: {dataframe.shape}")
 
             # Save to feature store path
-            feature_store_path = self.data_ingestion_config.feature_store_file_path
             os.makedirs(os.path.dirname(feature_store_path), exist_ok=True)
             dataframe.to_csv(feature_store_path, index=False)
             logging.info(f"Data saved to feature store at: {feature_store_path}")
@@ -56,6 +84,50 @@ class DataIngestion:
             logging.error("Failed during data export from MongoDB.")
             raise CustomException(e, sys)
         
+    def merge_changes_into_feature_store(self, proj_data: VehicleDB) -> DataFrame:
+        """
+        Reads only the documents changed since the stored watermark and upserts
+        them by id into the partitioned feature store; the first run (or a run
+        after the collection, watermark field or partitioning changed) reads
+        the whole collection.
+
+        :param proj_data: VehicleDB used to read the collection.
+        :return: The complete, updated feature store.
+        """
+        config = self.data_ingestion_config
+        store = PartitionedFeatureStore(config.feature_store_partitions_dir, config.feature_store_partitions)
+        watermark = store.read_watermark(config.collection_name, config.watermark_field)
+        if watermark is None:
+            store.reset()
+        logging.info(f"Incremental ingestion of '{config.collection_name}' after "
+                     f"{config.watermark_field} {watermark}.")
+
+        n_inserted = n_updated = 0
+        changes = proj_data.iter_collection_changes(
+            collection_name=config.collection_name,
+            watermark_field=config.watermark_field,
+            batch_size=config.export_batch_size,
+            after=watermark
+        )
+        for chunk, watermark in changes:
+            # An update timestamp is bookkeeping, not a feature
+            if config.watermark_field != store.id_column:
+                chunk = chunk.drop(columns=[config.watermark_field], errors="ignore")
+            inserted, updated = store.upsert(chunk)
+            n_inserted += inserted
+            n_updated += updated
+            # Saved after each merged chunk: an interrupted run resumes from there
+            store.write_watermark(config.collection_name, config.watermark_field, watermark)
+
+        dataframe = store.read_all()
+        if dataframe.columns.empty:
+            # Nothing ingested yet: keep the schema header, as the streaming export does
+            logging.warning(f"No documents ingested from '{config.collection_name}'; writing the schema header only.")
+            dataframe = DataFrame(columns=list(read_column_types()))
+        logging.info(f"Merged {n_inserted} new and {n_updated} updated records; "
+                     f"feature store holds {len(dataframe)} records (watermark {watermark}).")
+        return dataframe
+
     def _save_dataframe_to_csv(self, dataframe: DataFrame, file_path: str) -> None:
         """
         Save a DataFrame to the specified file path.
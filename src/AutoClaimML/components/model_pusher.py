@@ -1,5 +1,6 @@
 # model_pusher.py
 
+import os
 import sys
 
 from AutoClaimML.logger import logging
@@ -12,6 +13,7 @@ from AutoClaimML.entity.artifact_entity import (ModelEvaluationArtifact,
 from AutoClaimML.entity.s3_estimator import Proj1Estimator
 
 from AutoClaimML.cloud_storage.aws_storage import SimpleStorageService
+from AutoClaimML.utils.main_utils import load_object, save_mmap_object
 
 
 class ModelPusher:
@@ -32,6 +34,26 @@ class ModelPusher:
             model_path=model_pusher_config.s3_model_key_path
         )
 
+    def push_mmap_model(self, trained_model_path: str) -> None:
+        """
+        Writes the memory-mapped form of the trained model next to it and
+        uploads it to S3, where serving workers load it in preference to the pickle.
+        """
+        model = load_object(file_path=trained_model_path)
+        mmap_model_path = os.path.join(
+            os.path.dirname(trained_model_path),
+            os.path.basename(self.model_pusher_config.s3_mmap_model_key_path)
+        )
+        save_mmap_object(file_path=mmap_model_path, obj=model.to_compiled())
+
+        logging.info(f"Uploading memory-mapped model from local path: {mmap_model_path}")
+        self.s3.upload_file(
+            from_filename=mmap_model_path,
+            to_filename=self.model_pusher_config.s3_mmap_model_key_path,
+            bucket_name=self.model_pusher_config.bucket_name,
+            remove=False
+        )
+
     def initiate_model_pusher(self) -> ModelPusherArtifact:
         """
         Method Name : initiate_model_pusher
@@ -51,6 +73,10 @@ class ModelPusher:
             if not trained_model_path:
                 raise CustomException("Trained model path is missing in ModelEvaluationArtifact", sys)
             
+            # Published first: serving reloads when the pickled model's ETag changes,
+            # so the memory-mapped model must already be current by then
+            self.push_mmap_model(trained_model_path)
+
             logging.info(f"Uploading model from local path: {trained_model_path}")
             self.proj1_estimator.save_model(from_file=trained_model_path)
 
@@ -1,6 +1,7 @@
 # configuration.py
 import os
 import yaml
+from typing import Optional
 from AutoClaimML.constants import *
 from AutoClaimML.entity.config_entity import (TrainingPipelineConfig,
                                        DataIngestionConfig,
@@ -8,13 +9,57 @@ from AutoClaimML.entity.config_entity import (TrainingPipelineConfig,
                                        DataTransformationConfig,
                                        ModelTrainerConfig,
                                        ModelEvaluationConfig,
-                                       ModelPusherConfig)
+                                       ModelPusherConfig,
+                                       ServingConfig,
+                                       BatchScoringConfig,
+                                       CollectionScoringConfig)
 
 from AutoClaimML.constants import SCHEMA_FILE_PATH
 from dotenv import load_dotenv
 
 load_dotenv()
 
+
+def _env_bool(key: str, default: bool) -> bool:
+    """
+    Reads a boolean override from the environment ("1", "true", "yes" are truthy).
+    """
+    value = os.getenv(key)
+    return default if value is None else value.strip().lower() in ("1", "true", "yes")
+
+
+def _env_optional_float(key: str, default: Optional[float]) -> Optional[float]:
+    """
+    Reads an optional float override from the environment; an empty value means None.
+    """
+    value = os.getenv(key)
+    if value is None:
+        return default
+    return float(value) if value.strip() else None
+
+
+def _env_optional_int(key: str, default: Optional[int]) -> Optional[int]:
+    """
+    Reads an optional int override from the environment; an empty value means None.
+    """
+    value = os.getenv(key)
+    if value is None:
+        return default
+    return int(value) if value.strip() else None
+
+
+def _env_filter(key: str, default: Optional[str]) -> Optional[dict]:
+    """
+    Reads a MongoDB filter written in Extended JSON (dates as {"$date": ...})
+    from the environment; an empty value means no filter.
+    """
+    value = os.getenv(key, default)
+    if not value or not value.strip():
+        return None
+    from bson import json_util
+    return json_util.loads(value)
+
+
 class ConfigurationManager:
     """
     Manages creation of all pipeline configuration objects.
@@ -44,10 +89,26 @@ class ConfigurationManager:
         return DataIngestionConfig(
             data_ingestion_dir=ingestion_dir,
             feature_store_file_path=os.path.join(ingestion_dir, DATA_INGESTION_FEATURE_STORE_DIR, FILE_NAME),
+            feature_store_partitions_dir=os.path.join(
+                ingestion_dir, DATA_INGESTION_FEATURE_STORE_DIR, DATA_INGESTION_FEATURE_STORE_PARTITIONS_DIR
+            ),
             training_file_path=os.path.join(ingestion_dir, DATA_INGESTION_INGESTED_DIR, TRAIN_FILE_NAME),
             testing_file_path=os.path.join(ingestion_dir, DATA_INGESTION_INGESTED_DIR, TEST_FILE_NAME),
             train_test_split_ratio=DATA_INGESTION_TRAIN_TEST_SPLIT_RATIO,
-            collection_name=DATA_INGESTION_COLLECTION_NAME
+            collection_name=DATA_INGESTION_COLLECTION_NAME,
+            streaming_export=_env_bool("DATA_INGESTION_STREAMING_EXPORT", DATA_INGESTION_STREAMING_EXPORT),
+            export_batch_size=int(os.getenv("DATA_INGESTION_EXPORT_BATCH_SIZE", DATA_INGESTION_EXPORT_BATCH_SIZE)),
+            export_workers=int(os.getenv("DATA_INGESTION_EXPORT_WORKERS", DATA_INGESTION_EXPORT_WORKERS)),
+            export_partition_field=os.getenv("DATA_INGESTION_EXPORT_PARTITION_FIELD", DATA_INGESTION_EXPORT_PARTITION_FIELD),
+            export_decoder=os.getenv("DATA_INGESTION_EXPORT_DECODER", DATA_INGESTION_EXPORT_DECODER),
+            incremental=_env_bool("DATA_INGESTION_INCREMENTAL", DATA_INGESTION_INCREMENTAL),
+            watermark_field=os.getenv("DATA_INGESTION_WATERMARK_FIELD", DATA_INGESTION_WATERMARK_FIELD),
+            feature_store_partitions=int(
+                os.getenv("DATA_INGESTION_FEATURE_STORE_PARTITIONS", DATA_INGESTION_FEATURE_STORE_PARTITIONS)
+            ),
+            pushdown=_env_bool("DATA_INGESTION_PUSHDOWN", DATA_INGESTION_PUSHDOWN),
+            export_filter=_env_filter("DATA_INGESTION_FILTER", DATA_INGESTION_FILTER),
+            sample_size=_env_optional_int("DATA_INGESTION_SAMPLE_SIZE", DATA_INGESTION_SAMPLE_SIZE)
         )
     
     def get_data_validation_config(self) -> DataValidationConfig:
@@ -170,8 +231,126 @@ class ConfigurationManager:
         except Exception as e:
             raise Exception(f"Error in get_model_pusher_config: {e}")
 
+    def get_serving_config(self) -> ServingConfig:
+        """
+        Creates and returns the ServingConfig from constants, allowing each
+        value to be overridden by an environment variable of the same name.
+        """
+        try:
+            return ServingConfig(
+                model_watcher_enabled=_env_bool("MODEL_WATCHER_ENABLED", MODEL_WATCHER_ENABLED),
+                model_watcher_poll_interval_seconds=float(
+                    os.getenv("MODEL_WATCHER_POLL_INTERVAL_SECONDS", MODEL_WATCHER_POLL_INTERVAL_SECONDS)
+                ),
+                batch_prediction_max_records=int(
+                    os.getenv("BATCH_PREDICTION_MAX_RECORDS", BATCH_PREDICTION_MAX_RECORDS)
+                ),
+                file_prediction_chunk_rows=int(
+                    os.getenv("FILE_PREDICTION_CHUNK_ROWS", FILE_PREDICTION_CHUNK_ROWS)
+                ),
+                prediction_batching_enabled=_env_bool("PREDICTION_BATCHING_ENABLED", PREDICTION_BATCHING_ENABLED),
+                prediction_batch_max_size=int(
+                    os.getenv("PREDICTION_BATCH_MAX_SIZE", PREDICTION_BATCH_MAX_SIZE)
+                ),
+                prediction_batch_max_wait_seconds=float(
+                    os.getenv("PREDICTION_BATCH_MAX_WAIT_SECONDS", PREDICTION_BATCH_MAX_WAIT_SECONDS)
+                ),
+                inference_executor_workers=int(
+                    os.getenv("INFERENCE_EXECUTOR_WORKERS", INFERENCE_EXECUTOR_WORKERS)
+                ),
+                inference_executor_max_queue=int(
+                    os.getenv("INFERENCE_EXECUTOR_MAX_QUEUE", INFERENCE_EXECUTOR_MAX_QUEUE)
+                ),
+                admission_control_enabled=_env_bool("ADMISSION_CONTROL_ENABLED", ADMISSION_CONTROL_ENABLED),
+                admission_max_in_flight=int(
+                    os.getenv("ADMISSION_MAX_IN_FLIGHT", ADMISSION_MAX_IN_FLIGHT)
+                ),
+                admission_max_queue=int(
+                    os.getenv("ADMISSION_MAX_QUEUE", ADMISSION_MAX_QUEUE)
+                ),
+                admission_max_queue_wait_seconds=float(
+                    os.getenv("ADMISSION_MAX_QUEUE_WAIT_SECONDS", ADMISSION_MAX_QUEUE_WAIT_SECONDS)
+                ),
+                admission_retry_after_seconds=int(
+                    os.getenv("ADMISSION_RETRY_AFTER_SECONDS", ADMISSION_RETRY_AFTER_SECONDS)
+                ),
+                prediction_cache_enabled=_env_bool("PREDICTION_CACHE_ENABLED", PREDICTION_CACHE_ENABLED),
+                server_timing_enabled=_env_bool("SERVER_TIMING_ENABLED", SERVER_TIMING_ENABLED),
+                decision_threshold=_env_optional_float("PREDICTION_DECISION_THRESHOLD", PREDICTION_DECISION_THRESHOLD),
+                prediction_cache_max_entries=int(
+                    os.getenv("PREDICTION_CACHE_MAX_ENTRIES", PREDICTION_CACHE_MAX_ENTRIES)
+                ),
+                prediction_cache_ttl_seconds=float(
+                    os.getenv("PREDICTION_CACHE_TTL_SECONDS", PREDICTION_CACHE_TTL_SECONDS)
+                ),
+                training_job_history_size=int(
+                    os.getenv("TRAINING_JOB_HISTORY_SIZE", TRAINING_JOB_HISTORY_SIZE)
+                ),
+                training_job_poll_interval_seconds=float(
+                    os.getenv("TRAINING_JOB_POLL_INTERVAL_SECONDS", TRAINING_JOB_POLL_INTERVAL_SECONDS)
+                ),
+                training_job_cancel_grace_seconds=float(
+                    os.getenv("TRAINING_JOB_CANCEL_GRACE_SECONDS", TRAINING_JOB_CANCEL_GRACE_SECONDS)
+                ),
+                training_job_state_dir=os.getenv("TRAINING_JOB_STATE_DIR", TRAINING_JOB_STATE_DIR)
+            )
+        except Exception as e:
+            raise Exception(f"Error in get_serving_config: {e}")
 
+    def get_batch_scoring_config(
+        self,
+        input_path: str,
+        output_path: str,
+        model_path: str = None,
+        n_workers: int = None,
+        chunk_rows: int = None,
+        output_format: str = None
+    ) -> BatchScoringConfig:
+        """
+        Creates and returns the BatchScoringConfig for one scoring run; options
+        left as None fall back to the constants.
+        """
+        try:
+            return BatchScoringConfig(
+                input_path=input_path,
+                output_path=output_path,
+                model_path=model_path,
+                bucket_name=MODEL_BUCKET_NAME,
+                s3_model_key_path=MODEL_FILE_NAME,
+                s3_mmap_model_key_path=MMAP_MODEL_FILE_NAME,
+                model_cache_dir=MODEL_CACHE_DIR,
+                n_workers=n_workers or BATCH_SCORING_WORKERS,
+                chunk_rows=chunk_rows or BATCH_SCORING_CHUNK_ROWS,
+                shard_bytes=BATCH_SCORING_SHARD_BYTES,
+                output_format=output_format or BATCH_SCORING_OUTPUT_FORMAT
+            )
+        except Exception as e:
+            raise Exception(f"Error in get_batch_scoring_config: {e}")
 
-
-    
-
+    def get_collection_scoring_config(
+        self,
+        collection_name: str = COLLECTION_NAME,
+        model_path: str = None,
+        batch_size: int = None,
+        resume: bool = True
+    ) -> CollectionScoringConfig:
+        """
+        Creates and returns the CollectionScoringConfig for scoring a MongoDB
+        collection in place; the checkpoint file is kept per collection.
+        """
+        try:
+            scoring_dir = os.path.join(self.training_pipeline_config.artifact_dir, COLLECTION_SCORING_DIR_NAME)
+            return CollectionScoringConfig(
+                collection_name=collection_name,
+                checkpoint_file_path=os.path.join(scoring_dir, f"{collection_name}.checkpoint.json"),
+                database_name=DATABASE_NAME,
+                model_path=model_path,
+                bucket_name=MODEL_BUCKET_NAME,
+                s3_model_key_path=MODEL_FILE_NAME,
+                s3_mmap_model_key_path=MMAP_MODEL_FILE_NAME,
+                model_cache_dir=MODEL_CACHE_DIR,
+                batch_size=batch_size or COLLECTION_SCORING_BATCH_SIZE,
+                resume=resume
+            )
+        except Exception as e:
+            raise Exception(f"Error in get_collection_scoring_config: {e}")
@@ -7,7 +7,7 @@ import certifi
 
 from AutoClaimML.exception import CustomException
 from AutoClaimML.logger import logging
-from AutoClaimML.constants import DATABASE_NAME, MONGODB_URL_KEY
+from AutoClaimML.constants import DATABASE_NAME, MONGODB_MAX_POOL_SIZE, MONGODB_URL_KEY
 
 # Load the certificate authority file to avoid timeout errors when connecting to MongoDB
 ca = certifi.where()
@@ -61,8 +61,12 @@ class MongoDBClient:
 
             # Create MongoClient only once
             if MongoDBClient.client is None:
-                MongoDBClient.client = pymongo.MongoClient(mongo_db_url, tlsCAFile=ca_file)
-                logging.info("MongoDB client initialized.")
+                # Sized for concurrent readers such as the parallel feature store export
+                max_pool_size = int(os.getenv("MONGODB_MAX_POOL_SIZE", MONGODB_MAX_POOL_SIZE))
+                MongoDBClient.client = pymongo.MongoClient(
+                    mongo_db_url, tlsCAFile=ca_file, maxPoolSize=max_pool_size
+                )
+                logging.info(f"MongoDB client initialized (max pool size {max_pool_size}).")
 
             # Assign client and database reference
             self.client = MongoDBClient.client
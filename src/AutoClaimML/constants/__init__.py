@@ -3,18 +3,22 @@
 import os
 import sys
 from datetime import date 
+from typing import Optional
 
 
 # For MongoDB connection
 DATABASE_NAME = "VehicleDB"
 COLLECTION_NAME = "VehicleDB-Data"
 MONGODB_URL_KEY = "MONGODB_URL"
+# Connections per MongoClient pool, shared by all threads of a process
+MONGODB_MAX_POOL_SIZE: int = 100
 
 
 PIPELINE_NAME: str = ""
 ARTIFACT_DIR: str = "artifacts"
 
 MODEL_FILE_NAME = "model.pkl"
+MMAP_MODEL_FILE_NAME = "model.mmap"
 
 TARGET_COLUMN = "Response"
 CURRENT_YEAR = date.today().year
@@ -25,12 +29,48 @@ TRAIN_FILE_NAME: str = "train.csv"
 TEST_FILE_NAME: str = "test.csv"
 SCHEMA_FILE_PATH = os.path.join("config", "schema.yaml")
 
+# Training pipeline stage names, in execution order (same names as `main.py --stage`)
+TRAINING_PIPELINE_STAGES = (
+    "data_ingestion",
+    "data_validation",
+    "data_transformation",
+    "model_trainer",
+    "model_evaluation",
+    "model_pusher",
+)
+
 # Data Ingestion stage
 DATA_INGESTION_COLLECTION_NAME = "Vehicle-Data"
 DATA_INGESTION_DIR_NAME = "data_ingestion"
 DATA_INGESTION_FEATURE_STORE_DIR = "feature_store"
 DATA_INGESTION_INGESTED_DIR = "ingested"
 DATA_INGESTION_TRAIN_TEST_SPLIT_RATIO = 0.25
+# Streaming export reads the collection through a projected cursor and writes
+# it to the feature store chunk by chunk, bounding memory by the chunk size
+DATA_INGESTION_STREAMING_EXPORT: bool = False
+DATA_INGESTION_EXPORT_BATCH_SIZE: int = 50000
+# Parallel export: the collection is split into this many ranges of the
+# partition field, read concurrently and assembled in range order (1 = one cursor)
+DATA_INGESTION_EXPORT_WORKERS: int = 1
+DATA_INGESTION_EXPORT_PARTITION_FIELD: str = "_id"
+# Streaming export decoder: "arrow" decodes raw BSON batches into typed columns
+# with the optional pymongoarrow, "python" builds a dict per document, "auto"
+# uses "arrow" when pymongoarrow is installed
+DATA_INGESTION_EXPORT_DECODER: str = "auto"
+# Incremental ingestion: only documents above the stored watermark ("_id" for
+# inserts, or an update timestamp field) are read and upserted by id into a
+# feature store partitioned by id
+DATA_INGESTION_INCREMENTAL: bool = False
+DATA_INGESTION_WATERMARK_FIELD: str = "_id"
+DATA_INGESTION_FEATURE_STORE_PARTITIONS_DIR: str = "partitions"
+DATA_INGESTION_FEATURE_STORE_PARTITIONS: int = 16
+# Server-side cleaning (streaming export): an aggregation pipeline projects the
+# schema fields and converts "na" and the schema types on the server.
+# DATA_INGESTION_FILTER (a MongoDB Extended JSON filter, e.g. a date range or a
+# region subset) and DATA_INGESTION_SAMPLE_SIZE restrict the documents exported
+DATA_INGESTION_PUSHDOWN: bool = False
+DATA_INGESTION_FILTER: Optional[str] = None
+DATA_INGESTION_SAMPLE_SIZE: Optional[int] = None
 
 
 # Data Validation Stage
@@ -60,4 +100,58 @@ MODEL_BUCKET_NAME = "my-autoclaim-bucket"
 MODEL_PUSHER_S3_KEY = "model-registry"
 
 APP_HOST = "0.0.0.0"
-APP_PORT = 5000
\ No newline at end of file
+APP_PORT = 5000
+
+# Model serving
+MODEL_WATCHER_ENABLED: bool = True
+MODEL_WATCHER_POLL_INTERVAL_SECONDS: float = 60.0
+BATCH_PREDICTION_MAX_RECORDS: int = 10000
+FILE_PREDICTION_CHUNK_ROWS: int = 50000
+PREDICTION_BATCHING_ENABLED: bool = True
+PREDICTION_BATCH_MAX_SIZE: int = 32
+PREDICTION_BATCH_MAX_WAIT_SECONDS: float = 0.002
+INFERENCE_EXECUTOR_WORKERS: int = min(4, os.cpu_count() or 1)
+INFERENCE_EXECUTOR_MAX_QUEUE: int = 256
+# Admission control of prediction requests (per worker process): at most
+# ADMISSION_MAX_IN_FLIGHT are handled at once; others wait, up to
+# ADMISSION_MAX_QUEUE of them for at most ADMISSION_MAX_QUEUE_WAIT_SECONDS,
+# and are otherwise rejected with 503 and Retry-After
+ADMISSION_CONTROL_ENABLED: bool = True
+ADMISSION_MAX_IN_FLIGHT: int = 64
+ADMISSION_MAX_QUEUE: int = 256
+ADMISSION_MAX_QUEUE_WAIT_SECONDS: float = 0.5
+ADMISSION_RETRY_AFTER_SECONDS: int = 1
+# Batches up to this size are scored by the compiled forest engine; larger
+# ones go to sklearn, whose per-call overhead is amortized by then
+COMPILED_FOREST_MAX_ROWS: int = 256
+# Inputs up to this size skip the ColumnTransformer and are encoded by RowEncoder
+ROW_ENCODER_MAX_ROWS: int = 256
+# Serve the memory-mapped model when it is published, so workers on a host share its arrays
+MMAP_MODEL_ENABLED: bool = True
+MODEL_CACHE_DIR: str = os.path.join(ARTIFACT_DIR, "model_cache")
+PREDICTION_CACHE_ENABLED: bool = True
+# Positive-class probability from which a row is labelled positive; None keeps
+# the most probable class (the forest's own rule)
+PREDICTION_DECISION_THRESHOLD: Optional[float] = None
+# Adds a Server-Timing header with the per-stage breakdown to every response
+SERVER_TIMING_ENABLED: bool = False
+PREDICTION_CACHE_MAX_ENTRIES: int = 100000
+PREDICTION_CACHE_TTL_SECONDS: float = 3600.0
+TRAINING_JOB_HISTORY_SIZE: int = 20
+TRAINING_JOB_POLL_INTERVAL_SECONDS: float = 1.0
+TRAINING_JOB_CANCEL_GRACE_SECONDS: float = 10.0
+# Training job state shared by the server's worker processes (same host)
+TRAINING_JOB_STATE_DIR: str = os.path.join(ARTIFACT_DIR, "training_jobs")
+
+# Batch scoring
+BATCH_SCORING_WORKERS: int = os.cpu_count() or 1
+BATCH_SCORING_CHUNK_ROWS: int = 50000
+BATCH_SCORING_SHARD_BYTES: int = 64 * 1024 * 1024
+BATCH_SCORING_OUTPUT_FORMAT: str = "csv"
+
+# Collection scoring (predictions written back to the MongoDB documents)
+COLLECTION_SCORING_BATCH_SIZE: int = 5000
+COLLECTION_SCORING_DIR_NAME: str = "collection_scoring"
+COLLECTION_SCORING_PREDICTION_FIELD: str = "prediction"
+COLLECTION_SCORING_PROBABILITY_FIELD: str = "probability"
+COLLECTION_SCORING_MODEL_VERSION_FIELD: str = "model_version"
@@ -0,0 +1,122 @@
+# feature_store.py
+
+import glob
+import os
+from typing import Any, Optional, Tuple
+
+import pandas as pd
+from bson import json_util
+
+from AutoClaimML.logger import logging
+
+
+class PartitionedFeatureStore:
+    """
+    Local feature store kept up to date by incremental ingestion.
+
+    Rows live in `n_partitions` CSV files, partitioned by `id % n_partitions`,
+    so merging a delta only rewrites the partitions it touches. A delta is
+    upserted by id: rows whose id is already stored replace the old row, the
+    others are appended. Next to the partitions, a watermark file records how
+    far the source collection has been read.
+    """
+
+    WATERMARK_FILE_NAME = "watermark.json"
+
+    def __init__(self, store_dir: str, n_partitions: int, id_column: str = "id") -> None:
+        """
+        :param store_dir: Directory holding the partition files and the watermark.
+        :param n_partitions: Number of partitions; changing it requires a full rebuild.
+        :param id_column: Integer column identifying a row across deltas.
+        """
+        self.store_dir = store_dir
+        self.n_partitions = n_partitions
+        self.id_column = id_column
+
+    @property
+    def watermark_file_path(self) -> str:
+        return os.path.join(self.store_dir, self.WATERMARK_FILE_NAME)
+
+    def partition_path(self, partition: int) -> str:
+        return os.path.join(self.store_dir, f"part-{partition:05d}.csv")
+
+    def read_watermark(self, collection_name: str, field: str) -> Optional[Any]:
+        """
+        Returns the highest `field` value already merged from `collection_name`,
+        or None when the store is empty or was built from another collection,
+        watermark field or partitioning (the store must then be rebuilt).
+        """
+        if not os.path.exists(self.watermark_file_path):
+            return None
+        with open(self.watermark_file_path) as watermark_file:
+            state = json_util.loads(watermark_file.read())
+
+        expected = {"collection_name": collection_name, "field": field, "n_partitions": self.n_partitions}
+        if any(state.get(key) != value for key, value in expected.items()):
+            logging.info(f"Feature store watermark {state} does not match {expected}; rebuilding the store.")
+            return None
+        return state["value"]
+
+    def write_watermark(self, collection_name: str, field: str, value: Any) -> None:
+        """
+        Records that every document up to `value` of `field` has been merged,
+        replacing the watermark file atomically.
+        """
+        os.makedirs(self.store_dir, exist_ok=True)
+        tmp_path = f"{self.watermark_file_path}.tmp"
+        with open(tmp_path, "w") as watermark_file:
+            watermark_file.write(json_util.dumps({
+                "collection_name": collection_name,
+                "field": field,
+                "n_partitions": self.n_partitions,
+                "value": value,
+            }))
+        os.replace(tmp_path, self.watermark_file_path)
+
+    def reset(self) -> None:
+        """
+        Removes every partition and the watermark.
+        """
+        for path in glob.glob(os.path.join(self.store_dir, "part-*.csv")) + [self.watermark_file_path]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def upsert(self, chunk: pd.DataFrame) -> Tuple[int, int]:
+        """
+        Merges a delta into the store by id. Within the delta, the last row of
+        an id wins, so deltas must be given in watermark order.
+
+        :param chunk: Rows to merge, with the same columns as the stored rows.
+        :return: (rows inserted, rows updated).
+        """
+        os.makedirs(self.store_dir, exist_ok=True)
+        chunk = chunk.drop_duplicates(subset=self.id_column, keep="last")
+        partitions = chunk[self.id_column].astype("int64") % self.n_partitions
+
+        n_inserted = n_updated = 0
+        for partition, rows in chunk.groupby(partitions, sort=True):
+            path = self.partition_path(int(partition))
+            n_delta = len(rows)
+            if os.path.exists(path):
+                stored = pd.read_csv(path)
+                replaced = stored[self.id_column].isin(rows[self.id_column])
+                n_updated += int(replaced.sum())
+                n_inserted += n_delta - int(replaced.sum())
+                rows = pd.concat([stored[~replaced], rows], ignore_index=True)[stored.columns]
+            else:
+                n_inserted += n_delta
+
+            tmp_path = f"{path}.tmp"
+            rows.to_csv(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        return n_inserted, n_updated
+
+    def read_all(self) -> pd.DataFrame:
+        """
+        Returns every stored row, ordered by id.
+        """
+        paths = sorted(glob.glob(os.path.join(self.store_dir, "part-*.csv")))
+        if not paths:
+            return pd.DataFrame()
+        dataframe = pd.concat([pd.read_csv(path) for path in paths], ignore_index=True)
+        return dataframe.sort_values(self.id_column, ignore_index=True)
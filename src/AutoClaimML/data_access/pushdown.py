@@ -0,0 +1,68 @@
+# pushdown.py
+
+from typing import Dict, List, Optional, Tuple
+
+from AutoClaimML.constants import SCHEMA_FILE_PATH
+from AutoClaimML.utils.main_utils import read_yaml_file
+
+
+# $convert target types of the `columns` section of config/schema.yaml
+CONVERT_TYPES = {"int": "long", "float": "double", "category": "string"}
+
+
+def read_column_types(schema_file_path: str = SCHEMA_FILE_PATH) -> Dict[str, str]:
+    """
+    Returns the raw collection fields and their schema types ("int", "float"
+    or "category") from the `columns` section of the schema file, in order.
+    """
+    schema_config = read_yaml_file(file_path=schema_file_path)
+    return {
+        name: dtype
+        for column in schema_config["columns"]
+        for name, dtype in column.items()
+    }
+
+
+def cleaning_expression(field: str, dtype: str) -> dict:
+    """
+    Returns the $project expression cleaning one field on the server: the
+    "na" placeholder becomes null, and the value is converted to its schema
+    type; values that cannot be converted become null as well.
+    """
+    return {"$convert": {
+        "input": {"$cond": [{"$eq": [f"${field}", "na"]}, None, f"${field}"]},
+        "to": CONVERT_TYPES[dtype],
+        "onError": None,
+        "onNull": None,
+    }}
+
+
+def build_cleaning_pipeline(
+    column_types: Dict[str, str],
+    query: Optional[dict] = None,
+    sort: Optional[List[Tuple[str, int]]] = None,
+    sample_size: Optional[int] = None
+) -> List[dict]:
+    """
+    Builds the aggregation pipeline returning the schema fields of the
+    matching documents cleaned and typed by the server, so that neither
+    `_id`, other fields nor "na" strings are sent to the client.
+
+    :param column_types: Fields to return and their schema types, see read_column_types.
+    :param query: Filter applied first (e.g. a date range or a region subset), using indexes.
+    :param sort: Sort order of the returned documents.
+    :param sample_size: Returns a random sample of this many matching documents.
+    :return: The pipeline, for Collection.aggregate or aggregate_raw_batches.
+    """
+    pipeline = []
+    if query:
+        pipeline.append({"$match": query})
+    if sample_size:
+        pipeline.append({"$sample": {"size": sample_size}})
+    if sort:
+        pipeline.append({"$sort": dict(sort)})
+    pipeline.append({"$project": {
+        "_id": 0,
+        **{field: cleaning_expression(field, dtype) for field, dtype in column_types.items()},
+    }})
+    return pipeline
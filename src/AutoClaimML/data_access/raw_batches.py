@@ -0,0 +1,153 @@
+# raw_batches.py
+
+import struct
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from AutoClaimML.constants import SCHEMA_FILE_PATH
+from AutoClaimML.data_access.pushdown import read_column_types
+from AutoClaimML.logger import logging
+
+
+# Decoders for VehicleDB exports: "arrow" decodes raw BSON batches with
+# pymongoarrow, "python" builds one dict per document with pymongo, and
+# "auto" picks "arrow" when pymongoarrow is installed (the optional "arrow" extra)
+EXPORT_DECODERS = ("auto", "arrow", "python")
+
+_BSON_DOCUMENT_LENGTH = struct.Struct("<i")
+
+
+def pymongoarrow_available() -> bool:
+    """
+    Returns whether the optional pymongoarrow package can be imported.
+    """
+    try:
+        import pymongoarrow.context  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class RawBatchDecoder:
+    """
+    Decodes raw BSON batches (as returned by Collection.find_raw_batches)
+    straight into typed Arrow columns with pymongoarrow, then into a DataFrame
+    chunk, without building a Python dict per document.
+
+    Columns and their types come from the `columns` section of
+    config/schema.yaml. Int fields are decoded as float64 and cast to int64
+    when the chunk has no nulls, as the dict-based export infers them; a
+    non-integral value in an int field raises. The "na" strings of numeric
+    fields are decoded as nulls; any other value of an unexpected type, which
+    pymongoarrow would silently turn into a null, raises a ValueError.
+    """
+
+    ARROW_TYPES = {"int": "float64", "float": "float64", "category": "string"}
+    # Type each column is decoded as to find out what its nulls held
+    PROBE_TYPES = {"int": "string", "float": "string", "category": "float64"}
+
+    def __init__(self, schema_file_path: str = SCHEMA_FILE_PATH) -> None:
+        """
+        :param schema_file_path: Path to the schema YAML file.
+        :raises ImportError: If pymongoarrow is not installed.
+        """
+        self.column_types: Dict[str, str] = read_column_types(schema_file_path)
+        self.schema = self._schema({name: self.ARROW_TYPES[dtype] for name, dtype in self.column_types.items()})
+
+    @staticmethod
+    def _schema(arrow_types: Dict[str, str]):
+        import pyarrow as pa
+        from pymongoarrow.api import Schema
+
+        return Schema({name: getattr(pa, arrow_type)() for name, arrow_type in arrow_types.items()})
+
+    @staticmethod
+    def _decode(raw_batch: bytes, schema) -> pd.DataFrame:
+        from pymongoarrow.context import PyMongoArrowContext
+
+        context = PyMongoArrowContext(schema, allow_invalid=True)
+        context.process_bson_stream(raw_batch)
+        return context.finish().to_pandas()
+
+    @staticmethod
+    def _document_offsets(raw_batch: bytes, n_documents: int) -> List[int]:
+        """
+        Returns the start offsets of the first `n_documents` BSON documents of
+        the batch, followed by the end of the last one.
+        """
+        # Every BSON document starts with its total length, as a little-endian int32
+        unpack_length = _BSON_DOCUMENT_LENGTH.unpack_from
+        offsets, position = [0], 0
+        for _ in range(n_documents):
+            position += unpack_length(raw_batch, position)[0]
+            offsets.append(position)
+        return offsets
+
+    def _check_nulls(self, raw_batch: bytes, chunk: pd.DataFrame) -> None:
+        """
+        Raises if a null of the chunk stands for a value of an unexpected type
+        rather than a missing field, a null or the "na" placeholder.
+        """
+        null_columns = [name for name in chunk.columns if chunk[name].isna().any()]
+        if not null_columns:
+            return
+
+        # Only the documents holding nulls are decoded again, as the probe types:
+        # a value of the wrong type decodes as null in its column, but not in the probe
+        null_rows = np.flatnonzero(chunk[null_columns].isna().any(axis=1).to_numpy())
+        offsets = self._document_offsets(raw_batch, null_rows[-1] + 1)
+        view = memoryview(raw_batch)
+        probe = self._decode(
+            b"".join(view[offsets[row]:offsets[row + 1]] for row in null_rows),
+            self._schema({name: self.PROBE_TYPES[self.column_types[name]] for name in null_columns})
+        )
+        invalid = {}
+        for name in null_columns:
+            nulled = chunk[name].to_numpy()[null_rows]
+            nulled = pd.isna(nulled) & probe[name].notna().to_numpy()
+            if self.column_types[name] != "category":
+                nulled &= (probe[name] != "na").to_numpy()
+            if nulled.any():
+                invalid[name] = int(nulled.sum())
+        if invalid:
+            raise ValueError(
+                f"Values of unexpected types in {invalid} (column: count) cannot be decoded by the "
+                "arrow decoder; fix the documents or export with the 'python' decoder."
+            )
+
+    @property
+    def columns(self) -> List[str]:
+        """Decoded columns, in schema order."""
+        return list(self.column_types)
+
+    @property
+    def projection(self) -> dict:
+        """Cursor projection returning only the decoded fields."""
+        return {"_id": 0, **{name: 1 for name in self.column_types}}
+
+    def decode(self, raw_batch: bytes) -> pd.DataFrame:
+        """
+        Decodes one raw batch of concatenated BSON documents.
+
+        :param raw_batch: Bytes of one find_raw_batches batch.
+        :return: Chunk with one column per schema field; "na" strings of text
+                 fields are replaced with np.nan and int fields holding nulls are
+                 nullable Int64, as in the dict-based export.
+        :raises ValueError: If a field holds a value of an unexpected type.
+        """
+        chunk = self._decode(raw_batch, self.schema)
+        self._check_nulls(raw_batch, chunk)
+
+        for name, dtype in self.column_types.items():
+            if dtype != "int":
+                continue
+            values = chunk[name]
+            if (values.dropna() % 1 != 0).any():
+                raise ValueError(f"Column {name!r} is typed int in the schema but holds non-integral values.")
+            chunk[name] = values.astype("Int64" if values.isna().any() else np.int64)
+
+        text_columns = [name for name, dtype in self.column_types.items() if dtype == "category"]
+        chunk[text_columns] = chunk[text_columns].replace({"na": np.nan})
+        return chunk
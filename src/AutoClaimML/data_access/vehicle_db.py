@@ -1,10 +1,16 @@
+import os
+import shutil
 import sys
+import tempfile
 import pandas as pd
 import numpy as np
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator, List, Optional, Tuple
 
 from AutoClaimML.configuration.mongo_db_connection import MongoDBClient
 from AutoClaimML.constants import DATABASE_NAME, COLLECTION_NAME
+from AutoClaimML.data_access.pushdown import build_cleaning_pipeline, read_column_types
+from AutoClaimML.data_access.raw_batches import EXPORT_DECODERS, RawBatchDecoder, pymongoarrow_available
 from AutoClaimML.exception import CustomException
 from AutoClaimML.logger import logging
 
@@ -77,4 +83,459 @@ class VehicleDB:
             return df
 
         except Exception as e:
-            raise CustomException(e, sys)
\ No newline at end of file
+            raise CustomException(e, sys)
+
+    def _get_collection(self, collection_name: str, database_name: Optional[str] = None):
+        """
+        Returns the named collection of the configured (or the given) database.
+        """
+        db = (
+            self.mongo_client.database
+            if database_name is None
+            else self.mongo_client.get_database(database_name)
+        )
+        return db[collection_name]
+
+    @staticmethod
+    def documents_to_dataframe(documents: List[dict], columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Converts a batch of documents into a typed DataFrame chunk.
+
+        Parameters
+        ----------
+        documents : List[dict]
+            Documents fetched without their '_id' field.
+        columns : Optional[List[str]]
+            Column order to enforce, e.g. the columns of the first chunk, so
+            every chunk of an export lines up with the same CSV header.
+
+        Returns
+        -------
+        pd.DataFrame
+            The chunk, with "na" strings replaced by np.nan and columns that
+            only held "na" besides numbers converted to numeric dtypes;
+            integer columns become nullable Int64, so they are written as
+            integers whether or not a chunk holds "na".
+        """
+        chunk = pd.DataFrame.from_records(documents)
+        if columns is not None:
+            extra = [column for column in chunk.columns if column not in columns]
+            if extra:
+                logging.warning(f"Dropping fields missing from the first chunk: {extra}")
+            chunk = chunk.reindex(columns=columns)
+        text_columns = chunk.select_dtypes(include=["object", "string"]).columns
+        if len(text_columns):
+            replaced = chunk[text_columns].replace({"na": np.nan})
+            integer_columns = [
+                column for column in text_columns
+                if pd.api.types.infer_dtype(replaced[column], skipna=True) == "integer"
+            ]
+            chunk[text_columns] = replaced.infer_objects()
+            if integer_columns:
+                chunk[integer_columns] = replaced[integer_columns].astype("Int64")
+        return chunk
+
+    def iter_collection_chunks(
+        self,
+        collection_name: str,
+        batch_size: int,
+        database_name: Optional[str] = None,
+        query: Optional[dict] = None,
+        sort: Optional[List[Tuple[str, int]]] = None,
+        columns: Optional[List[str]] = None,
+        raw_batch_decoder: Optional[RawBatchDecoder] = None,
+        pushdown: bool = False,
+        sample_size: Optional[int] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Streams a MongoDB collection as typed DataFrame chunks of `batch_size` rows.
+
+        '_id' is excluded by the server, and only one batch of documents is held
+        in memory at a time. With `pushdown`, the documents are read through an
+        aggregation pipeline (see build_cleaning_pipeline) returning only the
+        schema fields, already cleaned and typed by the server.
+
+        Parameters
+        ----------
+        collection_name : str
+            The name of the MongoDB collection to export.
+        batch_size : int
+            Documents per cursor batch and per DataFrame chunk.
+        database_name : Optional[str]
+            The name of the MongoDB database (defaults to the configured DATABASE_NAME).
+        query : Optional[dict]
+            Filter selecting the documents to read (default: all of them).
+        sort : Optional[List[Tuple[str, int]]]
+            Cursor sort order (default: natural order).
+        columns : Optional[List[str]]
+            Columns of every chunk (default: those of the first chunk).
+        raw_batch_decoder : Optional[RawBatchDecoder]
+            Decoder turning raw BSON batches into chunks (see get_raw_batch_decoder);
+            without one, each document is decoded into a dict by pymongo.
+        pushdown : bool
+            Cleans and types the schema fields on the server.
+        sample_size : Optional[int]
+            Reads a random sample of this many matching documents (requires pushdown).
+
+        Yields
+        ------
+        pd.DataFrame
+            Chunks sharing the same columns.
+        """
+        collection = self._get_collection(collection_name, database_name)
+        if sample_size and not pushdown:
+            raise ValueError("Sampling documents requires the aggregation pushdown.")
+
+        if pushdown:
+            column_types = read_column_types()
+            columns = columns or list(column_types)
+            pipeline = build_cleaning_pipeline(column_types, query=query, sort=sort, sample_size=sample_size)
+            if raw_batch_decoder is not None:
+                raw_cursor = collection.aggregate_raw_batches(pipeline, batchSize=batch_size, allowDiskUse=True)
+            else:
+                cursor = collection.aggregate(pipeline, batchSize=batch_size, allowDiskUse=True)
+        elif raw_batch_decoder is not None:
+            raw_cursor = collection.find_raw_batches(
+                query or {}, raw_batch_decoder.projection, sort=sort, batch_size=batch_size
+            )
+        else:
+            cursor = collection.find(query or {}, {"_id": 0}, sort=sort, batch_size=batch_size)
+
+        if raw_batch_decoder is not None:
+            # One chunk per server batch, decoded column-wise from the raw BSON
+            try:
+                for raw_batch in raw_cursor:
+                    chunk = raw_batch_decoder.decode(raw_batch)
+                    yield chunk if columns is None else chunk.reindex(columns=columns)
+            finally:
+                raw_cursor.close()
+            return
+
+        try:
+            documents = []
+            for document in cursor:
+                documents.append(document)
+                if len(documents) == batch_size:
+                    chunk = self.documents_to_dataframe(documents, columns)
+                    columns = columns or list(chunk.columns)
+                    yield chunk
+                    documents = []
+            if documents:
+                yield self.documents_to_dataframe(documents, columns)
+        finally:
+            cursor.close()
+
+    def iter_collection_changes(
+        self,
+        collection_name: str,
+        watermark_field: str,
+        batch_size: int,
+        after: Optional[Any] = None,
+        database_name: Optional[str] = None
+    ) -> Iterator[Tuple[pd.DataFrame, Any]]:
+        """
+        Streams the documents whose `watermark_field` is above `after` (all of
+        them when `after` is None), in `watermark_field` order, as typed chunks.
+
+        An ascending index on the watermark field is created if missing, so a
+        delta is an index range scan instead of a collection scan.
+
+        Parameters
+        ----------
+        collection_name : str
+            The name of the MongoDB collection to read.
+        watermark_field : str
+            '_id' (catches inserts only) or an update timestamp set on every write.
+        batch_size : int
+            Documents per cursor batch and per DataFrame chunk.
+        after : Optional[Any]
+            The watermark of the previous run.
+        database_name : Optional[str]
+            The name of the MongoDB database (defaults to the configured DATABASE_NAME).
+
+        Yields
+        ------
+        Tuple[pd.DataFrame, Any]
+            Each chunk (without '_id', with any other watermark field) and the
+            watermark reached after it.
+        """
+        collection = self._get_collection(collection_name, database_name)
+        if watermark_field != "_id":
+            collection.create_index([(watermark_field, 1)])
+
+        query = {} if after is None else {watermark_field: {"$gt": after}}
+        projection = None if watermark_field == "_id" else {"_id": 0}
+        cursor = collection.find(query, projection, sort=[(watermark_field, 1)], batch_size=batch_size)
+        columns = None
+        watermark = after
+        try:
+            documents = []
+            for document in cursor:
+                if document.get(watermark_field) is not None:
+                    watermark = document[watermark_field]
+                document.pop("_id", None)
+                documents.append(document)
+                if len(documents) == batch_size:
+                    chunk = self.documents_to_dataframe(documents, columns)
+                    columns = columns or list(chunk.columns)
+                    yield chunk, watermark
+                    documents = []
+            if documents:
+                yield self.documents_to_dataframe(documents, columns), watermark
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def get_raw_batch_decoder(decoder: str = "auto") -> Optional[RawBatchDecoder]:
+        """
+        Resolves the export decoder setting.
+
+        Parameters
+        ----------
+        decoder : str
+            "arrow" (raw BSON batches decoded by pymongoarrow), "python" (one
+            dict per document) or "auto" ("arrow" when pymongoarrow is installed,
+            "python" otherwise).
+
+        Returns
+        -------
+        Optional[RawBatchDecoder]
+            The raw batch decoder, or None for the dict-based path.
+
+        Raises
+        ------
+        ValueError
+            If the decoder is unknown, or "arrow" is requested without pymongoarrow.
+        """
+        if decoder not in EXPORT_DECODERS:
+            raise ValueError(f"Unknown export decoder {decoder!r}; expected one of {', '.join(EXPORT_DECODERS)}.")
+        if decoder == "python":
+            return None
+
+        if not pymongoarrow_available():
+            if decoder == "arrow":
+                raise ValueError(
+                    "The 'arrow' export decoder requires the optional 'pymongoarrow' package "
+                    "(pip install 'AutoClaimML[arrow]')."
+                )
+            return None
+        return RawBatchDecoder()
+
+    def partition_ranges(
+        self,
+        collection_name: str,
+        n_partitions: int,
+        field: str = "_id",
+        database_name: Optional[str] = None,
+        sample_size_per_partition: int = 100
+    ) -> List[dict]:
+        """
+        Splits a collection into contiguous ranges of `field` holding roughly the
+        same number of documents, using boundaries taken from a `$sample`.
+
+        Parameters
+        ----------
+        collection_name : str
+            The name of the MongoDB collection to split.
+        n_partitions : int
+            The number of ranges wanted; fewer are returned for small collections.
+        field : str
+            An indexed field present in every document, '_id' or 'id'.
+        database_name : Optional[str]
+            The name of the MongoDB database (defaults to the configured DATABASE_NAME).
+        sample_size_per_partition : int
+            Sampled documents per range; more gives more even ranges.
+
+        Returns
+        -------
+        List[dict]
+            Range filters in ascending order, together covering every document
+            that has the field: the first has no lower bound and the last no upper bound.
+        """
+        collection = self._get_collection(collection_name, database_name)
+        sample = collection.aggregate([
+            {"$sample": {"size": n_partitions * sample_size_per_partition}},
+            {"$project": {field: 1}},
+        ])
+        values = sorted(document[field] for document in sample if field in document)
+
+        boundaries = []
+        for i in range(1, n_partitions):
+            if values:
+                boundary = values[i * len(values) // n_partitions]
+                if not boundaries or boundary > boundaries[-1]:
+                    boundaries.append(boundary)
+
+        lower_bounds = [None] + boundaries
+        upper_bounds = boundaries + [None]
+        ranges = []
+        for lower, upper in zip(lower_bounds, upper_bounds):
+            condition = {}
+            if lower is not None:
+                condition["$gte"] = lower
+            if upper is not None:
+                condition["$lt"] = upper
+            ranges.append({field: condition} if condition else {})
+        return ranges
+
+    def _export_range_to_csv(
+        self,
+        collection_name: str,
+        query: dict,
+        field: str,
+        columns: List[str],
+        file_path: str,
+        batch_size: int,
+        database_name: Optional[str],
+        raw_batch_decoder: Optional[RawBatchDecoder],
+        pushdown: bool
+    ) -> int:
+        """
+        Writes one range of the collection, in `field` order and without a header, to a part file.
+        """
+        n_rows = 0
+        with open(file_path, "w", newline="") as csv_file:
+            chunks = self.iter_collection_chunks(
+                collection_name, batch_size, database_name, query=query, sort=[(field, 1)], columns=columns,
+                raw_batch_decoder=raw_batch_decoder, pushdown=pushdown
+            )
+            for chunk in chunks:
+                chunk.to_csv(csv_file, index=False, header=False)
+                n_rows += len(chunk)
+        return n_rows
+
+    @staticmethod
+    def _write_empty_export(csv_file, collection_name: str) -> None:
+        """
+        Writes the header of an export without documents, using the schema
+        columns, so the file reads back as an empty DataFrame.
+        """
+        logging.warning(f"No documents exported from '{collection_name}'; writing the schema header only.")
+        pd.DataFrame(columns=list(read_column_types())).to_csv(csv_file, index=False)
+
+    def export_collection_to_csv(
+        self,
+        collection_name: str,
+        file_path: str,
+        batch_size: int,
+        database_name: Optional[str] = None,
+        workers: int = 1,
+        partition_field: str = "_id",
+        decoder: str = "auto",
+        pushdown: bool = False,
+        query: Optional[dict] = None,
+        sample_size: Optional[int] = None
+    ) -> int:
+        """
+        Streams a MongoDB collection into a CSV file chunk by chunk, so memory
+        is bounded by `batch_size` (per worker) rather than by the collection size.
+
+        With several workers the collection is split into ranges of
+        `partition_field` (see partition_ranges), which are read concurrently
+        through the shared MongoClient connection pool into part files and then
+        concatenated in range order; rows are thus ordered by the partition field.
+
+        Parameters
+        ----------
+        collection_name : str
+            The name of the MongoDB collection to export.
+        file_path : str
+            Target CSV file; it is replaced only once the export has completed.
+        batch_size : int
+            Documents per cursor batch and per written chunk.
+        database_name : Optional[str]
+            The name of the MongoDB database (defaults to the configured DATABASE_NAME).
+        workers : int
+            Ranges read concurrently; 1 reads the collection with a single cursor.
+        partition_field : str
+            Indexed field present in every document used to split the collection.
+        decoder : str
+            "arrow", "python" or "auto", see get_raw_batch_decoder. The arrow
+            decoder exports the fields of the schema's `columns` section.
+        pushdown : bool
+            Projects, cleans and types the schema fields on the server with an
+            aggregation pipeline (see build_cleaning_pipeline).
+        query : Optional[dict]
+            Exports only the matching documents, e.g. a date range or a region subset.
+        sample_size : Optional[int]
+            Exports a random sample of this many matching documents (requires
+            pushdown and a single worker).
+
+        Returns
+        -------
+        int
+            The number of rows written.
+
+        Raises
+        ------
+        MyException
+            If the database connection, the data fetch or the write fails.
+        """
+        try:
+            os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+            tmp_path = f"{file_path}.tmp"
+            raw_batch_decoder = self.get_raw_batch_decoder(decoder)
+            decoder_name = "arrow" if raw_batch_decoder is not None else "python"
+
+            if workers <= 1:
+                logging.info(f"Streaming MongoDB collection '{collection_name}' to {file_path} "
+                             f"in chunks of {batch_size} documents ({decoder_name} decoder).")
+                n_rows = 0
+                with open(tmp_path, "w", newline="") as csv_file:
+                    chunks = self.iter_collection_chunks(
+                        collection_name, batch_size, database_name, query=query,
+                        raw_batch_decoder=raw_batch_decoder, pushdown=pushdown, sample_size=sample_size
+                    )
+                    for chunk in chunks:
+                        chunk.to_csv(csv_file, index=False, header=n_rows == 0)
+                        n_rows += len(chunk)
+                        logging.info(f"Exported {n_rows} records from '{collection_name}'.")
+                    if n_rows == 0:
+                        self._write_empty_export(csv_file, collection_name)
+                os.replace(tmp_path, file_path)
+                return n_rows
+
+            if sample_size:
+                raise ValueError("Sampling documents is only supported with a single export worker.")
+            collection = self._get_collection(collection_name, database_name)
+            first_document = collection.find_one(query or {}, {"_id": 0})
+            if first_document is None:
+                with open(tmp_path, "w", newline="") as csv_file:
+                    self._write_empty_export(csv_file, collection_name)
+                os.replace(tmp_path, file_path)
+                return 0
+            if pushdown:
+                columns = list(read_column_types())
+            elif raw_batch_decoder is not None:
+                columns = raw_batch_decoder.columns
+            else:
+                columns = list(first_document)
+            ranges = self.partition_ranges(collection_name, workers, partition_field, database_name)
+            if query:
+                ranges = [{"$and": [query, condition]} if condition else query for condition in ranges]
+            logging.info(f"Exporting MongoDB collection '{collection_name}' to {file_path} as {len(ranges)} "
+                         f"'{partition_field}' ranges with {workers} workers ({decoder_name} decoder).")
+
+            with tempfile.TemporaryDirectory(dir=os.path.dirname(file_path) or ".") as parts_dir:
+                part_paths = [os.path.join(parts_dir, f"part-{i:05d}.csv") for i in range(len(ranges))]
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mongo-export") as executor:
+                    futures = [
+                        executor.submit(self._export_range_to_csv, collection_name, condition, partition_field,
+                                        columns, part_path, batch_size, database_name, raw_batch_decoder, pushdown)
+                        for condition, part_path in zip(ranges, part_paths)
+                    ]
+                    counts = [future.result() for future in futures]
+
+                with open(tmp_path, "w", newline="") as csv_file:
+                    pd.DataFrame(columns=columns).to_csv(csv_file, index=False)
+                    for part_path in part_paths:
+                        with open(part_path, newline="") as part_file:
+                            shutil.copyfileobj(part_file, csv_file)
+
+            os.replace(tmp_path, file_path)
+            n_rows = sum(counts)
+            logging.info(f"Exported {n_rows} records from '{collection_name}' (per range: {counts}).")
+            return n_rows
+
+        except Exception as e:
+            raise CustomException(e, sys)
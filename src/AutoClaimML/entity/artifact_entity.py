@@ -41,4 +41,27 @@ class ModelEvaluationArtifact:
 @dataclass
 class ModelPusherArtifact:
     bucket_name:str
-    s3_model_path:str
\ No newline at end of file
+    s3_model_path:str
+
+@dataclass
+class BatchScoringArtifact:
+    output_path: str
+    model_path: str
+    n_rows: int
+    n_partitions: int
+    elapsed_seconds: float
+    rows_per_second: float
+    worker_stats: dict
+    n_rejected: int
+    failed_shards: list
+
+
+@dataclass
+class CollectionScoringArtifact:
+    collection_name: str
+    model_version: str
+    n_scored: int
+    n_modified: int
+    resumed_after_id: object
+    elapsed_seconds: float
+    documents_per_second: float
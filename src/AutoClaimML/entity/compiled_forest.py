@@ -0,0 +1,158 @@
+# compiled_forest.py
+
+import numpy as np
+
+from AutoClaimML.constants import COMPILED_FOREST_MAX_ROWS
+
+
+class CompiledForest:
+    """
+    Array-based inference engine for a fitted sklearn RandomForestClassifier.
+
+    All trees are flattened into shared node arrays (feature, threshold, left,
+    right, value) and evaluated together: each step advances every (row, tree)
+    pair one level down with a few vectorized NumPy gathers, so the per-call
+    cost no longer includes sklearn's input validation and per-tree dispatch.
+
+    Leaves point to themselves, so after `max_depth` steps every pair has
+    reached its leaf. Outputs match `RandomForestClassifier.predict_proba`
+    and `predict`.
+
+    Each step allocates (rows, trees) temporaries, so larger inputs are scored
+    in blocks of COMPILED_FOREST_MAX_ROWS rows. Past that size sklearn's forest
+    is faster, and MyModel scores such batches with it when it has one.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        max_depth: int,
+        classes: np.ndarray,
+        n_features: int
+    ) -> None:
+        """
+        :param feature: Split feature per node (0 for leaves).
+        :param threshold: Split threshold per node; rows with x <= threshold go left.
+        :param left: Left child per node (the node itself for leaves).
+        :param right: Right child per node (the node itself for leaves).
+        :param value: Normalized class distribution per node, shape (n_nodes, n_classes).
+        :param roots: Root node of each tree.
+        :param max_depth: Depth of the deepest tree.
+        :param classes: Class labels, as in `RandomForestClassifier.classes_`.
+        :param n_features: Number of input features.
+        """
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.classes_ = classes
+        self.n_features_in_ = int(n_features)
+
+    @property
+    def n_estimators(self) -> int:
+        return len(self.roots)
+
+    @classmethod
+    def from_sklearn(cls, forest) -> "CompiledForest":
+        """
+        Flattens the trees of a fitted RandomForestClassifier.
+
+        :param forest: Fitted single-output RandomForestClassifier.
+        :return: Equivalent CompiledForest.
+        """
+        if getattr(forest, "n_outputs_", 1) != 1:
+            raise ValueError("CompiledForest only supports single-output forests.")
+
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        max_depth = 0
+        offset = 0
+
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            node_ids = np.arange(n_nodes, dtype=np.intp)
+            is_leaf = tree.children_left == -1
+
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.intp))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold).astype(np.float64))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left).astype(np.intp) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right).astype(np.intp) + offset)
+
+            # Same normalization as DecisionTreeClassifier.predict_proba
+            value = tree.value[:, 0, :].astype(np.float64)
+            normalizer = value.sum(axis=1, keepdims=True)
+            normalizer[normalizer == 0.0] = 1.0
+            values.append(value / normalizer)
+
+            roots.append(offset)
+            max_depth = max(max_depth, tree.max_depth)
+            offset += n_nodes
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max_depth,
+            classes=np.asarray(forest.classes_),
+            n_features=forest.n_features_in_,
+        )
+
+    def _validate(self, X) -> np.ndarray:
+        # sklearn trees compare float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"X has shape {X.shape}, but CompiledForest expects {self.n_features_in_} features."
+            )
+        if np.isnan(X).any():
+            raise ValueError("Input X contains NaN.")
+        return X
+
+    def apply(self, X) -> np.ndarray:
+        """
+        Returns the leaf reached in every tree, shape (n_samples, n_estimators).
+        """
+        X = self._validate(X)
+        rows = np.arange(X.shape[0])[:, np.newaxis]
+        nodes = np.tile(self.roots, (X.shape[0], 1))
+
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        return nodes
+
+    def predict_proba(self, X) -> np.ndarray:
+        """
+        Returns class probabilities averaged over all trees, shape (n_samples, n_classes).
+        """
+        X = self._validate(X)
+        if len(X) <= COMPILED_FOREST_MAX_ROWS:
+            return self.value[self.apply(X)].sum(axis=1) / self.n_estimators
+        return np.concatenate([
+            self.value[self.apply(X[start:start + COMPILED_FOREST_MAX_ROWS])].sum(axis=1) / self.n_estimators
+            for start in range(0, len(X), COMPILED_FOREST_MAX_ROWS)
+        ])
+
+    def predict(self, X) -> np.ndarray:
+        """
+        Returns the most probable class for each row.
+        """
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+    def __repr__(self) -> str:
+        return (
+            f"CompiledForest(n_estimators={self.n_estimators}, "
+            f"n_nodes={len(self.feature)}, max_depth={self.max_depth})"
+        )
@@ -3,6 +3,7 @@ import os
 import yaml
 from AutoClaimML.constants import *
 from dataclasses import dataclass 
+from typing import Optional
 from datetime import datetime 
 
 
@@ -16,10 +17,22 @@ class TrainingPipelineConfig:
 class DataIngestionConfig:
     data_ingestion_dir: str
     feature_store_file_path: str
+    feature_store_partitions_dir: str
     training_file_path: str
     testing_file_path: str
     train_test_split_ratio: float
     collection_name: str
+    streaming_export: bool = DATA_INGESTION_STREAMING_EXPORT
+    export_batch_size: int = DATA_INGESTION_EXPORT_BATCH_SIZE
+    export_workers: int = DATA_INGESTION_EXPORT_WORKERS
+    export_partition_field: str = DATA_INGESTION_EXPORT_PARTITION_FIELD
+    export_decoder: str = DATA_INGESTION_EXPORT_DECODER
+    incremental: bool = DATA_INGESTION_INCREMENTAL
+    watermark_field: str = DATA_INGESTION_WATERMARK_FIELD
+    feature_store_partitions: int = DATA_INGESTION_FEATURE_STORE_PARTITIONS
+    pushdown: bool = DATA_INGESTION_PUSHDOWN
+    export_filter: Optional[dict] = None
+    sample_size: Optional[int] = DATA_INGESTION_SAMPLE_SIZE
 
 @dataclass
 class DataValidationConfig:
@@ -51,9 +64,72 @@ class ModelEvaluationConfig:
 class ModelPusherConfig:
     bucket_name: str = MODEL_BUCKET_NAME
     s3_model_key_path: str = MODEL_FILE_NAME
+    s3_mmap_model_key_path: str = MMAP_MODEL_FILE_NAME
     
     
 @dataclass
 class VehiclePredictorConfig:
     model_file_path: str = MODEL_FILE_NAME
-    model_bucket_name: str = MODEL_BUCKET_NAME
\ No newline at end of file
+    model_bucket_name: str = MODEL_BUCKET_NAME
+    mmap_model_enabled: bool = MMAP_MODEL_ENABLED
+    mmap_model_file_path: str = MMAP_MODEL_FILE_NAME
+    model_cache_dir: str = MODEL_CACHE_DIR
+
+
+@dataclass
+class ServingConfig:
+    model_watcher_enabled: bool = MODEL_WATCHER_ENABLED
+    model_watcher_poll_interval_seconds: float = MODEL_WATCHER_POLL_INTERVAL_SECONDS
+    batch_prediction_max_records: int = BATCH_PREDICTION_MAX_RECORDS
+    file_prediction_chunk_rows: int = FILE_PREDICTION_CHUNK_ROWS
+    prediction_batching_enabled: bool = PREDICTION_BATCHING_ENABLED
+    prediction_batch_max_size: int = PREDICTION_BATCH_MAX_SIZE
+    prediction_batch_max_wait_seconds: float = PREDICTION_BATCH_MAX_WAIT_SECONDS
+    inference_executor_workers: int = INFERENCE_EXECUTOR_WORKERS
+    inference_executor_max_queue: int = INFERENCE_EXECUTOR_MAX_QUEUE
+    admission_control_enabled: bool = ADMISSION_CONTROL_ENABLED
+    admission_max_in_flight: int = ADMISSION_MAX_IN_FLIGHT
+    admission_max_queue: int = ADMISSION_MAX_QUEUE
+    admission_max_queue_wait_seconds: float = ADMISSION_MAX_QUEUE_WAIT_SECONDS
+    admission_retry_after_seconds: int = ADMISSION_RETRY_AFTER_SECONDS
+    prediction_cache_enabled: bool = PREDICTION_CACHE_ENABLED
+    server_timing_enabled: bool = SERVER_TIMING_ENABLED
+    decision_threshold: Optional[float] = PREDICTION_DECISION_THRESHOLD
+    prediction_cache_max_entries: int = PREDICTION_CACHE_MAX_ENTRIES
+    prediction_cache_ttl_seconds: float = PREDICTION_CACHE_TTL_SECONDS
+    training_job_history_size: int = TRAINING_JOB_HISTORY_SIZE
+    training_job_poll_interval_seconds: float = TRAINING_JOB_POLL_INTERVAL_SECONDS
+    training_job_cancel_grace_seconds: float = TRAINING_JOB_CANCEL_GRACE_SECONDS
+    training_job_state_dir: str = TRAINING_JOB_STATE_DIR
+
+
+@dataclass
+class BatchScoringConfig:
+    input_path: str
+    output_path: str
+    model_path: Optional[str] = None
+    bucket_name: str = MODEL_BUCKET_NAME
+    s3_model_key_path: str = MODEL_FILE_NAME
+    s3_mmap_model_key_path: str = MMAP_MODEL_FILE_NAME
+    model_cache_dir: str = MODEL_CACHE_DIR
+    n_workers: int = BATCH_SCORING_WORKERS
+    chunk_rows: int = BATCH_SCORING_CHUNK_ROWS
+    shard_bytes: int = BATCH_SCORING_SHARD_BYTES
+    output_format: str = BATCH_SCORING_OUTPUT_FORMAT
+
+
+@dataclass
+class CollectionScoringConfig:
+    collection_name: str
+    checkpoint_file_path: str
+    database_name: str = DATABASE_NAME
+    model_path: Optional[str] = None
+    bucket_name: str = MODEL_BUCKET_NAME
+    s3_model_key_path: str = MODEL_FILE_NAME
+    s3_mmap_model_key_path: str = MMAP_MODEL_FILE_NAME
+    model_cache_dir: str = MODEL_CACHE_DIR
+    batch_size: int = COLLECTION_SCORING_BATCH_SIZE
+    resume: bool = True
+    prediction_field: str = COLLECTION_SCORING_PREDICTION_FIELD
+    probability_field: str = COLLECTION_SCORING_PROBABILITY_FIELD
+    model_version_field: str = COLLECTION_SCORING_MODEL_VERSION_FIELD
@@ -1,12 +1,19 @@
 # estimator.py
 
 import sys
+from typing import Mapping, Optional, Sequence, Tuple
+import numpy as np
 import pandas as pd
 from pandas import DataFrame
+from sklearn.ensemble import RandomForestClassifier
 from sklearn.pipeline import Pipeline
 
+from AutoClaimML.constants import COMPILED_FOREST_MAX_ROWS, ROW_ENCODER_MAX_ROWS
+from AutoClaimML.entity.compiled_forest import CompiledForest
+from AutoClaimML.entity.row_encoder import RowEncoder
 from AutoClaimML.exception import CustomException
 from AutoClaimML.logger import logging
+from AutoClaimML.utils.stage_timing import timed_stage
 
 
 # -------------------------
@@ -45,6 +52,80 @@ class MyModel:
         """
         self.preprocessing_object = preprocessing_object
         self.trained_model_object = trained_model_object
+
+    def __getstate__(self) -> dict:
+        # Compiled forms are derived from the fitted objects; rebuild them after loading
+        state = self.__dict__.copy()
+        state.pop("_compiled_forest", None)
+        state.pop("_row_encoder", None)
+        return state
+
+    def row_encoder(self):
+        """
+        Returns the RowEncoder used for small inputs, compiling it on first use,
+        or None when the preprocessing pipeline cannot be reproduced exactly.
+        """
+        encoder = getattr(self, "_row_encoder", None)
+        if encoder is None:
+            encoder = RowEncoder.compile(self.preprocessing_object) or False
+            self._row_encoder = encoder
+        return encoder or None
+
+    def _transform(self, dataframe: DataFrame) -> np.ndarray:
+        """
+        Applies the preprocessing pipeline, through the RowEncoder for small inputs.
+        """
+        encoder = self.row_encoder()
+        if encoder is not None and len(dataframe) <= ROW_ENCODER_MAX_ROWS:
+            with timed_stage("encode"):
+                return encoder.encode_frame(dataframe)
+        with timed_stage("transform"):
+            return self.preprocessing_object.transform(dataframe)
+
+    def compiled_forest(self):
+        """
+        Returns the CompiledForest used for small batches, compiling it on first use,
+        or None when the trained model is not a RandomForestClassifier.
+        """
+        # getattr: models pickled before the engine existed have no such attribute
+        compiled = getattr(self, "_compiled_forest", None)
+        if compiled is None:
+            if isinstance(self.trained_model_object, CompiledForest):
+                compiled = self.trained_model_object
+            elif isinstance(self.trained_model_object, RandomForestClassifier):
+                logging.info("Compiling the random forest into flat node arrays.")
+                compiled = CompiledForest.from_sklearn(self.trained_model_object)
+            else:
+                compiled = False
+            self._compiled_forest = compiled
+        return compiled or None
+
+    def to_compiled(self) -> "MyModel":
+        """
+        Returns a copy of this model that scores with the CompiledForest only.
+        Its flat arrays serialize out-of-band, which makes it the form of the
+        model written by save_mmap_object.
+        """
+        compiled = self.compiled_forest()
+        if compiled is None:
+            raise TypeError(
+                f"Cannot compile a {type(self.trained_model_object).__name__}; "
+                "only RandomForestClassifier is supported."
+            )
+        return MyModel(preprocessing_object=self.preprocessing_object, trained_model_object=compiled)
+
+    def _scoring_model(self, n_rows: int):
+        """
+        Returns the model used to score a batch of `n_rows` rows: the compiled
+        forest for small batches, the trained model for larger ones. Compiled
+        (memory-mapped) models score every batch with the CompiledForest, in
+        row blocks, so their arrays stay shared between workers.
+        """
+        compiled = self.compiled_forest()
+        if compiled is not None and n_rows <= COMPILED_FOREST_MAX_ROWS:
+            return compiled
+        return self.trained_model_object
+
     def predict(self, dataframe: DataFrame) -> pd.Series:
         """
         Applies preprocessing to input DataFrame and returns model predictions.
@@ -63,11 +144,12 @@ class MyModel:
 
             # Transform input using the saved preprocessing pipeline
             logging.info("Applying preprocessing transformations.")
-            transformed_features = self.preprocessing_object.transform(dataframe)
+            transformed_features = self._transform(dataframe)
               
             # Predict using the trained model
             logging.info("Making predictions with the trained model.")
-            predictions = self.trained_model_object.predict(transformed_features)
+            with timed_stage("predict"):
+                predictions = self._scoring_model(len(dataframe)).predict(transformed_features)
 
             # Create prediction series with id if available
             if id_column is not None:
@@ -81,6 +163,154 @@ class MyModel:
             logging.error("Error occurred in predict method", exc_info=True)
             raise CustomException(e, sys) from e
 
+    def _positive_class_index(self) -> int:
+        """
+        Returns the column of predict_proba holding the positive class (Response = 1).
+        """
+        classes = list(getattr(self.trained_model_object, "classes_", []))
+        return classes.index(1) if 1 in classes else len(classes) - 1
+
+    def _threshold_labels(self, positive_proba: np.ndarray, threshold: float) -> np.ndarray:
+        """
+        Labels rows positive wherever the positive-class probability reaches `threshold`.
+        """
+        classes = self.trained_model_object.classes_
+        if len(classes) != 2:
+            raise ValueError(f"A decision threshold needs a binary model; this one has {len(classes)} classes.")
+        positive_index = self._positive_class_index()
+        return np.where(positive_proba >= threshold, classes[positive_index], classes[1 - positive_index])
+
+    def _decide(self, probabilities: np.ndarray, threshold: Optional[float] = None) -> np.ndarray:
+        """
+        Returns the labels for a predict_proba matrix: the most probable class
+        (same rule as the sklearn forest's predict), or the threshold rule.
+        """
+        if threshold is None:
+            return self.trained_model_object.classes_.take(np.argmax(probabilities, axis=1), axis=0)
+        return self._threshold_labels(probabilities[:, self._positive_class_index()], threshold)
+
+    def _score_probabilities(self, features: np.ndarray) -> np.ndarray:
+        """
+        Scores encoded features in one forest pass and returns a (n_rows, 2)
+        float matrix of [most probable label, positive-class probability].
+        """
+        model = self._scoring_model(len(features))
+        with timed_stage("predict"):
+            probabilities = model.predict_proba(features)
+        return np.column_stack([self._decide(probabilities), probabilities[:, self._positive_class_index()]])
+
+    def predict_records_with_proba(
+        self,
+        records: Sequence[Mapping],
+        prediction_cache=None,
+        model_version: Optional[str] = None,
+        threshold: Optional[float] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Predicts a few rows given as {column: scalar} records, without building
+        a DataFrame when the RowEncoder is available, and returns the labels and
+        positive-class probabilities from a single forest pass.
+
+        :param records: Raw input features, one mapping per row
+        :param prediction_cache: Optional PredictionCache consulted before scoring
+        :param model_version: Version of this model, part of the cache key
+        :param threshold: Positive-class probability from which a row is labelled
+                          positive; None for the most probable class
+        :return: Tuple of (predicted labels, positive-class probabilities) as numpy arrays, in record order
+        """
+        try:
+            encoder = self.row_encoder()
+            if encoder is not None and len(records) <= ROW_ENCODER_MAX_ROWS:
+                with timed_stage("encode"):
+                    transformed_features = encoder.encode_records(records)
+            else:
+                with timed_stage("encode"):
+                    dataframe = DataFrame.from_records(records)
+                with timed_stage("transform"):
+                    transformed_features = self.preprocessing_object.transform(dataframe)
+
+            # The cache holds [label, probability] rows, so the threshold is applied after it
+            if prediction_cache is not None:
+                scored = prediction_cache.predict(
+                    model_version, np.asarray(transformed_features), self._score_probabilities
+                )
+            else:
+                scored = self._score_probabilities(transformed_features)
+
+            # Stacking with the probabilities made the labels float; restore the class dtype
+            labels = scored[:, 0].astype(self.trained_model_object.classes_.dtype)
+            positive_proba = scored[:, 1]
+            if threshold is not None:
+                labels = self._threshold_labels(positive_proba, threshold)
+            return labels, positive_proba
+
+        except Exception as e:
+            logging.error("Error occurred in predict_records_with_proba method", exc_info=True)
+            raise CustomException(e, sys) from e
+
+    def predict_records(
+        self,
+        records: Sequence[Mapping],
+        prediction_cache=None,
+        model_version: Optional[str] = None,
+        threshold: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Predicts a few rows given as {column: scalar} records (see predict_records_with_proba).
+
+        :return: Predicted values as a numpy array, in record order
+        """
+        labels, _ = self.predict_records_with_proba(
+            records, prediction_cache=prediction_cache, model_version=model_version, threshold=threshold
+        )
+        return labels
+
+    def predict_with_proba(
+        self,
+        dataframe: DataFrame,
+        threshold: Optional[float] = None
+    ) -> Tuple[pd.Series, pd.Series]:
+        """
+        Applies preprocessing once and returns both the predicted labels and the
+        positive-class probabilities from a single predict_proba pass.
+
+        :param dataframe: Raw input features
+        :param threshold: Positive-class probability from which a row is labelled
+                          positive; None for the most probable class
+        :return: Tuple of (predicted labels, positive-class probabilities) as pandas Series
+        """
+        try:
+            logging.info("Starting prediction with probabilities.")
+
+            id_column = None
+            if 'id' in dataframe.columns:
+                id_column = dataframe['id'].copy()
+                dataframe = dataframe.drop('id', axis=1)
+
+            transformed_features = self._transform(dataframe)
+            model = self._scoring_model(len(dataframe))
+            with timed_stage("predict"):
+                probabilities = model.predict_proba(transformed_features)
+
+            labels = self._decide(probabilities, threshold)
+            positive_proba = probabilities[:, self._positive_class_index()]
+
+            return pd.Series(labels, index=id_column), pd.Series(positive_proba, index=id_column)
+
+        except Exception as e:
+            logging.error("Error occurred in predict_with_proba method", exc_info=True)
+            raise CustomException(e, sys) from e
+
+    def predict_proba(self, dataframe: DataFrame) -> pd.Series:
+        """
+        Returns the positive-class probability of each row (indexed by `id` when present).
+
+        :param dataframe: Raw input features
+        :return: Positive-class probabilities as a pandas Series
+        """
+        _, probabilities = self.predict_with_proba(dataframe)
+        return probabilities
+
     def __repr__(self) -> str:
         return f"MyModel(trained_model_object={type(self.trained_model_object).__name__})"
 
@@ -0,0 +1,198 @@
+# row_encoder.py
+
+from typing import List, Mapping, Optional, Sequence
+
+import numpy as np
+from pandas import DataFrame
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import FunctionTransformer, MinMaxScaler, StandardScaler
+
+from AutoClaimML.constants import SCHEMA_FILE_PATH
+from AutoClaimML.logger import logging
+from AutoClaimML.utils.main_utils import read_yaml_file
+
+
+class RowEncoder:
+    """
+    Encodes model-input rows into the feature matrix produced by the fitted
+    preprocessing pipeline, without going through pandas or the ColumnTransformer.
+
+    Compiled from the `prediction_columns` of config/schema.yaml and the fitted
+    scalers: every output column is a copy of one input column followed by the
+    same float64 operations sklearn applies ((x - mean) / scale for
+    StandardScaler, x * scale + min for MinMaxScaler), so outputs are identical.
+    """
+
+    def __init__(
+        self,
+        output_columns: List[str],
+        subtract: np.ndarray,
+        divide: np.ndarray,
+        multiply: np.ndarray,
+        add: np.ndarray,
+        clip_min: Optional[np.ndarray] = None,
+        clip_max: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        :param output_columns: Input column feeding each output column, in output order.
+        :param subtract: Per output column, StandardScaler mean (0 elsewhere).
+        :param divide: Per output column, StandardScaler scale (1 elsewhere).
+        :param multiply: Per output column, MinMaxScaler scale (1 elsewhere).
+        :param add: Per output column, MinMaxScaler min (0 elsewhere).
+        :param clip_min: Per output column lower bound, for MinMaxScaler(clip=True).
+        :param clip_max: Per output column upper bound, for MinMaxScaler(clip=True).
+        """
+        self.output_columns = list(output_columns)
+        self.subtract = subtract
+        self.divide = divide
+        self.multiply = multiply
+        self.add = add
+        self.clip_min = clip_min
+        self.clip_max = clip_max
+
+    @classmethod
+    def compile(cls, preprocessing_object, schema_file_path: str = SCHEMA_FILE_PATH) -> Optional["RowEncoder"]:
+        """
+        Builds an encoder for a fitted preprocessing pipeline and checks it
+        against `preprocessing_object.transform`.
+
+        :param preprocessing_object: Fitted ColumnTransformer, or a Pipeline wrapping one.
+        :param schema_file_path: Schema listing the model input columns under `prediction_columns`.
+        :return: The encoder, or None if the pipeline holds steps it cannot reproduce.
+        """
+        try:
+            column_transformer = cls._unwrap(preprocessing_object)
+            if column_transformer is None:
+                logging.info("RowEncoder: preprocessing is not a plain ColumnTransformer; not compiling.")
+                return None
+
+            schema = read_yaml_file(schema_file_path)
+            input_columns = [name for column in schema["prediction_columns"] for name in column]
+            fitted_columns = list(getattr(column_transformer, "feature_names_in_", []))
+            if sorted(input_columns) != sorted(fitted_columns):
+                logging.info("RowEncoder: schema prediction_columns differ from the fitted columns; not compiling.")
+                return None
+
+            encoder = cls._from_column_transformer(column_transformer, fitted_columns)
+            if encoder is None:
+                return None
+
+            if not encoder.matches(preprocessing_object, input_columns):
+                logging.warning("RowEncoder output differs from the preprocessing pipeline; not using it.")
+                return None
+            return encoder
+
+        except Exception as e:
+            logging.warning(f"RowEncoder could not be compiled: {e}")
+            return None
+
+    @staticmethod
+    def _unwrap(preprocessing_object) -> Optional[ColumnTransformer]:
+        if isinstance(preprocessing_object, Pipeline):
+            if len(preprocessing_object.steps) != 1:
+                return None
+            preprocessing_object = preprocessing_object.steps[0][1]
+        return preprocessing_object if isinstance(preprocessing_object, ColumnTransformer) else None
+
+    @classmethod
+    def _from_column_transformer(
+        cls,
+        column_transformer: ColumnTransformer,
+        fitted_columns: List[str]
+    ) -> Optional["RowEncoder"]:
+        output_columns = []
+        subtract, divide, multiply, add = [], [], [], []
+        clip_min, clip_max = [], []
+
+        for name, transformer, columns in column_transformer.transformers_:
+            if transformer == "drop":
+                continue
+            # The remainder is listed by position in the fitted input
+            columns = [fitted_columns[c] if isinstance(c, (int, np.integer)) else c for c in columns]
+            n = len(columns)
+            low, high = np.full(n, -np.inf), np.full(n, np.inf)
+
+            # Fitted "passthrough" entries are identity FunctionTransformers in recent sklearn
+            if transformer == "passthrough" or (type(transformer) is FunctionTransformer and transformer.func is None):
+                sub, div, mul, off = np.zeros(n), np.ones(n), np.ones(n), np.zeros(n)
+            elif type(transformer) is StandardScaler:
+                sub = transformer.mean_ if transformer.with_mean else np.zeros(n)
+                div = transformer.scale_ if transformer.with_std else np.ones(n)
+                mul, off = np.ones(n), np.zeros(n)
+            elif type(transformer) is MinMaxScaler:
+                sub, div = np.zeros(n), np.ones(n)
+                mul, off = transformer.scale_, transformer.min_
+                if transformer.clip:
+                    low, high = np.full(n, transformer.feature_range[0]), np.full(n, transformer.feature_range[1])
+            else:
+                logging.info(f"RowEncoder: unsupported transformer {name!r} ({type(transformer).__name__}).")
+                return None
+
+            output_columns.extend(columns)
+            subtract.append(sub)
+            divide.append(div)
+            multiply.append(mul)
+            add.append(off)
+            clip_min.append(low)
+            clip_max.append(high)
+
+        clip_min, clip_max = np.concatenate(clip_min), np.concatenate(clip_max)
+        clips = np.isfinite(clip_min).any() or np.isfinite(clip_max).any()
+
+        return cls(
+            output_columns=output_columns,
+            subtract=np.concatenate(subtract).astype(np.float64),
+            divide=np.concatenate(divide).astype(np.float64),
+            multiply=np.concatenate(multiply).astype(np.float64),
+            add=np.concatenate(add).astype(np.float64),
+            clip_min=clip_min if clips else None,
+            clip_max=clip_max if clips else None,
+        )
+
+    def matches(self, preprocessing_object, input_columns: List[str]) -> bool:
+        """
+        Returns True if the encoder reproduces `preprocessing_object.transform`
+        exactly on a set of probe rows.
+        """
+        probes = [
+            {column: value for column in input_columns}
+            for value in (0, 1, -1)
+        ] + [
+            {column: 17.25 + 31.5 * i + 1000.0 * row for i, column in enumerate(input_columns)}
+            for row in range(4)
+        ]
+        expected = np.asarray(preprocessing_object.transform(DataFrame.from_records(probes)), dtype=np.float64)
+        return (
+            np.array_equal(self.encode_records(probes), expected)
+            and np.array_equal(self.encode_frame(DataFrame.from_records(probes)), expected)
+        )
+
+    def _scale(self, X: np.ndarray) -> np.ndarray:
+        # Same operations and order as StandardScaler/MinMaxScaler.transform
+        X -= self.subtract
+        X /= self.divide
+        X *= self.multiply
+        X += self.add
+        if self.clip_min is not None:
+            np.clip(X, self.clip_min, self.clip_max, out=X)
+        return X
+
+    def encode_records(self, records: Sequence[Mapping]) -> np.ndarray:
+        """
+        Encodes a sequence of {column: scalar} records into a float64 matrix.
+        """
+        X = np.empty((len(records), len(self.output_columns)), dtype=np.float64)
+        for i, record in enumerate(records):
+            X[i] = [float(record[column]) for column in self.output_columns]
+        return self._scale(X)
+
+    def encode_frame(self, dataframe: DataFrame) -> np.ndarray:
+        """
+        Encodes the model-input columns of a DataFrame into a float64 matrix.
+        """
+        X = dataframe[self.output_columns].to_numpy(dtype=np.float64, copy=True)
+        return self._scale(X)
+
+    def __repr__(self) -> str:
+        return f"RowEncoder(output_columns={self.output_columns})"
@@ -1,6 +1,9 @@
 # s3_estimator.py
 
+import os
 import sys
+import tempfile
+from typing import Mapping, Optional, Sequence
 from pandas import DataFrame
 import boto3
 import pandas as pd
@@ -9,6 +12,7 @@ from AutoClaimML.entity.estimator import MyModel
 from AutoClaimML.cloud_storage.aws_storage import SimpleStorageService
 from AutoClaimML.exception import CustomException
 from AutoClaimML.logger import logging
+from AutoClaimML.utils.main_utils import load_mmap_object
 
 class Proj1Estimator:
     """
@@ -46,6 +50,18 @@ class Proj1Estimator:
             logging.error(f"Error checking model presence: {e}")
             return False
         
+    def get_model_version(self) -> Optional[str]:
+        """
+        Returns the version (S3 ETag) of the model currently stored in S3.
+
+        Returns:
+            Optional[str]: ETag of the model object, or None if it is missing.
+        """
+        try:
+            return self.s3.get_object_etag(bucket_name=self.bucket_name, s3_key=self.model_path)
+        except Exception as e:
+            raise CustomException(e, sys)
+
     def load_model(self) -> MyModel:
         """
         Loads the model from S3.
@@ -62,6 +78,64 @@ class Proj1Estimator:
         except Exception as e:
             raise CustomException(e, sys)
         
+    def fetch_model(self, cache_dir: str, model_path: str = None) -> str:
+        """
+        Downloads a model file once per host into `cache_dir`, named after its
+        S3 ETag, and returns the local path. Later calls reuse the cached file.
+
+        Args:
+            cache_dir (str): Local directory holding downloaded model files.
+            model_path (str): Optional alternate model path.
+
+        Returns:
+            str: Local path of the model file.
+        """
+        try:
+            model_path = model_path or self.model_path
+            etag = self.s3.get_object_etag(bucket_name=self.bucket_name, s3_key=model_path)
+            if etag is None:
+                raise FileNotFoundError(f"s3://{self.bucket_name}/{model_path} does not exist.")
+
+            os.makedirs(cache_dir, exist_ok=True)
+            local_path = os.path.join(cache_dir, f"{etag}{os.path.splitext(model_path)[1]}")
+            if not os.path.exists(local_path):
+                logging.info(f"Downloading {model_path} (ETag {etag}) to {local_path}.")
+                # Download under a private name and rename atomically, so processes
+                # starting together never read a partially written file
+                fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".part")
+                os.close(fd)
+                try:
+                    self.s3.download_file(bucket_name=self.bucket_name, s3_key=model_path, to_filename=tmp_path)
+                    os.replace(tmp_path, local_path)
+                finally:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+            return local_path
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def load_mmap_model(self, mmap_model_path: str, cache_dir: str) -> MyModel:
+        """
+        Loads the memory-mapped form of the model (see save_mmap_object).
+
+        The file is downloaded once per host into `cache_dir` (see fetch_model)
+        and then mapped read-only, so every worker process on the host shares
+        one page-cache copy of the model arrays.
+
+        Args:
+            mmap_model_path (str): Key path to the memory-mapped model in S3.
+            cache_dir (str): Local directory holding downloaded model files.
+
+        Returns:
+            MyModel: The loaded model object.
+        """
+        try:
+            local_path = self.fetch_model(cache_dir=cache_dir, model_path=mmap_model_path)
+            self.loaded_model = load_mmap_object(local_path)
+            return self.loaded_model
+        except Exception as e:
+            raise CustomException(e, sys)
+
     def save_model(self, from_file: str, remove: bool = False) -> None:
         try:
             sts = boto3.client('sts')
@@ -110,4 +184,97 @@ class Proj1Estimator:
             return predictions
 
         except Exception as e:
-            raise CustomException(e, sys)
\ No newline at end of file
+            raise CustomException(e, sys)
+
+    def predict_with_proba(self, dataframe: DataFrame, threshold: Optional[float] = None):
+        """
+        Makes predictions and positive-class probabilities in one forest pass.
+
+        Args:
+            dataframe (DataFrame): Input data.
+            threshold (Optional[float]): Probability from which a row is labelled positive;
+                None for the most probable class.
+
+        Returns:
+            Tuple[pd.Series, pd.Series]: Labels and probabilities, indexed by id when present.
+        """
+        try:
+            if self.loaded_model is None:
+                self.load_model()
+            return self.loaded_model.predict_with_proba(dataframe, threshold=threshold)
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def predict_proba(self, dataframe: DataFrame):
+        """
+        Returns the positive-class probability of each row.
+
+        Args:
+            dataframe (DataFrame): Input data.
+
+        Returns:
+            pd.Series: Probabilities, indexed by id when present.
+        """
+        try:
+            if self.loaded_model is None:
+                self.load_model()
+            return self.loaded_model.predict_proba(dataframe)
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def predict_records(
+        self,
+        records: Sequence[Mapping],
+        prediction_cache=None,
+        model_version: Optional[str] = None,
+        threshold: Optional[float] = None
+    ):
+        """
+        Makes predictions for a few rows given as {column: scalar} records.
+
+        Args:
+            records (Sequence[Mapping]): Input rows.
+            prediction_cache (PredictionCache): Optional cache consulted before scoring.
+            model_version (Optional[str]): Version of the loaded model, part of the cache key.
+            threshold (Optional[float]): Probability from which a row is labelled positive.
+
+        Returns:
+            np.ndarray: Model predictions, in record order.
+        """
+        try:
+            if self.loaded_model is None:
+                self.load_model()
+            return self.loaded_model.predict_records(
+                records, prediction_cache=prediction_cache, model_version=model_version, threshold=threshold
+            )
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def predict_records_with_proba(
+        self,
+        records: Sequence[Mapping],
+        prediction_cache=None,
+        model_version: Optional[str] = None,
+        threshold: Optional[float] = None
+    ):
+        """
+        Makes predictions and positive-class probabilities for a few rows given
+        as {column: scalar} records, in one forest pass.
+
+        Args:
+            records (Sequence[Mapping]): Input rows.
+            prediction_cache (PredictionCache): Optional cache consulted before scoring.
+            model_version (Optional[str]): Version of the loaded model, part of the cache key.
+            threshold (Optional[float]): Probability from which a row is labelled positive.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Labels and probabilities, in record order.
+        """
+        try:
+            if self.loaded_model is None:
+                self.load_model()
+            return self.loaded_model.predict_records_with_proba(
+                records, prediction_cache=prediction_cache, model_version=model_version, threshold=threshold
+            )
+        except Exception as e:
+            raise CustomException(e, sys)
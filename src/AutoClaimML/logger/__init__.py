@@ -11,9 +11,8 @@ LOG_FILE_TIMESTAMP = datetime.now().strftime('%m_%d_%Y_%H_%M_%S')
 MAX_LOG_SIZE = 5 * 1024 * 1024  # 5 MB
 BACKUP_COUNT = 3  # Number of rotated log files to keep
 
-# Ensure log directory exists
+# The directory is created with the first log record (see DeferredRotatingFileHandler)
 log_dir_path = os.path.join(from_root(), LOG_DIR)
-os.makedirs(log_dir_path, exist_ok=True)
 
 
 # helper function to get log file path
@@ -25,6 +24,20 @@ def get_log_file_path(filename_prefix: str = "app", use_timestamp: bool = True)
     return os.path.join(log_dir_path, filename)
 
 
+class DeferredRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that creates its directory and file when the first
+    record is written, so importing the package touches no files.
+    """
+
+    def __init__(self, filename: str, **kwargs) -> None:
+        super().__init__(filename, delay=True, **kwargs)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
 def configure_logger(
     logger_name: str = "",
     level: int = logging.DEBUG,
@@ -54,7 +67,7 @@ def configure_logger(
     # Setup file handler
     if log_filename is None:
         log_filename = get_log_file_path()
-    file_handler = RotatingFileHandler(log_filename, maxBytes=MAX_LOG_SIZE, backupCount=BACKUP_COUNT)
+    file_handler = DeferredRotatingFileHandler(log_filename, maxBytes=MAX_LOG_SIZE, backupCount=BACKUP_COUNT)
     file_handler.setFormatter(formatter)
     file_handler.setLevel(logging.DEBUG)
 
@@ -71,4 +84,3 @@ def configure_logger(
 
 
 logger = configure_logger()
-logger.info("Logger is configured and ready.")
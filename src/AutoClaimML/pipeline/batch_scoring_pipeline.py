@@ -0,0 +1,368 @@
+# batch_scoring_pipeline.py
+
+import glob
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing import get_context
+from typing import Iterator, List, Optional
+
+import pandas as pd
+from pandas import DataFrame
+
+from AutoClaimML.entity.artifact_entity import BatchScoringArtifact
+from AutoClaimML.entity.config_entity import BatchScoringConfig
+from AutoClaimML.entity.s3_estimator import Proj1Estimator
+from AutoClaimML.exception import CustomException
+from AutoClaimML.logger import logging
+from AutoClaimML.serving.batch_prediction import BatchRecordValidator
+from AutoClaimML.serving.file_scoring import FILE_FORMATS, FileScorer
+from AutoClaimML.utils.main_utils import load_mmap_object, load_object
+
+
+OUTPUT_FORMATS = ("csv", "parquet")
+
+
+@dataclass(frozen=True)
+class ScoringShard:
+    """
+    One unit of work: a byte range of a CSV file or a row group of a Parquet file.
+    """
+    index: int
+    file_path: str
+    file_format: str
+    start: int
+    end: int
+
+
+def _parquet_module():
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet input or output requires the optional 'pyarrow' package.") from e
+    return pq
+
+
+def list_input_files(input_path: str) -> List[str]:
+    """
+    Returns the CSV/Parquet files to score: `input_path` itself, or every
+    supported file directly inside it, sorted by name.
+    """
+    if os.path.isdir(input_path):
+        files = sorted(
+            path for path in glob.glob(os.path.join(input_path, "*"))
+            if os.path.splitext(path)[1].lower() in FILE_FORMATS and os.path.isfile(path)
+        )
+    elif os.path.isfile(input_path):
+        files = [input_path]
+    else:
+        raise FileNotFoundError(f"Input path {input_path} does not exist.")
+
+    for path in files:
+        if os.path.splitext(path)[1].lower() not in FILE_FORMATS:
+            raise ValueError(f"Unsupported input file {path}; expected .csv or .parquet.")
+    if not files:
+        raise FileNotFoundError(f"No .csv or .parquet files found in {input_path}.")
+    return files
+
+
+def plan_shards(files: List[str], shard_bytes: int) -> List[ScoringShard]:
+    """
+    Splits the input files into shards of about `shard_bytes` bytes (CSV) or
+    one row group each (Parquet).
+
+    CSV shards are byte ranges; each row belongs to the shard in which its
+    first byte falls, so the ranges are aligned to line starts by the worker.
+    Quoted fields spanning several lines are therefore not supported.
+    """
+    shards: List[ScoringShard] = []
+    for path in files:
+        file_format = FILE_FORMATS[os.path.splitext(path)[1].lower()]
+        if file_format == "csv":
+            size = os.path.getsize(path)
+            for start in range(0, max(size, 1), shard_bytes):
+                shards.append(ScoringShard(len(shards), path, file_format, start, min(start + shard_bytes, size)))
+        else:
+            n_row_groups = _parquet_module().ParquetFile(path).num_row_groups
+            for row_group in range(n_row_groups):
+                shards.append(ScoringShard(len(shards), path, file_format, row_group, row_group + 1))
+    return shards
+
+
+class _CsvRangeReader(io.RawIOBase):
+    """
+    Reads a CSV header followed by the lines of one byte range of the file.
+    """
+
+    def __init__(self, file_obj, header: bytes, start: int, end: int) -> None:
+        self._file_obj = file_obj
+        self._header = header
+        self._file_obj.seek(start)
+        self._remaining = end - start
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._header:
+            n = min(len(buffer), len(self._header))
+            buffer[:n], self._header = self._header[:n], self._header[n:]
+            return n
+        if self._remaining <= 0:
+            return 0
+        data = self._file_obj.read(min(len(buffer), self._remaining))
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+
+def _line_start(file_obj, offset: int, header_end: int) -> int:
+    """
+    Returns the start of the first line beginning at or after `offset`.
+    """
+    if offset <= header_end:
+        return header_end
+    file_obj.seek(offset - 1)
+    file_obj.readline()
+    return file_obj.tell()
+
+
+def iter_shard_chunks(shard: ScoringShard, chunk_rows: int) -> Iterator[DataFrame]:
+    """
+    Reads the rows of one shard as DataFrames of at most `chunk_rows` rows.
+    """
+    if shard.file_format == "parquet":
+        parquet_file = _parquet_module().ParquetFile(shard.file_path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_rows, row_groups=[shard.start]):
+            yield batch.to_pandas()
+        return
+
+    with open(shard.file_path, "rb") as file_obj:
+        header = file_obj.readline()
+        header_end = file_obj.tell()
+        start = _line_start(file_obj, shard.start, header_end)
+        end = _line_start(file_obj, shard.end, header_end)
+        if end <= start:
+            return
+        reader = io.BufferedReader(_CsvRangeReader(file_obj, header, start, end))
+        with pd.read_csv(reader, chunksize=chunk_rows) as chunks:
+            yield from chunks
+
+
+# Per-process state of the scoring workers, set once by _init_worker
+_worker_scorer: Optional[FileScorer] = None
+
+
+def load_model_file(model_path: str):
+    """
+    Loads a MyModel saved with save_mmap_object (.mmap) or save_object.
+    """
+    if os.path.splitext(model_path)[1] == ".mmap":
+        return load_mmap_object(model_path)
+    return load_object(model_path)
+
+
+def _init_worker(model_path: str, chunk_rows: int) -> None:
+    """
+    Loads the model once per worker process.
+    """
+    global _worker_scorer
+    model = load_model_file(model_path)
+    _worker_scorer = FileScorer(model, BatchRecordValidator(max_records=chunk_rows), chunk_rows)
+
+
+def _score_shard(shard: ScoringShard, output_dir: str, output_format: str) -> dict:
+    """
+    Scores one shard into its own output partition, `part-<index>.<format>`.
+    The partition is written under a temporary name and renamed when complete.
+
+    Rows that do not match the schema are not scored: they are written to
+    `rejects-<index>.csv` with their position in the shard and the reason.
+
+    Raises RuntimeError (CustomException does not pickle back to the parent).
+    """
+    started = time.perf_counter()
+    part_path = os.path.join(output_dir, f"part-{shard.index:05d}.{output_format}")
+    rejects_path = os.path.join(output_dir, f"rejects-{shard.index:05d}.csv")
+    tmp_path = f"{part_path}.tmp"
+    n_rows = n_read = n_rejected = 0
+    try:
+        writer = None
+        with open(tmp_path, "wb") as out:
+            for chunk in iter_shard_chunks(shard, _worker_scorer.chunk_rows):
+                scored, rejects = _worker_scorer.score_frame_with_rejects(
+                    chunk.reset_index(drop=True), first_record=n_read
+                )
+                n_read += len(chunk)
+                if len(rejects):
+                    rejects.to_csv(rejects_path, mode="a", index=False, header=n_rejected == 0)
+                    n_rejected += len(rejects)
+                if not len(scored):
+                    continue
+                if output_format == "csv":
+                    out.write(scored.to_csv(index=False, header=n_rows == 0).encode())
+                else:
+                    import pyarrow as pa
+                    table = pa.Table.from_pandas(scored, preserve_index=False)
+                    if writer is None:
+                        writer = _parquet_module().ParquetWriter(out, table.schema)
+                    writer.write_table(table)
+                n_rows += len(scored)
+
+            if n_rows == 0 and output_format == "csv":
+                out.write((",".join(["id", "prediction", "probability"]) + "\n").encode())
+            if writer is not None:
+                writer.close()
+
+        if n_rows == 0 and output_format == "parquet":
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, part_path)
+    except Exception as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise RuntimeError(
+            f"Scoring shard {shard.index} ({shard.file_path} [{shard.start}, {shard.end})) failed: {e}"
+        ) from None
+
+    if n_rejected:
+        logging.warning(
+            f"Shard {shard.index} ({shard.file_path} [{shard.start}, {shard.end})): {n_rejected} of {n_read} "
+            f"rows rejected, see {rejects_path}."
+        )
+    return {
+        "shard": shard.index,
+        "pid": os.getpid(),
+        "rows": n_rows,
+        "rejected": n_rejected,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+class BatchScoringPipeline:
+    """
+    Scores CSV/Parquet files offline with a pool of worker processes.
+
+    The input is split into shards (CSV byte ranges, Parquet row groups); each
+    worker loads the model once and writes one output partition per shard, so
+    the workers never share a file and the run scales with the number of cores.
+
+    Invalid rows are written to per-shard rejects files instead of stopping the
+    run, and a shard that fails as a whole (e.g. a file missing a column) is
+    reported in the artifact while the other shards are still scored.
+    """
+
+    def __init__(self, batch_scoring_config: BatchScoringConfig) -> None:
+        """
+        :param batch_scoring_config: Input, output, model source and pool settings.
+        """
+        try:
+            if batch_scoring_config.output_format not in OUTPUT_FORMATS:
+                raise ValueError(
+                    f"Unsupported output format {batch_scoring_config.output_format!r}; "
+                    f"expected one of {OUTPUT_FORMATS}."
+                )
+            self.batch_scoring_config = batch_scoring_config
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def resolve_model_path(self) -> str:
+        """
+        Returns a local model file: the configured path, or the registry model
+        downloaded from S3 (the memory-mapped form when it was pushed, so the
+        workers on this host share one copy of the forest).
+        """
+        try:
+            config = self.batch_scoring_config
+            if config.model_path:
+                if not os.path.isfile(config.model_path):
+                    raise FileNotFoundError(f"Model file {config.model_path} does not exist.")
+                return config.model_path
+
+            estimator = Proj1Estimator(bucket_name=config.bucket_name, model_path=config.s3_model_key_path)
+            if estimator.is_model_present(config.s3_mmap_model_key_path):
+                return estimator.fetch_model(config.model_cache_dir, model_path=config.s3_mmap_model_key_path)
+            if not estimator.is_model_present():
+                raise FileNotFoundError(f"No model found in s3://{config.bucket_name}/{config.s3_model_key_path}.")
+            return estimator.fetch_model(config.model_cache_dir)
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def run_pipeline(self) -> BatchScoringArtifact:
+        """
+        Scores every input row and writes the `id,prediction,probability`
+        partitions to the output directory.
+        """
+        try:
+            config = self.batch_scoring_config
+            started = time.perf_counter()
+
+            shards = plan_shards(list_input_files(config.input_path), config.shard_bytes)
+            model_path = self.resolve_model_path()
+            n_workers = max(1, min(config.n_workers, len(shards)))
+            logging.info(
+                f"Batch scoring {config.input_path}: {len(shards)} shards, {n_workers} workers, model {model_path}."
+            )
+
+            os.makedirs(config.output_path, exist_ok=True)
+            for stale in glob.glob(os.path.join(config.output_path, "part-*")) + \
+                    glob.glob(os.path.join(config.output_path, "rejects-*")):
+                os.remove(stale)
+
+            results, failed_shards = [], []
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(model_path, config.chunk_rows),
+            ) as executor:
+                futures = [
+                    executor.submit(_score_shard, shard, config.output_path, config.output_format)
+                    for shard in shards
+                ]
+                for future in as_completed(futures):
+                    try:
+                        results.append(future.result())
+                    except BrokenProcessPool:
+                        # The workers themselves failed (e.g. the model did not load): nothing can be scored
+                        raise
+                    except RuntimeError as e:
+                        logging.error(f"{e}")
+                        failed_shards.append(f"{e}")
+
+            elapsed = time.perf_counter() - started
+            worker_stats = {}
+            for result in results:
+                stats = worker_stats.setdefault(result["pid"], {"shards": 0, "rows": 0, "seconds": 0.0})
+                stats["shards"] += 1
+                stats["rows"] += result["rows"]
+                stats["seconds"] += result["seconds"]
+            for pid, stats in sorted(worker_stats.items()):
+                stats["rows_per_second"] = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+                logging.info(
+                    f"Worker {pid}: {stats['shards']} shards, {stats['rows']} rows, "
+                    f"{stats['rows_per_second']:.0f} rows/s."
+                )
+
+            n_rows = sum(result["rows"] for result in results)
+            n_rejected = sum(result["rejected"] for result in results)
+            artifact = BatchScoringArtifact(
+                output_path=config.output_path,
+                model_path=model_path,
+                n_rows=n_rows,
+                n_partitions=len(glob.glob(os.path.join(config.output_path, "part-*"))),
+                elapsed_seconds=elapsed,
+                rows_per_second=n_rows / elapsed if elapsed else 0.0,
+                worker_stats=worker_stats,
+                n_rejected=n_rejected,
+                failed_shards=sorted(failed_shards),
+            )
+            logging.info(f"Batch scoring completed: {artifact}")
+            return artifact
+
+        except Exception as e:
+            raise CustomException(e, sys)
@@ -0,0 +1,239 @@
+# collection_scoring_pipeline.py
+
+import hashlib
+import os
+import sys
+import time
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+from bson import json_util
+from pandas import DataFrame
+from pymongo import UpdateOne
+
+from AutoClaimML.entity.artifact_entity import CollectionScoringArtifact
+from AutoClaimML.entity.config_entity import CollectionScoringConfig
+from AutoClaimML.entity.s3_estimator import Proj1Estimator
+from AutoClaimML.exception import CustomException
+from AutoClaimML.logger import logging
+from AutoClaimML.pipeline.batch_scoring_pipeline import load_model_file
+from AutoClaimML.serving.batch_prediction import RAW_DUMMY_COLUMNS, BatchRecordValidator
+from AutoClaimML.serving.file_scoring import FileScorer
+
+
+def file_model_version(model_path: str) -> str:
+    """
+    Returns the MD5 of a local model file, which is also the S3 ETag of the
+    same file uploaded in one part.
+    """
+    digest = hashlib.md5()
+    with open(model_path, "rb") as model_file:
+        for block in iter(lambda: model_file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class CollectionScoringPipeline:
+    """
+    Scores every document of a MongoDB collection and writes the prediction,
+    the positive-class probability and the model version back onto it.
+
+    Documents are read in `_id` order through a cursor projected onto the model
+    input fields, scored `batch_size` at a time with MyModel, and updated with
+    one unordered bulk_write of UpdateOne operations per batch. After each
+    batch the last `_id` is saved to a checkpoint file, so an interrupted run
+    resumes after it instead of starting over.
+    """
+
+    def __init__(self, collection_scoring_config: CollectionScoringConfig, database=None) -> None:
+        """
+        :param collection_scoring_config: Collection, model source, batch size and checkpoint file.
+        :param database: Database to use instead of connecting with MongoDBClient
+                         (e.g. a mongomock database in tests).
+        """
+        try:
+            self.collection_scoring_config = collection_scoring_config
+            if database is None:
+                from AutoClaimML.configuration.mongo_db_connection import MongoDBClient
+                database = MongoDBClient(database_name=collection_scoring_config.database_name).database
+            self.collection = database[collection_scoring_config.collection_name]
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def load_model(self) -> Tuple[object, str]:
+        """
+        Returns the model and its version: a local file versioned by its MD5,
+        or the registry model versioned by the S3 ETag of model.pkl (the
+        version reported by the serving app).
+        """
+        config = self.collection_scoring_config
+        if config.model_path:
+            return load_model_file(config.model_path), file_model_version(config.model_path)
+
+        estimator = Proj1Estimator(bucket_name=config.bucket_name, model_path=config.s3_model_key_path)
+        model_version = estimator.get_model_version()
+        if model_version is None:
+            raise FileNotFoundError(f"No model found in s3://{config.bucket_name}/{config.s3_model_key_path}.")
+        model_key = (
+            config.s3_mmap_model_key_path
+            if estimator.is_model_present(config.s3_mmap_model_key_path)
+            else config.s3_model_key_path
+        )
+        model_path = estimator.fetch_model(config.model_cache_dir, model_path=model_key)
+        return load_model_file(model_path), model_version
+
+    @staticmethod
+    def projection(validator: BatchRecordValidator) -> dict:
+        """
+        Returns the cursor projection: `_id`, `id` and the raw fields the model
+        inputs are computed from.
+        """
+        fields = [BatchRecordValidator.ID_COLUMN]
+        for column in validator.feature_columns:
+            fields.append(RAW_DUMMY_COLUMNS[column][0] if column in RAW_DUMMY_COLUMNS else column)
+        return {field: 1 for field in dict.fromkeys(fields)}
+
+    def read_checkpoint(self, model_version: str) -> Optional[dict]:
+        """
+        Returns the saved progress of an interrupted run of this model on this
+        collection, or None to start from the first document.
+        """
+        path = self.collection_scoring_config.checkpoint_file_path
+        if not self.collection_scoring_config.resume or not os.path.exists(path):
+            return None
+        with open(path) as checkpoint_file:
+            checkpoint = json_util.loads(checkpoint_file.read())
+
+        if checkpoint.get("model_version") != model_version:
+            logging.info(
+                f"Checkpoint {path} is for model version {checkpoint.get('model_version')}; "
+                f"rescoring from the start with {model_version}."
+            )
+            return None
+        return checkpoint
+
+    def write_checkpoint(self, model_version: str, last_id, n_scored: int) -> None:
+        """
+        Saves the last processed `_id`, replacing the checkpoint file atomically.
+        """
+        path = self.collection_scoring_config.checkpoint_file_path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as checkpoint_file:
+            checkpoint_file.write(json_util.dumps({
+                "collection_name": self.collection_scoring_config.collection_name,
+                "model_version": model_version,
+                "last_id": last_id,
+                "n_scored": n_scored,
+            }))
+        os.replace(tmp_path, path)
+
+    def iter_batches(self, projection: dict, after_id=None) -> Iterator[List[dict]]:
+        """
+        Yields the projected documents in `_id` order, `batch_size` at a time,
+        starting after `after_id` when given.
+        """
+        batch_size = self.collection_scoring_config.batch_size
+        query = {} if after_id is None else {"_id": {"$gt": after_id}}
+        cursor = self.collection.find(query, projection, sort=[("_id", 1)], batch_size=batch_size)
+        try:
+            batch = []
+            for document in cursor:
+                batch.append(document)
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        finally:
+            cursor.close()
+
+    def score_batch(self, scorer: FileScorer, documents: List[dict], model_version: str) -> List[UpdateOne]:
+        """
+        Scores one batch of documents and returns their update operations.
+        """
+        config = self.collection_scoring_config
+        ids = [document.pop("_id") for document in documents]
+        frame = DataFrame.from_records(documents).replace({"na": np.nan})
+        try:
+            scored = scorer.score_frame(frame)
+        except Exception as e:
+            raise ValueError(f"Batch starting at _id {ids[0]}: {e}") from e
+
+        return [
+            UpdateOne({"_id": _id}, {"$set": {
+                config.prediction_field: prediction,
+                config.probability_field: probability,
+                config.model_version_field: model_version,
+            }})
+            for _id, prediction, probability in zip(
+                ids, scored["prediction"].tolist(), scored["probability"].tolist()
+            )
+        ]
+
+    def run_pipeline(self) -> CollectionScoringArtifact:
+        """
+        Scores the collection (or its remainder, when resuming) in place.
+        """
+        try:
+            config = self.collection_scoring_config
+            started = time.perf_counter()
+
+            model, model_version = self.load_model()
+            validator = BatchRecordValidator(max_records=config.batch_size)
+            scorer = FileScorer(model, validator, config.batch_size)
+
+            checkpoint = self.read_checkpoint(model_version)
+            after_id = checkpoint["last_id"] if checkpoint else None
+            n_scored = checkpoint["n_scored"] if checkpoint else 0
+            if checkpoint:
+                logging.info(f"Resuming scoring of '{config.collection_name}' after _id {after_id} ({n_scored} done).")
+
+            timings = {"read": 0.0, "score": 0.0, "write": 0.0}
+            n_modified = 0
+            n_run = 0
+            batches = self.iter_batches(self.projection(validator), after_id=after_id)
+            while True:
+                mark = time.perf_counter()
+                documents = next(batches, None)
+                timings["read"] += time.perf_counter() - mark
+                if documents is None:
+                    break
+
+                mark = time.perf_counter()
+                last_id = documents[-1]["_id"]
+                operations = self.score_batch(scorer, documents, model_version)
+                timings["score"] += time.perf_counter() - mark
+
+                mark = time.perf_counter()
+                result = self.collection.bulk_write(operations, ordered=False)
+                timings["write"] += time.perf_counter() - mark
+
+                n_modified += result.modified_count
+                n_run += len(operations)
+                n_scored += len(operations)
+                self.write_checkpoint(model_version, last_id, n_scored)
+                logging.info(f"Scored {n_scored} documents of '{config.collection_name}' (last _id {last_id}).")
+
+            # The run is complete: the next run starts from the first document again
+            if os.path.exists(config.checkpoint_file_path):
+                os.remove(config.checkpoint_file_path)
+
+            elapsed = time.perf_counter() - started
+            artifact = CollectionScoringArtifact(
+                collection_name=config.collection_name,
+                model_version=model_version,
+                n_scored=n_run,
+                n_modified=n_modified,
+                resumed_after_id=after_id,
+                elapsed_seconds=elapsed,
+                documents_per_second=n_run / elapsed if elapsed else 0.0,
+            )
+            logging.info(
+                f"Collection scoring completed: {artifact} "
+                f"(read {timings['read']:.2f}s, score {timings['score']:.2f}s, write {timings['write']:.2f}s)."
+            )
+            return artifact
+
+        except Exception as e:
+            raise CustomException(e, sys)
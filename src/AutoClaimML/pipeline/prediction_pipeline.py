@@ -1,9 +1,11 @@
 # prediction_pipeline.py
 import sys
+from typing import List, Optional, Tuple
 from pandas import DataFrame
 
+from AutoClaimML.constants import PREDICTION_DECISION_THRESHOLD
 from AutoClaimML.entity.config_entity import VehiclePredictorConfig
-from AutoClaimML.entity.s3_estimator import Proj1Estimator
+from AutoClaimML.serving.model_holder import ModelHolder, model_holder
 from AutoClaimML.logger import logging
 from AutoClaimML.exception import CustomException
 
@@ -41,6 +43,28 @@ class VehicleData:
         except Exception as e:
             raise CustomException(e, sys) from e
         
+    def get_vehicle_record(self) -> dict:
+        """
+        Returns input features as a flat dictionary of scalar values (one row).
+        """
+        try:
+            return {
+                "Gender": self.Gender,
+                "Age": self.Age,
+                "Driving_License": self.Driving_License,
+                "Region_Code": self.Region_Code,
+                "Previously_Insured": self.Previously_Insured,
+                "Annual_Premium": self.Annual_Premium,
+                "Policy_Sales_Channel": self.Policy_Sales_Channel,
+                "Vintage": self.Vintage,
+                "Vehicle_Age_lt_1_Year": self.Vehicle_Age_lt_1_Year,
+                "Vehicle_Age_gt_2_Years": self.Vehicle_Age_gt_2_Years,
+                "Vehicle_Damage_Yes": self.Vehicle_Damage_Yes,
+            }
+
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
     def get_vehicle_data_as_dict(self) -> dict:
         """
         Converts input features to a dictionary format suitable for DataFrame creation.
@@ -48,19 +72,7 @@ class VehicleData:
         try:
             logging.info("Creating dictionary from VehicleData input")
 
-            return {
-                "Gender": [self.Gender],
-                "Age": [self.Age],
-                "Driving_License": [self.Driving_License],
-                "Region_Code": [self.Region_Code],
-                "Previously_Insured": [self.Previously_Insured],
-                "Annual_Premium": [self.Annual_Premium],
-                "Policy_Sales_Channel": [self.Policy_Sales_Channel],
-                "Vintage": [self.Vintage],
-                "Vehicle_Age_lt_1_Year": [self.Vehicle_Age_lt_1_Year],
-                "Vehicle_Age_gt_2_Years": [self.Vehicle_Age_gt_2_Years],
-                "Vehicle_Damage_Yes": [self.Vehicle_Damage_Yes],
-            }
+            return {key: [value] for key, value in self.get_vehicle_record().items()}
 
         except Exception as e:
             raise CustomException(e, sys) from e
@@ -77,31 +89,82 @@ class VehicleData:
         
 
 class VehicleDataClassifier:
-    def __init__(self, prediction_pipeline_config: VehiclePredictorConfig = VehiclePredictorConfig()) -> None:
+    def __init__(self,
+                 prediction_pipeline_config: VehiclePredictorConfig = VehiclePredictorConfig(),
+                 holder: ModelHolder = None,
+                 decision_threshold: Optional[float] = PREDICTION_DECISION_THRESHOLD) -> None:
         """
         Initializes the classifier with prediction config.
+
+        :param holder: Model holder to predict with. Defaults to the shared
+                       process-wide holder when the config matches its model.
+        :param decision_threshold: Positive-class probability from which a row is
+                                   labelled positive; None for the most probable class.
         """
         try:
             self.prediction_pipeline_config = prediction_pipeline_config
+            self.decision_threshold = decision_threshold
+            if holder is None:
+                holder = (
+                    model_holder
+                    if prediction_pipeline_config == model_holder.prediction_pipeline_config
+                    else ModelHolder(prediction_pipeline_config)
+                )
+            self.holder = holder
         except Exception as e:
             raise CustomException(e, sys) from e
 
     def predict(self, dataframe: DataFrame) -> str:
         """
-        Predicts based on input DataFrame using the model from S3.
+        Predicts based on input DataFrame using the cached production model.
         """
         try:
             logging.info("Entered predict method of VehicleDataClassifier")
 
-            model = Proj1Estimator(
-                bucket_name=self.prediction_pipeline_config.model_bucket_name,
-                model_path=self.prediction_pipeline_config.model_file_path,
-            )
+            model = self.holder.get_estimator()
 
-            prediction = model.predict(dataframe)
+            if self.decision_threshold is None:
+                prediction = model.predict(dataframe)
+            else:
+                prediction, _ = model.predict_with_proba(dataframe, threshold=self.decision_threshold)
 
             logging.info("Exited predict method of VehicleDataClassifier")
             return prediction
 
         except Exception as e:
-            raise CustomException(e, sys) from e
\ No newline at end of file
+            raise CustomException(e, sys) from e
+
+    def predict_proba(self, dataframe: DataFrame):
+        """
+        Returns the positive-class probability of each row using the cached production model.
+        """
+        try:
+            return self.holder.get_estimator().predict_proba(dataframe)
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def predict_records_with_proba(self, records: List[dict]) -> Tuple[list, list]:
+        """
+        Predicts a few rows given as flat records (see VehicleData.get_vehicle_record)
+        with the cached production model, without building a DataFrame, and returns
+        the labels and positive-class probabilities from the same forest pass.
+        Repeated rows are answered from the holder's prediction cache, if any.
+        """
+        try:
+            served_model = self.holder.get_served_model()
+            labels, probabilities = served_model.estimator.predict_records_with_proba(
+                records,
+                prediction_cache=self.holder.prediction_cache,
+                model_version=served_model.model_version,
+                threshold=self.decision_threshold,
+            )
+            return labels.tolist(), probabilities.tolist()
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def predict_records(self, records: List[dict]) -> list:
+        """
+        Predicts a few rows given as flat records (see predict_records_with_proba).
+        """
+        labels, _ = self.predict_records_with_proba(records)
+        return labels
@@ -1,8 +1,10 @@
 # training_pipeline.py
 
 import sys
+from typing import Callable, Optional
 from AutoClaimML.exception import CustomException
 from AutoClaimML.logger import logging 
+from AutoClaimML.constants import TRAINING_PIPELINE_STAGES
 
 from AutoClaimML.configuration.configuration import ConfigurationManager
 from AutoClaimML.components.data_ingestion import DataIngestion
@@ -27,7 +29,14 @@ from AutoClaimML.entity.artifact_entity import (DataIngestionArtifact,
                                          ModelEvaluationArtifact,
                                          ModelPusherArtifact)
 
+# Reports (stage, event) pairs, e.g. ("model_trainer", "started")
+ProgressCallback = Callable[[str, str], None]
+
+
 class TrainingPipeline:
+    # Stage names, in execution order (same names as `main.py --stage`)
+    STAGES = TRAINING_PIPELINE_STAGES
+
     def __init__(self):
         try:
             logging.info("Initializing ConfigurationManager in TrainingPipeline.")
@@ -169,7 +178,7 @@ class TrainingPipeline:
         except Exception as e:
              raise CustomException(e, sys) from e
         
-    def run_pipeline(self) -> None:
+    def run_pipeline(self, progress_callback: Optional[ProgressCallback] = None) -> None:
         """
         Runs the complete training pipeline step-by-step:
         - Data ingestion
@@ -177,44 +186,65 @@ class TrainingPipeline:
         - Data transformation
         - Model training
         - Model evaluation
+        - Model pusher (only if the new model is accepted)
+
+        :param progress_callback: Optional callable notified with (stage, event)
+                                  where event is "started", "completed" or "skipped".
         """
+        def report(stage: str, event: str) -> None:
+            if progress_callback is not None:
+                progress_callback(stage, event)
+
         try:
             logging.info("Pipeline started.")
 
             # Step 1: Data Ingestion
+            report("data_ingestion", "started")
             data_ingestion_artifact = self.start_data_ingestion()
+            report("data_ingestion", "completed")
             logging.info("Data ingestion completed.")
 
             # Step 2: Data Validation
+            report("data_validation", "started")
             data_validation_artifact = self.start_data_validation(
                 data_ingestion_artifact=data_ingestion_artifact)
+            report("data_validation", "completed")
             logging.info("Data validation completed.")
 
             # Step 3: Data Transformation
+            report("data_transformation", "started")
             data_transformation_artifact = self.start_data_transformation(
                 data_ingestion_artifact=data_ingestion_artifact,
                 data_validation_artifact=data_validation_artifact
             )
+            report("data_transformation", "completed")
             logging.info("Data transformation completed.")
 
             # Step 4: Model Training
+            report("model_trainer", "started")
             model_trainer_artifact = self.start_model_trainer(
                 data_transformation_artifact=data_transformation_artifact)
+            report("model_trainer", "completed")
             logging.info("Model training completed.")
 
             # Step 5: Model Evaluation
+            report("model_evaluation", "started")
             model_evaluation_artifact = self.start_model_evaluation(
                 data_ingestion_artifact=data_ingestion_artifact,
                 model_trainer_artifact=model_trainer_artifact
             )
+            report("model_evaluation", "completed")
             logging.info("Model evaluation completed.")
 
             # Step 6: Check if model is accepted
             if not model_evaluation_artifact.is_model_accepted:
+                report("model_pusher", "skipped")
                 logging.warning("Trained model is not better than the existing model. Pipeline stopped.")
                 return
             # step &: Model Pusher
+            report("model_pusher", "started")
             model_pusher_artifacts = self.start_model_pusher(model_evaluation_artifact=model_evaluation_artifact)
+            report("model_pusher", "completed")
             logging.info(f"Model successfully pushed: {model_pusher_artifacts}")
            
             logging.info("Pipeline completed successfully.")
@@ -224,3 +254,22 @@ class TrainingPipeline:
             raise CustomException(e, sys) from e
 
 
+def run_training_pipeline(progress_queue=None) -> None:
+    """
+    Module-level entry point so the full training pipeline can be run in a
+    separate (spawned) process.
+
+    :param progress_queue: Optional multiprocessing queue receiving (stage, event)
+                           tuples, plus ("pipeline", "failed: <message>") on failure.
+    """
+    def report(stage: str, event: str) -> None:
+        if progress_queue is not None:
+            progress_queue.put((stage, event))
+
+    try:
+        TrainingPipeline().run_pipeline(progress_callback=report)
+    except CustomException as e:
+        report("pipeline", f"failed: {e}")
+        # CustomException cannot be unpickled in the parent process (its
+        # constructor needs the sys module), so send back the message only
+        raise RuntimeError(str(e)) from None
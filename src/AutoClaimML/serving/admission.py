@@ -0,0 +1,191 @@
+# admission.py
+
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Deque, Iterable, Tuple
+
+from AutoClaimML.serving.metrics import (ADMISSION_IN_FLIGHT, ADMISSION_QUEUE_DEPTH,
+                                         ADMISSION_QUEUE_WAIT_SECONDS, ADMISSION_REJECTED)
+from AutoClaimML.logger import logging
+
+
+class AdmissionRejectedError(RuntimeError):
+    """
+    Raised when a request cannot be admitted: the wait queue is full, or no
+    slot freed up within the maximum queue wait.
+    """
+
+    def __init__(self, reason: str, message: str) -> None:
+        super().__init__(message)
+        self.reason = reason
+
+
+class AdmissionController:
+    """
+    Limits the number of prediction requests handled at once by one worker.
+
+    Up to `max_in_flight` requests run concurrently; later ones wait in FIFO
+    order, at most `max_queue` of them and each for at most
+    `max_queue_wait_seconds`. Requests beyond either limit are rejected at
+    once, so a spike turns into fast 503s instead of an unbounded backlog of
+    requests that time out anyway.
+
+    Bookkeeping happens on the event loop thread only, so no locking is needed.
+    """
+
+    def __init__(self, max_in_flight: int, max_queue: int, max_queue_wait_seconds: float) -> None:
+        """
+        :param max_in_flight: Requests handled at the same time.
+        :param max_queue: Requests allowed to wait for a slot.
+        :param max_queue_wait_seconds: Longest time a request waits for a slot.
+        """
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.max_queue_wait_seconds = max_queue_wait_seconds
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.rejected = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Requests admitted and not yet released."""
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Requests waiting for a slot."""
+        return len(self._waiters)
+
+    def _update_gauges(self) -> None:
+        ADMISSION_IN_FLIGHT.set(self._in_flight)
+        ADMISSION_QUEUE_DEPTH.set(len(self._waiters))
+
+    def _reject(self, reason: str, message: str) -> AdmissionRejectedError:
+        self.rejected += 1
+        ADMISSION_REJECTED.labels(reason=reason).inc()
+        return AdmissionRejectedError(reason, message)
+
+    async def acquire(self) -> None:
+        """
+        Waits for a slot.
+
+        :raises AdmissionRejectedError: If the queue is full or the wait times out.
+        """
+        if self._in_flight < self.max_in_flight and not self._waiters:
+            self._in_flight += 1
+            self._update_gauges()
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            raise self._reject("queue_full", f"Server overloaded: {len(self._waiters)} requests already queued.")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._update_gauges()
+        start = time.perf_counter()
+        try:
+            # release() hands its slot over by resolving the waiter
+            await asyncio.wait_for(waiter, self.max_queue_wait_seconds)
+        except asyncio.TimeoutError:
+            # A slot handed over just as the wait timed out would otherwise leak
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise self._reject(
+                "queue_timeout", f"Server overloaded: no capacity within {self.max_queue_wait_seconds}s."
+            ) from None
+        except BaseException:
+            # Client went away while queued; pass on a slot handed over meanwhile
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            self._update_gauges()
+        ADMISSION_QUEUE_WAIT_SECONDS.observe(time.perf_counter() - start)
+
+    def release(self) -> None:
+        """
+        Frees a slot, handing it to the oldest waiting request if any.
+        """
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self._update_gauges()
+                return
+        self._in_flight -= 1
+        self._update_gauges()
+
+    def stats(self) -> dict:
+        """
+        Returns the current load for the readiness report.
+        """
+        return {
+            "in_flight": self._in_flight,
+            "queue_depth": len(self._waiters),
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "rejected": self.rejected,
+        }
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware admitting prediction requests through an AdmissionController.
+
+    Only the given (method, path) routes are controlled, so health checks,
+    metrics scrapes and training endpoints are always answered. A request
+    keeps its slot until its response is fully sent (streamed file scoring
+    included). Rejected requests get a 503 JSON body with a Retry-After header.
+    """
+
+    def __init__(
+        self,
+        app,
+        controller: AdmissionController,
+        routes: Iterable[Tuple[str, str]],
+        retry_after_seconds: int
+    ) -> None:
+        """
+        :param app: The wrapped ASGI application.
+        :param controller: Shared admission controller.
+        :param routes: (method, path) pairs subject to admission control.
+        :param retry_after_seconds: Value of the Retry-After header on rejections.
+        """
+        self.app = app
+        self.controller = controller
+        self.routes = frozenset(routes)
+        self.retry_after_seconds = retry_after_seconds
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or (scope["method"], scope["path"]) not in self.routes:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self.controller.acquire()
+        except AdmissionRejectedError as e:
+            logging.warning(f"Rejected {scope['method']} {scope['path']} ({e.reason}).")
+            await self._send_rejection(send, str(e))
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release()
+
+    async def _send_rejection(self, send, message: str) -> None:
+        body = json.dumps({"status": False, "error": message}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(self.retry_after_seconds).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,117 @@
+# arrow_ipc.py
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from AutoClaimML.serving.batch_prediction import BatchRecordValidator, BatchValidationError
+from AutoClaimML.serving.file_scoring import UnsupportedFileError
+
+
+ARROW_STREAM_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+
+
+def is_arrow_stream(media_type: Optional[str]) -> bool:
+    """
+    Returns whether a Content-Type or Accept header names the Arrow IPC stream format.
+    """
+    return any(
+        part.split(";")[0].strip().lower() == ARROW_STREAM_CONTENT_TYPE
+        for part in (media_type or "").split(",")
+    )
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise UnsupportedFileError("Arrow IPC requests require the optional 'pyarrow' package.") from e
+    return pa
+
+
+def _column_values(column) -> np.ndarray:
+    """
+    Returns an Arrow column as a NumPy array, sharing the Arrow buffer when the
+    column is a single null-free numeric chunk (the usual case for a client
+    sending one record batch). Anything else is converted through pandas.
+    """
+    pa = _import_pyarrow()
+    if column.num_chunks == 1 and column.null_count == 0 and (
+        pa.types.is_integer(column.type) or pa.types.is_floating(column.type)
+    ):
+        return column.chunk(0).to_numpy(zero_copy_only=True)
+    return column.to_pandas().to_numpy()
+
+
+def read_arrow_batch(body: bytes, validator: BatchRecordValidator) -> DataFrame:
+    """
+    Reads an Arrow IPC stream of prediction records into the same typed
+    DataFrame BatchRecordValidator.to_dataframe builds from JSON records.
+
+    Numeric columns already in their schema type are used without copying.
+
+    :param body: Request body holding one Arrow IPC stream.
+    :param validator: Validator enforcing the prediction schema and record limit.
+    :return: Typed DataFrame ready for MyModel.
+    :raises UnsupportedFileError: If pyarrow is not installed.
+    :raises BatchValidationError: If the stream is malformed or does not match the schema.
+    """
+    pa = _import_pyarrow()
+    try:
+        table = pa.ipc.open_stream(pa.py_buffer(body)).read_all()
+    except (pa.ArrowInvalid, OSError) as e:
+        raise BatchValidationError(f"Invalid Arrow IPC stream: {e}") from e
+
+    if table.num_rows == 0:
+        raise BatchValidationError("The Arrow stream holds no records.")
+    if table.num_rows > validator.max_records:
+        raise BatchValidationError(
+            f"Batch of {table.num_rows} records exceeds the limit of {validator.max_records}."
+        )
+
+    columns = [validator.ID_COLUMN] + validator.feature_columns
+    missing = [column for column in columns if column not in table.column_names]
+    if missing:
+        raise BatchValidationError(f"Missing columns: {', '.join(missing)}.")
+
+    raw = DataFrame({column: _column_values(table.column(column)) for column in columns}, copy=False)
+    dataframe = validator.validate_dataframe(raw)
+    validator.check_unique_ids(dataframe)
+    return dataframe
+
+
+def write_arrow_predictions(
+    labels: pd.Series,
+    probabilities: pd.Series,
+    model_version: Optional[str],
+    threshold: Optional[float]
+) -> memoryview:
+    """
+    Serializes batch predictions as an Arrow IPC stream with `id`, `prediction`
+    and `probability` columns. The model version and decision threshold are
+    stored in the schema metadata.
+
+    :param labels: Predicted labels indexed by id.
+    :param probabilities: Positive-class probabilities indexed by id.
+    :param model_version: Version of the model that scored the batch.
+    :param threshold: Decision threshold applied, or None for the most probable class.
+    :return: The stream, as a view of the Arrow buffer (no copy into bytes).
+    """
+    pa = _import_pyarrow()
+    batch = pa.RecordBatch.from_arrays(
+        [
+            pa.array(labels.index.to_numpy(dtype="int64")),
+            pa.array(labels.to_numpy(dtype="int64")),
+            pa.array(probabilities.to_numpy(dtype="float64")),
+        ],
+        names=["id", "prediction", "probability"],
+    )
+    metadata = {"model_version": model_version or "", "threshold": "" if threshold is None else str(threshold)}
+    batch = batch.replace_schema_metadata(metadata)
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return memoryview(sink.getvalue())
@@ -0,0 +1,231 @@
+# batch_prediction.py
+
+import sys
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from AutoClaimML.constants import SCHEMA_FILE_PATH
+from AutoClaimML.exception import CustomException
+from AutoClaimML.utils.main_utils import read_yaml_file
+
+
+# Raw-data encodings used by DataTransformation (Gender mapping and the
+# get_dummies(drop_first=True) columns, renamed), spelled out so every chunk
+# of a file gets the same columns whatever categories it happens to contain.
+RAW_GENDER_VALUES = {"Female": 0, "Male": 1}
+RAW_DUMMY_COLUMNS = {
+    "Vehicle_Age_lt_1_Year": ("Vehicle_Age", "< 1 Year"),
+    "Vehicle_Age_gt_2_Years": ("Vehicle_Age", "> 2 Years"),
+    "Vehicle_Damage_Yes": ("Vehicle_Damage", "Yes"),
+}
+
+
+class BatchValidationError(ValueError):
+    """
+    Raised when a batch prediction payload does not match the prediction schema.
+    """
+
+
+class BatchRecordValidator:
+    """
+    Validates JSON prediction records against the `prediction_columns` section
+    of config/schema.yaml and converts them into one typed DataFrame, so the
+    whole batch can be scored in a single vectorized model call.
+    """
+
+    ID_COLUMN = "id"
+
+    def __init__(self, max_records: int, schema_file_path: str = SCHEMA_FILE_PATH) -> None:
+        """
+        :param max_records: Maximum number of records accepted in one request.
+        :param schema_file_path: Path to the schema YAML file.
+        """
+        try:
+            schema_config = read_yaml_file(file_path=schema_file_path)
+            self.column_types: Dict[str, str] = {
+                name: dtype
+                for column in schema_config["prediction_columns"]
+                for name, dtype in column.items()
+            }
+            self.max_records = max_records
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    @property
+    def feature_columns(self) -> List[str]:
+        """Model input columns, in schema order."""
+        return list(self.column_types)
+
+    def to_dataframe(self, records: List[dict]) -> DataFrame:
+        """
+        Validates records and returns them as a DataFrame with an `id` column
+        followed by the model input columns.
+
+        :param records: List of JSON objects, one per policy.
+        :return: Typed DataFrame ready for MyModel.
+        :raises BatchValidationError: If the payload does not match the schema.
+        """
+        if not isinstance(records, list) or not records:
+            raise BatchValidationError("'records' must be a non-empty list of objects.")
+        if len(records) > self.max_records:
+            raise BatchValidationError(
+                f"Batch of {len(records)} records exceeds the limit of {self.max_records}."
+            )
+        if not all(isinstance(record, dict) for record in records):
+            raise BatchValidationError("Every record must be a JSON object.")
+
+        columns = [self.ID_COLUMN] + self.feature_columns
+        raw = DataFrame.from_records(records, columns=columns)
+        dataframe = self.validate_dataframe(raw)
+
+        self.check_unique_ids(dataframe)
+        return dataframe
+
+    def check_unique_ids(self, dataframe: DataFrame) -> None:
+        """
+        Rejects a batch in which two records share an id, since results are keyed by id.
+
+        :raises BatchValidationError: On the first duplicate id.
+        """
+        duplicated = dataframe[self.ID_COLUMN].duplicated()
+        if duplicated.any():
+            duplicate = dataframe.loc[duplicated, self.ID_COLUMN].iloc[0]
+            raise BatchValidationError(f"Duplicate id {duplicate} in batch.")
+
+    def validate_dataframe(self, raw: DataFrame, first_record: int = 0) -> DataFrame:
+        """
+        Converts the `id` and model input columns of a DataFrame to their schema
+        types, dropping any other column.
+
+        :param raw: Rows to validate, e.g. one chunk of an uploaded file.
+        :param first_record: Position of the first row, used in error messages.
+        :return: Typed DataFrame ready for MyModel.
+        :raises BatchValidationError: If a column is missing or a value does not match the schema.
+        """
+        columns = [self.ID_COLUMN] + self.feature_columns
+        missing = [column for column in columns if column not in raw.columns]
+        if missing:
+            raise BatchValidationError(f"Missing columns: {', '.join(missing)}.")
+
+        # Built in one step: inserting columns one by one costs more than converting them
+        converted = {
+            column: self._convert_column(
+                raw[column], column, "int" if column == self.ID_COLUMN else self.column_types[column], first_record
+            )
+            for column in columns
+        }
+        return DataFrame(converted, index=raw.index, copy=False)
+
+    def row_errors(self, raw: DataFrame) -> pd.Series:
+        """
+        Validates every row of a DataFrame instead of stopping at the first bad one.
+
+        :param raw: Rows to validate, e.g. one chunk of a file scored offline.
+        :return: For each row, why it does not match the schema (its first bad
+                 column), or None for valid rows.
+        :raises BatchValidationError: If a column is missing.
+        """
+        columns = [self.ID_COLUMN] + self.feature_columns
+        missing = [column for column in columns if column not in raw.columns]
+        if missing:
+            raise BatchValidationError(f"Missing columns: {', '.join(missing)}.")
+
+        errors = pd.Series(None, index=raw.index, dtype=object)
+        for column in columns:
+            dtype = "int" if column == self.ID_COLUMN else self.column_types[column]
+            _, invalid = self._parse_column(raw[column], dtype)
+            invalid &= errors.isna()
+            if invalid.any():
+                is_missing = raw[column].isna()
+                errors[invalid & is_missing] = f"'{column}' is missing"
+                errors[invalid & ~is_missing] = f"'{column}' must be of type {dtype}"
+        return errors
+
+    @staticmethod
+    def _parse_column(values: pd.Series, dtype: str) -> Tuple[pd.Series, pd.Series]:
+        """
+        Returns one column as float64 and the mask of values that do not match `dtype`.
+        """
+        if pd.api.types.is_integer_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            return values.astype("float64"), pd.Series(False, index=values.index)
+
+        if pd.api.types.is_float_dtype(values):
+            # Common case: pandas already inferred a numeric column from JSON numbers
+            numeric = values.astype("float64")
+            invalid = numeric.isna()
+        else:
+            # Mixed column: booleans and numeric strings are rejected rather than coerced
+            invalid = values.map(lambda v: isinstance(v, bool) or not isinstance(v, (int, float)))
+            numeric = pd.to_numeric(values.where(~invalid), errors="coerce")
+            invalid |= numeric.isna()
+
+        if dtype == "int":
+            invalid |= np.floor(numeric) != numeric
+        return numeric, invalid
+
+    @classmethod
+    def _convert_column(cls, values: pd.Series, column: str, dtype: str, first_record: int = 0) -> pd.Series:
+        """
+        Converts one column to its schema type, reporting the first bad record.
+        """
+        if pd.api.types.is_integer_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            return values.astype("int64" if dtype == "int" else "float64")
+
+        numeric, invalid = cls._parse_column(values, dtype)
+        if invalid.any():
+            position = int(np.flatnonzero(invalid.to_numpy())[0])
+            record = first_record + position
+            value = values.iloc[position]
+            if value is None or (isinstance(value, float) and np.isnan(value)):
+                raise BatchValidationError(f"Record {record}: '{column}' is missing.")
+            if isinstance(value, np.generic):
+                value = value.item()
+            raise BatchValidationError(
+                f"Record {record}: '{column}' must be of type {dtype}, got {value!r}."
+            )
+
+        return numeric.astype("int64" if dtype == "int" else "float64")
+
+
+def format_batch_predictions(labels: pd.Series, probabilities: pd.Series) -> Dict[str, dict]:
+    """
+    Builds the JSON response body keyed by record id.
+
+    :param labels: Predicted labels indexed by id.
+    :param probabilities: Positive-class probabilities indexed by id.
+    :return: {id: {"prediction": int, "probability": float}}
+    """
+    return {
+        str(record_id): {"prediction": int(label), "probability": float(probability)}
+        for record_id, label, probability in zip(
+            labels.index.tolist(), labels.tolist(), probabilities.tolist()
+        )
+    }
+
+
+def engineer_raw_features(dataframe: DataFrame) -> DataFrame:
+    """
+    Turns raw data columns (as stored in MongoDB: Gender as Male/Female,
+    Vehicle_Age and Vehicle_Damage as categories) into the model input columns.
+    Columns that are already encoded are left as they are.
+
+    :param dataframe: Raw or already encoded rows.
+    :return: DataFrame with the model input columns (plus any other columns).
+    """
+    dataframe = dataframe.copy()
+
+    if "Gender" in dataframe.columns and not pd.api.types.is_numeric_dtype(dataframe["Gender"]):
+        # Unknown values are kept, so validation reports them instead of a missing value
+        mapped = dataframe["Gender"].map(RAW_GENDER_VALUES)
+        dataframe["Gender"] = mapped.where(mapped.notna(), dataframe["Gender"])
+
+    sources = set()
+    for column, (source, category) in RAW_DUMMY_COLUMNS.items():
+        if source in dataframe.columns:
+            dataframe[column] = (dataframe[source] == category).astype("int64")
+            sources.add(source)
+
+    return dataframe.drop(columns=sorted(sources))
@@ -0,0 +1,111 @@
+# executors.py
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable
+
+from AutoClaimML.serving.metrics import EXECUTOR_IN_FLIGHT, EXECUTOR_QUEUE_DEPTH
+from AutoClaimML.logger import logging
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """
+    Raised when a bounded executor already holds its maximum number of queued tasks.
+    """
+
+
+class BoundedExecutor:
+    """
+    Runs blocking callables off the asyncio event loop on a fixed-size pool,
+    rejecting new work once `max_queue_size` tasks are already waiting for a worker.
+
+    A task counts as in flight until its worker finishes it, even when the
+    awaiting coroutine is cancelled first (e.g. the client disconnected).
+    Bookkeeping happens on the event loop thread only, so no locking is needed.
+    """
+
+    def __init__(self, name: str, executor: Executor, max_workers: int, max_queue_size: int) -> None:
+        """
+        :param name: Label used in logs and metrics (e.g. "inference").
+        :param executor: Underlying thread or process pool.
+        :param max_workers: Number of workers in the pool.
+        :param max_queue_size: Maximum number of tasks waiting for a free worker.
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self._executor = executor
+        self._in_flight = 0
+        self._in_flight_gauge = EXECUTOR_IN_FLIGHT.labels(executor=name)
+        self._queue_depth_gauge = EXECUTOR_QUEUE_DEPTH.labels(executor=name)
+
+    @property
+    def in_flight(self) -> int:
+        """Tasks submitted and not yet finished (running + queued)."""
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Tasks waiting for a free worker."""
+        return max(0, self._in_flight - self.max_workers)
+
+    def _update_gauges(self) -> None:
+        self._in_flight_gauge.set(self._in_flight)
+        self._queue_depth_gauge.set(self.queue_depth)
+
+    def _task_done(self) -> None:
+        self._in_flight -= 1
+        self._update_gauges()
+
+    def _on_task_done(self, loop: asyncio.AbstractEventLoop, _future) -> None:
+        # Called on the thread that completed the task; count it on the event loop
+        try:
+            loop.call_soon_threadsafe(self._task_done)
+        except RuntimeError:
+            # Event loop already closed (server shutdown)
+            pass
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Runs `fn(*args, **kwargs)` on the pool and awaits its result.
+
+        :raises ExecutorSaturatedError: If the pool queue is full.
+        """
+        if self._in_flight >= self.max_workers + self.max_queue_size:
+            raise ExecutorSaturatedError(
+                f"{self.name} executor is saturated ({self._in_flight} tasks in flight)."
+            )
+
+        loop = asyncio.get_running_loop()
+        # Run in a copy of the caller's context, so per-request state (stage timings) follows the task
+        context = contextvars.copy_context()
+        future = self._executor.submit(context.run, fn, *args, **kwargs)
+
+        self._in_flight += 1
+        self._update_gauges()
+        # Registered before wrapping, so the count drops before the result is delivered
+        future.add_done_callback(functools.partial(self._on_task_done, loop))
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def shutdown(self) -> None:
+        """
+        Stops the pool, dropping tasks that have not started yet.
+        """
+        logging.info(f"Shutting down {self.name} executor.")
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def create_inference_executor(max_workers: int, max_queue_size: int) -> BoundedExecutor:
+    """
+    Thread pool for model scoring; numpy and the sklearn forest release the
+    GIL for most of the work, so threads share one copy of the model.
+    """
+    return BoundedExecutor(
+        name="inference",
+        executor=ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference"),
+        max_workers=max_workers,
+        max_queue_size=max_queue_size,
+    )
+
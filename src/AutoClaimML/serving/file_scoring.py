@@ -0,0 +1,166 @@
+# file_scoring.py
+
+import os
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+import numpy as np
+
+import pandas as pd
+from pandas import DataFrame
+
+from AutoClaimML.entity.estimator import MyModel
+from AutoClaimML.serving.batch_prediction import BatchRecordValidator, engineer_raw_features
+from AutoClaimML.logger import logging
+
+
+FILE_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+}
+FILE_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/vnd.apache.parquet": "parquet",
+    "application/x-parquet": "parquet",
+}
+OUTPUT_COLUMNS = ["id", "prediction", "probability"]
+
+
+class UnsupportedFileError(ValueError):
+    """
+    Raised for uploads that are neither CSV nor Parquet, or Parquet without pyarrow installed.
+    """
+
+
+def detect_file_format(filename: Optional[str], content_type: Optional[str]) -> str:
+    """
+    Returns "csv" or "parquet" from the upload's file extension, falling back to its content type.
+
+    :raises UnsupportedFileError: If neither identifies a supported format.
+    """
+    extension = os.path.splitext(filename or "")[1].lower()
+    file_format = FILE_FORMATS.get(extension) or FILE_CONTENT_TYPES.get((content_type or "").split(";")[0].strip())
+    if file_format is None:
+        raise UnsupportedFileError(
+            f"Unsupported file {filename!r} ({content_type}); upload a .csv or .parquet file."
+        )
+    return file_format
+
+
+def iter_file_chunks(file_obj: BinaryIO, file_format: str, chunk_rows: int) -> Iterator[DataFrame]:
+    """
+    Reads a CSV or Parquet file as DataFrames of at most `chunk_rows` rows,
+    never holding more than one chunk in memory.
+    """
+    if file_format == "csv":
+        with pd.read_csv(file_obj, chunksize=chunk_rows) as reader:
+            yield from reader
+        return
+
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise UnsupportedFileError("Parquet uploads require the optional 'pyarrow' package.") from e
+
+    parquet_file = pq.ParquetFile(file_obj)
+    for batch in parquet_file.iter_batches(batch_size=chunk_rows):
+        yield batch.to_pandas()
+
+
+class FileScorer:
+    """
+    Scores an uploaded file chunk by chunk with one model, producing the
+    `id,prediction,probability` CSV rows for each chunk as soon as it is scored.
+
+    Every chunk goes through the same steps: raw feature engineering (if the
+    file holds raw data columns), schema validation, then MyModel's
+    preprocessing and forest in a single predict_with_proba pass.
+    """
+
+    def __init__(
+        self,
+        model: MyModel,
+        validator: BatchRecordValidator,
+        chunk_rows: int,
+        threshold: Optional[float] = None
+    ) -> None:
+        """
+        :param model: Model used for every chunk, so one file is never scored by two versions.
+        :param validator: Validates and types the model input columns.
+        :param chunk_rows: Number of rows read and scored at a time.
+        :param threshold: Decision threshold on the positive-class probability (None: most probable class).
+        """
+        self.model = model
+        self.validator = validator
+        self.chunk_rows = chunk_rows
+        self.threshold = threshold
+
+    def _parse_text_columns(self, chunk: DataFrame) -> DataFrame:
+        """
+        A CSV column holding one malformed value is read as text; parse the
+        numeric values so validation reports only the malformed ones.
+        """
+        for column in self.validator.feature_columns:
+            if column in chunk.columns and not pd.api.types.is_numeric_dtype(chunk[column]):
+                numeric = pd.to_numeric(chunk[column], errors="coerce")
+                chunk[column] = numeric.astype(object).where(numeric.notna(), chunk[column])
+        return chunk
+
+    def _prepare(self, chunk: DataFrame) -> DataFrame:
+        return self._parse_text_columns(engineer_raw_features(chunk))
+
+    def score_frame(self, chunk: DataFrame, first_record: int = 0) -> DataFrame:
+        """
+        Scores one chunk and returns its `id,prediction,probability` rows.
+        """
+        return self._score_prepared(self._prepare(chunk), first_record)
+
+    def score_frame_with_rejects(self, chunk: DataFrame, first_record: int = 0) -> Tuple[DataFrame, DataFrame]:
+        """
+        Scores the valid rows of one chunk and sets the others aside, so one bad
+        row does not stop an offline run.
+
+        :return: Tuple of (`id,prediction,probability` rows of the valid rows,
+                 rejected input rows preceded by their `record` position and `error`).
+        :raises BatchValidationError: If a column is missing.
+        """
+        prepared = self._prepare(chunk)
+        errors = self.validator.row_errors(prepared)
+        rejected = errors.notna().to_numpy()
+
+        rejects = chunk.loc[rejected]
+        rejects.insert(0, "error", errors[rejected].to_numpy())
+        rejects.insert(0, "record", first_record + np.flatnonzero(rejected))
+        if rejected.all():
+            return DataFrame({column: [] for column in OUTPUT_COLUMNS}), rejects
+        return self._score_prepared(prepared.loc[~rejected], first_record), rejects
+
+    def _score_prepared(self, chunk: DataFrame, first_record: int) -> DataFrame:
+        vehicle_df = self.validator.validate_dataframe(chunk, first_record=first_record)
+        labels, probabilities = self.model.predict_with_proba(vehicle_df, threshold=self.threshold)
+
+        return DataFrame({
+            "id": labels.index,
+            "prediction": labels.to_numpy().astype("int64"),
+            "probability": probabilities.to_numpy(),
+        })
+
+    def score_chunk(self, chunk: DataFrame, first_record: int, header: bool) -> str:
+        """
+        Scores one chunk and returns its rows as CSV text.
+        """
+        return self.score_frame(chunk, first_record=first_record).to_csv(index=False, header=header)
+
+    def iter_csv(self, file_obj: BinaryIO, file_format: str) -> Iterator[str]:
+        """
+        Yields the scored CSV text chunk by chunk; the first piece carries the header.
+        Validation errors surface on the chunk that contains the bad row.
+        """
+        n_rows = 0
+        for chunk in iter_file_chunks(file_obj, file_format, self.chunk_rows):
+            yield self.score_chunk(chunk.reset_index(drop=True), first_record=n_rows, header=n_rows == 0)
+            n_rows += len(chunk)
+
+        if n_rows == 0:
+            yield ",".join(OUTPUT_COLUMNS) + "\n"
+        logging.info(f"Scored uploaded {file_format} file: {n_rows} rows.")
@@ -0,0 +1,137 @@
+# metrics.py
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+
+# HTTP requests (labelled by route template, so path parameters do not add series)
+HTTP_REQUESTS = Counter(
+    "autoclaim_http_requests_total",
+    "HTTP requests handled, by method, route and response status.",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_ERRORS = Counter(
+    "autoclaim_http_request_errors_total",
+    "HTTP requests answered with a 4xx/5xx status or failing with an unhandled exception.",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION_SECONDS = Histogram(
+    "autoclaim_http_request_duration_seconds",
+    "Time from receiving a request to sending the start of its response.",
+    ["method", "route"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+# Serving stages (see AutoClaimML.utils.stage_timing)
+STAGE_DURATION_SECONDS = Histogram(
+    "autoclaim_stage_duration_seconds",
+    "Time spent in one stage of serving: parse, encode, transform, predict or model_load.",
+    ["stage"],
+    buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+             0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 10.0, 30.0),
+)
+
+# Served model
+MODEL_INFO = Gauge(
+    "autoclaim_model_info",
+    "Always 1; labels identify the model currently served by this worker.",
+    ["model_version", "model_format"],
+)
+
+# Micro-batching
+PREDICTION_BATCH_SIZE = Histogram(
+    "autoclaim_prediction_batch_size",
+    "Number of single-row prediction requests scored together in one model call.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+PREDICTION_QUEUE_WAIT_SECONDS = Histogram(
+    "autoclaim_prediction_queue_wait_seconds",
+    "Time a single-row prediction request waited in the batching queue before scoring.",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
+PREDICTION_BATCH_QUEUE_DEPTH = Gauge(
+    "autoclaim_prediction_batch_queue_depth",
+    "Single-row prediction requests waiting in the batching queue (sampled at scrape time).",
+)
+
+# Admission control
+ADMISSION_IN_FLIGHT = Gauge(
+    "autoclaim_admission_in_flight",
+    "Prediction requests admitted and not yet finished.",
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "autoclaim_admission_queue_depth",
+    "Prediction requests waiting for admission; a scaling signal for the autoscaler.",
+)
+ADMISSION_QUEUE_WAIT_SECONDS = Histogram(
+    "autoclaim_admission_queue_wait_seconds",
+    "Time an admitted prediction request waited for a free slot.",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+ADMISSION_REJECTED = Counter(
+    "autoclaim_admission_rejected_total",
+    "Prediction requests shed with 503, by reason (queue_full or queue_timeout).",
+    ["reason"],
+)
+
+# Executors
+EXECUTOR_IN_FLIGHT = Gauge(
+    "autoclaim_executor_in_flight",
+    "Tasks submitted to an executor and not yet finished.",
+    ["executor"],
+)
+EXECUTOR_QUEUE_DEPTH = Gauge(
+    "autoclaim_executor_queue_depth",
+    "Tasks waiting for a free executor worker.",
+    ["executor"],
+)
+
+# Prediction cache
+PREDICTION_CACHE_HITS = Counter(
+    "autoclaim_prediction_cache_hits_total",
+    "Rows answered from the prediction cache.",
+)
+PREDICTION_CACHE_MISSES = Counter(
+    "autoclaim_prediction_cache_misses_total",
+    "Rows looked up in the prediction cache and scored by the model.",
+)
+PREDICTION_CACHE_EVICTIONS = Counter(
+    "autoclaim_prediction_cache_evictions_total",
+    "Entries removed from the prediction cache.",
+    ["reason"],
+)
+PREDICTION_CACHE_ENTRIES = Gauge(
+    "autoclaim_prediction_cache_entries",
+    "Rows currently held in the prediction cache.",
+)
+PREDICTION_CACHE_HIT_RATIO = Gauge(
+    "autoclaim_prediction_cache_hit_ratio",
+    "Share of cache lookups answered from the cache since the worker started (sampled at scrape time).",
+)
+
+# Training jobs
+TRAINING_JOBS_ACTIVE = Gauge(
+    "autoclaim_training_jobs_active",
+    "Training jobs currently queued or running.",
+)
+
+
+_stage_histograms: dict = {}
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    """
+    Stage observer (see add_stage_observer) recording into STAGE_DURATION_SECONDS.
+    """
+    histogram = _stage_histograms.get(stage)
+    if histogram is None:
+        histogram = _stage_histograms.setdefault(stage, STAGE_DURATION_SECONDS.labels(stage=stage))
+    histogram.observe(seconds)
+
+
+def render_metrics() -> tuple:
+    """
+    Returns the current metrics in the Prometheus text exposition format.
+
+    :return: Tuple of (payload bytes, content type).
+    """
+    return generate_latest(), CONTENT_TYPE_LATEST
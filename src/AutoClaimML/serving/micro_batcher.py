@@ -0,0 +1,194 @@
+# micro_batcher.py
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Set
+
+from AutoClaimML.serving.metrics import PREDICTION_BATCH_SIZE, PREDICTION_QUEUE_WAIT_SECONDS
+from AutoClaimML.logger import logging
+
+
+@dataclass
+class _PendingPrediction:
+    record: dict
+    future: asyncio.Future
+    enqueued_at: float
+
+
+class PredictionBatcher:
+    """
+    Coalesces concurrent single-row prediction requests into one model call.
+
+    Requests are queued and flushed as a single list of records when either
+    `max_batch_size` rows are waiting or the oldest row has waited
+    `max_wait_seconds`. While `max_concurrent_batches` batches are being
+    scored, new arrivals keep queueing, so batches grow with load and stay
+    at one row when idle.
+
+    If scoring a batch fails, its rows are scored again one at a time, so
+    only the requests whose own row fails receive the error.
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[List[dict]], Awaitable[Sequence]],
+        max_batch_size: int,
+        max_wait_seconds: float,
+        max_concurrent_batches: int = 1
+    ) -> None:
+        """
+        :param predict_fn: Coroutine function that scores a list of records and
+                           returns one prediction per record, in order.
+        :param max_batch_size: Maximum number of rows scored together.
+        :param max_wait_seconds: Maximum time the oldest queued row waits before a flush.
+        :param max_concurrent_batches: Number of batches allowed to score at the same time.
+        """
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self.max_concurrent_batches = max_concurrent_batches
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flushes: Set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        """
+        Starts the flushing task on the running event loop.
+        """
+        if self._task is None:
+            logging.info(
+                f"Starting PredictionBatcher (max_batch_size={self.max_batch_size}, "
+                f"max_wait_seconds={self.max_wait_seconds})."
+            )
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_concurrent_batches)
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stops the flushing task and cancels requests that are still queued.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+            for flush in list(self._flushes):
+                flush.cancel()
+            while not self._queue.empty():
+                self._queue.get_nowait().future.cancel()
+
+    @property
+    def queue_depth(self) -> int:
+        """Requests queued and not yet taken into a batch."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def predict(self, record: dict) -> Any:
+        """
+        Queues one input row and waits for its prediction.
+
+        :param record: Mapping of feature name to scalar value.
+        :return: Prediction for this row.
+        """
+        if self._task is None:
+            raise RuntimeError("PredictionBatcher is not running.")
+
+        loop = asyncio.get_running_loop()
+        pending = _PendingPrediction(record=record, future=loop.create_future(), enqueued_at=loop.time())
+        self._queue.put_nowait(pending)
+        return await pending.future
+
+    async def _collect(self) -> List[_PendingPrediction]:
+        loop = asyncio.get_running_loop()
+        first = await self._queue.get()
+        batch = [first]
+        deadline = first.enqueued_at + self.max_wait_seconds
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                # Deadline passed (e.g. while the previous batch was scoring):
+                # take whatever is already queued, without waiting
+                if self._queue.empty():
+                    break
+                batch.append(self._queue.get_nowait())
+                continue
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            # Wait for a free scoring slot before collecting, so rows pile up
+            # into larger batches while all slots are busy
+            await self._slots.acquire()
+            try:
+                batch = await self._collect()
+            except BaseException:
+                self._slots.release()
+                raise
+
+            flush = asyncio.get_running_loop().create_task(self._flush(batch))
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List[_PendingPrediction]) -> None:
+        try:
+            await self._score(batch)
+        except asyncio.CancelledError:
+            for pending in batch:
+                pending.future.cancel()
+            raise
+        finally:
+            self._slots.release()
+
+    async def _score(self, batch: List[_PendingPrediction]) -> None:
+        flushed_at = asyncio.get_running_loop().time()
+        PREDICTION_BATCH_SIZE.observe(len(batch))
+        for pending in batch:
+            PREDICTION_QUEUE_WAIT_SECONDS.observe(flushed_at - pending.enqueued_at)
+
+        try:
+            predictions = list(await self.predict_fn([pending.record for pending in batch]))
+        except Exception as e:
+            if len(batch) == 1:
+                logging.error(f"Prediction failed: {e}")
+                self._set_exception(batch[0], e)
+                return
+            # One bad row must not fail the unrelated requests it was batched with
+            logging.warning(f"Batched prediction of {len(batch)} rows failed ({e}); scoring them one by one.")
+            await self._score_each(batch)
+            return
+
+        for pending, prediction in zip(batch, predictions):
+            self._set_result(pending, prediction)
+
+    async def _score_each(self, batch: List[_PendingPrediction]) -> None:
+        for pending in batch:
+            if pending.future.done():
+                continue
+            try:
+                prediction = list(await self.predict_fn([pending.record]))[0]
+            except Exception as e:
+                logging.error(f"Prediction failed: {e}")
+                self._set_exception(pending, e)
+            else:
+                self._set_result(pending, prediction)
+
+    @staticmethod
+    def _set_result(pending: _PendingPrediction, prediction: Any) -> None:
+        # A client that disconnected leaves a cancelled future behind
+        if not pending.future.done():
+            pending.future.set_result(prediction)
+
+    @staticmethod
+    def _set_exception(pending: _PendingPrediction, error: Exception) -> None:
+        if not pending.future.done():
+            pending.future.set_exception(error)
@@ -0,0 +1,228 @@
+# model_holder.py
+
+import sys
+import time
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+from pandas import DataFrame
+
+from AutoClaimML.entity.config_entity import VehiclePredictorConfig
+from AutoClaimML.entity.s3_estimator import Proj1Estimator
+from AutoClaimML.serving.prediction_cache import PredictionCache
+from AutoClaimML.exception import CustomException
+from AutoClaimML.serving.metrics import MODEL_INFO
+from AutoClaimML.logger import logging
+from AutoClaimML.utils.stage_timing import timed_stage
+
+
+# Representative input row used to exercise the full prediction path once
+# after loading, so the first real request does not pay for lazy initialisation.
+WARMUP_RECORD = {
+    "Gender": [1],
+    "Age": [35],
+    "Driving_License": [1],
+    "Region_Code": [28.0],
+    "Previously_Insured": [0],
+    "Annual_Premium": [30000.0],
+    "Policy_Sales_Channel": [26.0],
+    "Vintage": [150],
+    "Vehicle_Age_lt_1_Year": [0],
+    "Vehicle_Age_gt_2_Years": [0],
+    "Vehicle_Damage_Yes": [1],
+}
+
+
+@dataclass(frozen=True)
+class ServedModel:
+    """
+    Immutable snapshot of the model being served. Swapping models replaces
+    the whole snapshot, so a request always sees a consistent estimator/version pair.
+    """
+    estimator: Proj1Estimator
+    model_version: Optional[str]
+    model_format: str
+    loaded_at: float
+    load_seconds: float
+
+
+class ModelHolder:
+    """
+    Process-wide holder for the production model.
+
+    The model is downloaded from S3 and loaded once per worker (normally at
+    application startup; memory-mapped models are downloaded once per host)
+    and then shared by every prediction request. A newer model can be loaded
+    in the background with `refresh`; requests that already hold the previous
+    snapshot finish on it.
+    """
+
+    def __init__(self, prediction_pipeline_config: VehiclePredictorConfig = VehiclePredictorConfig()) -> None:
+        """
+        :param prediction_pipeline_config: S3 location of the production model.
+        """
+        self.prediction_pipeline_config = prediction_pipeline_config
+        self._served: Optional[ServedModel] = None
+        self._lock = threading.RLock()
+        self.prediction_cache: Optional[PredictionCache] = None
+
+    def attach_prediction_cache(self, prediction_cache: PredictionCache) -> None:
+        """
+        Caches predictions of the served model in `prediction_cache`, which is
+        reset whenever a new model is swapped in.
+        """
+        with self._lock:
+            prediction_cache.reset(self.model_version)
+            self.prediction_cache = prediction_cache
+
+    @property
+    def is_ready(self) -> bool:
+        """Returns True once a model has been loaded and warmed up."""
+        return self._served is not None
+
+    @property
+    def model_version(self) -> Optional[str]:
+        """Returns the version (S3 ETag) of the model being served."""
+        served = self._served
+        return served.model_version if served is not None else None
+
+    def _new_estimator(self) -> Proj1Estimator:
+        return Proj1Estimator(
+            bucket_name=self.prediction_pipeline_config.model_bucket_name,
+            model_path=self.prediction_pipeline_config.model_file_path,
+        )
+
+    def _load_model(self, estimator: Proj1Estimator) -> str:
+        """
+        Loads the memory-mapped model when it is enabled and published, and the
+        pickled model otherwise.
+
+        Returns:
+            str: Format of the loaded model, "mmap" or "pickle".
+        """
+        config = self.prediction_pipeline_config
+        if config.mmap_model_enabled:
+            if estimator.is_model_present(config.mmap_model_file_path):
+                estimator.load_mmap_model(
+                    mmap_model_path=config.mmap_model_file_path,
+                    cache_dir=config.model_cache_dir,
+                )
+                return "mmap"
+            logging.info(f"{config.mmap_model_file_path} not found in S3; loading the pickled model.")
+        estimator.load_model()
+        return "pickle"
+
+    def load(self, model_version: Optional[str] = None) -> ServedModel:
+        """
+        Downloads the model from S3, runs a warmup prediction and then swaps
+        it in for all subsequent requests.
+
+        Args:
+            model_version (Optional[str]): ETag already read by the caller, if any.
+
+        Returns:
+            ServedModel: Snapshot of the newly served model.
+        """
+        try:
+            with self._lock:
+                logging.info("Loading production model into ModelHolder.")
+                start = time.perf_counter()
+
+                estimator = self._new_estimator()
+                if model_version is None:
+                    model_version = estimator.get_model_version()
+                with timed_stage("model_load"):
+                    model_format = self._load_model(estimator)
+                    self.warmup(estimator)
+
+                served = ServedModel(
+                    estimator=estimator,
+                    model_version=model_version,
+                    model_format=model_format,
+                    loaded_at=time.time(),
+                    load_seconds=time.perf_counter() - start,
+                )
+                # Single reference assignment: in-flight requests keep the old snapshot
+                self._served = served
+                if self.prediction_cache is not None:
+                    self.prediction_cache.reset(model_version)
+                MODEL_INFO.clear()
+                MODEL_INFO.labels(model_version=model_version or "", model_format=model_format).set(1)
+
+                logging.info(
+                    f"Production model version {model_version} ({model_format}) loaded and warmed up "
+                    f"in {served.load_seconds:.3f}s."
+                )
+                return served
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def refresh(self) -> bool:
+        """
+        Loads the model again if its S3 ETag differs from the served version.
+
+        Returns:
+            bool: True if a new model was swapped in.
+        """
+        try:
+            latest_version = self._new_estimator().get_model_version()
+            if latest_version is None:
+                logging.warning("Production model not found in S3; keeping the served model.")
+                return False
+            if latest_version == self.model_version:
+                return False
+
+            logging.info(f"Model version changed from {self.model_version} to {latest_version}.")
+            self.load(model_version=latest_version)
+            return True
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    @staticmethod
+    def warmup(estimator: Proj1Estimator) -> None:
+        """
+        Runs a single prediction through the estimator to initialise lazily
+        created state before the model starts serving traffic.
+        """
+        try:
+            estimator.predict(DataFrame(WARMUP_RECORD))
+        except Exception as e:
+            raise CustomException(f"Warmup prediction failed: {e}", sys) from e
+
+    def get_served_model(self) -> ServedModel:
+        """
+        Returns the current model snapshot, loading it first if startup
+        loading did not happen or failed.
+        """
+        if self._served is None:
+            with self._lock:
+                if self._served is None:
+                    self.load()
+        return self._served
+
+    def get_estimator(self) -> Proj1Estimator:
+        """
+        Returns the estimator of the current model snapshot.
+        """
+        return self.get_served_model().estimator
+
+    def status(self) -> dict:
+        """
+        Returns a readiness report for the health endpoint.
+        """
+        served = self._served
+        return {
+            "ready": served is not None,
+            "bucket_name": self.prediction_pipeline_config.model_bucket_name,
+            "model_path": self.prediction_pipeline_config.model_file_path,
+            "model_version": served.model_version if served else None,
+            "model_format": served.model_format if served else None,
+            "loaded_at": served.loaded_at if served else None,
+            "load_seconds": served.load_seconds if served else None,
+            "prediction_cache": self.prediction_cache.stats() if self.prediction_cache else None,
+        }
+
+
+# Shared instance used by the serving application and VehicleDataClassifier
+model_holder = ModelHolder()
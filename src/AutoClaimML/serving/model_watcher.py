@@ -0,0 +1,56 @@
+# model_watcher.py
+
+import asyncio
+from typing import Optional
+
+from AutoClaimML.serving.model_holder import ModelHolder
+from AutoClaimML.logger import logging
+
+
+class ModelWatcher:
+    """
+    Background task that polls the model object in S3 (HEAD request only) and
+    hot-swaps the served model when its ETag changes, without restarting the worker.
+    """
+
+    def __init__(self, holder: ModelHolder, poll_interval_seconds: float) -> None:
+        """
+        :param holder: Model holder to refresh.
+        :param poll_interval_seconds: Delay between two S3 ETag checks.
+        """
+        self.holder = holder
+        self.poll_interval_seconds = poll_interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval_seconds)
+            try:
+                # Load and warmup run in a worker thread, off the request path
+                swapped = await asyncio.to_thread(self.holder.refresh)
+                if swapped:
+                    logging.info(f"ModelWatcher swapped in model version {self.holder.model_version}.")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"ModelWatcher failed to refresh the model: {e}")
+
+    def start(self) -> None:
+        """
+        Starts polling on the running event loop.
+        """
+        if self._task is None:
+            logging.info(f"Starting ModelWatcher with a {self.poll_interval_seconds}s poll interval.")
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Cancels the polling task and waits for it to finish.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
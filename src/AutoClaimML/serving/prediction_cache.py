@@ -0,0 +1,165 @@
+# prediction_cache.py
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from AutoClaimML.serving.metrics import (PREDICTION_CACHE_ENTRIES, PREDICTION_CACHE_EVICTIONS,
+                                         PREDICTION_CACHE_HITS, PREDICTION_CACHE_MISSES)
+from AutoClaimML.logger import logging
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of predictions with a time-to-live, keyed by the model
+    version and a digest of the encoded (post-preprocessing) feature row.
+
+    Keying on the encoded row makes equivalent inputs share an entry
+    ("35", 35 and 35.0 all encode to the same float64 row). Entries belong to
+    one model version: `reset` drops them when a new model is swapped in, and
+    results computed by the previous model after that are not stored.
+
+    Safe to use from the inference executor threads.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        """
+        :param max_entries: Maximum number of cached rows; the least recently used are evicted.
+        :param ttl_seconds: Time after which an entry is no longer served.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[Optional[str], bytes], Tuple[object, float]]" = OrderedDict()
+        self._model_version: Optional[str] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def row_digests(features: np.ndarray) -> List[bytes]:
+        """
+        Returns one digest per row of an encoded feature matrix.
+        """
+        # Adding 0.0 turns -0.0 into 0.0, so both spellings of zero share a key
+        rows = np.ascontiguousarray(np.asarray(features, dtype=np.float64) + 0.0)
+        return [hashlib.blake2b(row.tobytes(), digest_size=16).digest() for row in rows]
+
+    def reset(self, model_version: Optional[str]) -> None:
+        """
+        Drops every entry and starts caching results of `model_version`.
+        """
+        with self._lock:
+            dropped = len(self._entries)
+            self._entries.clear()
+            self._model_version = model_version
+        if dropped:
+            self._record_eviction("invalidated", dropped)
+            logging.info(f"Prediction cache cleared ({dropped} entries) for model version {model_version}.")
+        PREDICTION_CACHE_ENTRIES.set(0)
+
+    def _record_eviction(self, reason: str, count: int = 1) -> None:
+        with self._lock:
+            self.evictions += count
+        PREDICTION_CACHE_EVICTIONS.labels(reason=reason).inc(count)
+
+    def get_many(self, model_version: Optional[str], digests: Sequence[bytes]) -> List[Optional[object]]:
+        """
+        Looks up rows by digest; missing or expired rows come back as None.
+        """
+        now = time.monotonic()
+        results: List[Optional[object]] = []
+        expired = 0
+        with self._lock:
+            for digest in digests:
+                key = (model_version, digest)
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] <= now:
+                    del self._entries[key]
+                    expired += 1
+                    entry = None
+                if entry is None:
+                    results.append(None)
+                else:
+                    self._entries.move_to_end(key)
+                    results.append(entry[0])
+            n_hits = sum(result is not None for result in results)
+            self.hits += n_hits
+            self.misses += len(results) - n_hits
+
+        PREDICTION_CACHE_HITS.inc(n_hits)
+        PREDICTION_CACHE_MISSES.inc(len(results) - n_hits)
+        if expired:
+            self._record_eviction("expired", expired)
+        return results
+
+    def put_many(self, model_version: Optional[str], digests: Sequence[bytes], values: Sequence[object]) -> None:
+        """
+        Stores predictions of `model_version`; ignored once another version is served.
+        """
+        expires_at = time.monotonic() + self.ttl_seconds
+        evicted = 0
+        with self._lock:
+            if model_version != self._model_version:
+                return
+            for digest, value in zip(digests, values):
+                key = (model_version, digest)
+                self._entries[key] = (value, expires_at)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            n_entries = len(self._entries)
+
+        PREDICTION_CACHE_ENTRIES.set(n_entries)
+        if evicted:
+            self._record_eviction("capacity", evicted)
+
+    def predict(
+        self,
+        model_version: Optional[str],
+        features: np.ndarray,
+        predict_fn: Callable[[np.ndarray], np.ndarray]
+    ) -> np.ndarray:
+        """
+        Returns predictions for an encoded feature matrix, calling `predict_fn`
+        only for the rows that are not cached.
+
+        :param model_version: Version of the model behind `predict_fn`.
+        :param features: Encoded feature rows.
+        :param predict_fn: Scores a feature matrix, one prediction per row.
+        :return: Predictions in row order.
+        """
+        digests = self.row_digests(features)
+        cached = self.get_many(model_version, digests)
+        missing = [i for i, value in enumerate(cached) if value is None]
+        if not missing:
+            return np.asarray(cached)
+
+        scored = predict_fn(features[missing])
+        self.put_many(model_version, [digests[i] for i in missing], scored.tolist())
+        if len(missing) == len(cached):
+            return scored
+
+        for i, value in zip(missing, scored.tolist()):
+            cached[i] = value
+        return np.asarray(cached)
+
+    def stats(self) -> dict:
+        """
+        Returns the cache size and counters.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "model_version": self._model_version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else None,
+        }
@@ -0,0 +1,58 @@
+# request_metrics.py
+
+import time
+
+from AutoClaimML.serving.metrics import (HTTP_REQUEST_DURATION_SECONDS, HTTP_REQUEST_ERRORS,
+                                         HTTP_REQUESTS)
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware counting HTTP requests and errors and timing them per route.
+
+    Written as plain ASGI rather than BaseHTTPMiddleware so it adds no task or
+    body buffering per request and leaves streaming responses untouched. The
+    duration covers the time until the response starts (headers sent).
+    Requests that match no route are labelled "unmatched", so unknown paths
+    cannot create new metric series.
+    """
+
+    def __init__(self, app, excluded_paths=("/metrics",)) -> None:
+        """
+        :param app: The wrapped ASGI application.
+        :param excluded_paths: Paths not measured, e.g. the scrape endpoint itself.
+        """
+        self.app = app
+        self.excluded_paths = frozenset(excluded_paths)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = {"code": 500, "observed": False}
+
+        def observe() -> None:
+            if status["observed"]:
+                return
+            status["observed"] = True
+            route = scope.get("route")
+            labels = (scope["method"], getattr(route, "path", "unmatched"))
+            code = str(status["code"])
+            HTTP_REQUEST_DURATION_SECONDS.labels(*labels).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(*labels, code).inc()
+            if status["code"] >= 400:
+                HTTP_REQUEST_ERRORS.labels(*labels, code).inc()
+
+        async def send_wrapper(message) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                observe()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Unhandled exceptions never start a response; count them as 500s
+            observe()
@@ -0,0 +1,44 @@
+# server_timing.py
+
+import time
+
+from AutoClaimML.utils.stage_timing import start_request_stages
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware adding a `Server-Timing` header with the time each request
+    spent per stage (parse, encode, transform, predict, model_load, ...) and in
+    total, in milliseconds, e.g.:
+
+        Server-Timing: parse;dur=0.21, encode;dur=0.04, predict;dur=0.35, total;dur=1.12
+
+    Stages come from timed_stage; the app registers record_request_stage as an
+    observer when this middleware is enabled. For streamed responses the
+    header covers the work done before the first piece was sent.
+    """
+
+    def __init__(self, app) -> None:
+        """
+        :param app: The wrapped ASGI application.
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        stages = start_request_stages()
+
+        async def send_wrapper(message) -> None:
+            if message["type"] == "http.response.start":
+                metrics = [f"{stage};dur={seconds * 1000:.3f}" for stage, seconds in stages.items()]
+                metrics.append(f"total;dur={(time.perf_counter() - start) * 1000:.3f}")
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", ", ".join(metrics).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
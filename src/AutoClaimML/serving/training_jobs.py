@@ -0,0 +1,358 @@
+# training_jobs.py
+
+import asyncio
+import fcntl
+import glob
+import json
+import multiprocessing
+import os
+import queue
+import re
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from AutoClaimML.serving.metrics import TRAINING_JOBS_ACTIVE
+from AutoClaimML.logger import logging
+
+
+# Job statuses
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+_JOB_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+
+def _run_training_process(progress_queue) -> None:
+    """
+    Entry point of the spawned training process. The training stack is imported
+    here, so the serving process itself never has to load it.
+    """
+    from AutoClaimML.pipeline.training_pipeline import run_training_pipeline
+    run_training_pipeline(progress_queue=progress_queue)
+
+
+@dataclass
+class TrainingJob:
+    job_id: str
+    status: str = QUEUED
+    current_stage: Optional[str] = None
+    stages: Dict[str, str] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class TrainingJobManager:
+    """
+    Runs `TrainingPipeline` as background jobs, one isolated (spawned) process
+    per job, and tracks per-stage progress reported by the pipeline.
+
+    Only one training job is active at a time: submitting while a job is
+    queued or running returns that job instead of starting a duplicate.
+
+    With `state_dir`, job state is shared by the worker processes of a server
+    on one host: every job is saved there as JSON and submissions hold a file
+    lock, so duplicates collapse across workers and any worker can report a
+    job. The worker running a job (its owner) also performs cancellations
+    requested through other workers, which leave a marker file it polls.
+    Without `state_dir`, jobs are only visible to the process that started
+    them, which requires running the server with a single worker.
+    """
+
+    LOCK_FILE_NAME = "jobs.lock"
+
+    def __init__(
+        self,
+        stages: List[str],
+        history_size: int,
+        poll_interval_seconds: float,
+        cancel_grace_seconds: float,
+        state_dir: Optional[str] = None
+    ) -> None:
+        """
+        :param stages: Pipeline stage names, in order, shown as "pending" until reached.
+        :param history_size: Number of finished jobs kept for status queries.
+        :param poll_interval_seconds: How often the child process is checked for progress.
+        :param cancel_grace_seconds: Time allowed after SIGTERM before the child is killed.
+        :param state_dir: Directory sharing job state between worker processes, if any.
+        """
+        self.stages = list(stages)
+        self.history_size = history_size
+        self.poll_interval_seconds = poll_interval_seconds
+        self.cancel_grace_seconds = cancel_grace_seconds
+        # Created on the first write, so building the manager touches no files
+        self.state_dir = state_dir
+        self._context = multiprocessing.get_context("spawn")
+        self._jobs: "OrderedDict[str, TrainingJob]" = OrderedDict()
+        self._processes: Dict[str, multiprocessing.Process] = {}
+        self._monitors: Dict[str, asyncio.Task] = {}
+        self._cancelled: set = set()
+
+    def _job_path(self, job_id: str) -> str:
+        return os.path.join(self.state_dir, f"{job_id}.json")
+
+    def _cancel_path(self, job_id: str) -> str:
+        return os.path.join(self.state_dir, f"{job_id}.cancel")
+
+    @contextmanager
+    def _state_lock(self) -> Iterator[None]:
+        """
+        Holds the lock serializing submissions across worker processes.
+        """
+        os.makedirs(self.state_dir, exist_ok=True)
+        with open(os.path.join(self.state_dir, self.LOCK_FILE_NAME), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _save(self, job: TrainingJob) -> None:
+        """
+        Publishes the state of a job owned by this process to the other workers.
+        """
+        if self.state_dir is None:
+            return
+        os.makedirs(self.state_dir, exist_ok=True)
+        path = self._job_path(job.job_id)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as state_file:
+            json.dump({"owner_pid": os.getpid(), "job": job.to_dict()}, state_file)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _is_process_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def _load(self, job_id: str) -> Optional[TrainingJob]:
+        """
+        Reads a job from the shared state. An active job whose owner has exited
+        is marked failed, as nothing will ever finish it.
+        """
+        if self.state_dir is None or not _JOB_ID_PATTERN.fullmatch(job_id):
+            return None
+        try:
+            with open(self._job_path(job_id)) as state_file:
+                state = json.load(state_file)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        job = TrainingJob(**state["job"])
+        if job.status in ACTIVE_STATUSES and not self._is_process_alive(state["owner_pid"]):
+            job.status = FAILED
+            job.error = f"Worker process {state['owner_pid']} running the job exited."
+            job.finished_at = time.time()
+            self._save(job)
+        return job
+
+    def _shared_jobs(self) -> List[TrainingJob]:
+        paths = glob.glob(os.path.join(self.state_dir, "*.json"))
+        jobs = [self._load(os.path.basename(path)[:-len(".json")]) for path in paths]
+        return sorted((job for job in jobs if job is not None), key=lambda job: job.created_at)
+
+    def _cancel_requested(self, job_id: str) -> bool:
+        return self.state_dir is not None and os.path.exists(self._cancel_path(job_id))
+
+    def _active_job(self) -> Optional[TrainingJob]:
+        for job in self._jobs.values():
+            if job.status in ACTIVE_STATUSES:
+                return job
+        if self.state_dir is not None:
+            for job in self._shared_jobs():
+                if job.status in ACTIVE_STATUSES:
+                    return job
+        return None
+
+    def _update_gauge(self) -> None:
+        TRAINING_JOBS_ACTIVE.set(sum(job.status in ACTIVE_STATUSES for job in self._jobs.values()))
+
+    def _trim_history(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.status not in ACTIVE_STATUSES]
+        for job_id in finished[:max(0, len(finished) - self.history_size)]:
+            del self._jobs[job_id]
+
+        if self.state_dir is not None:
+            finished = [job.job_id for job in self._shared_jobs() if job.status not in ACTIVE_STATUSES]
+            for job_id in finished[:max(0, len(finished) - self.history_size)]:
+                for path in (self._job_path(job_id), self._cancel_path(job_id)):
+                    if os.path.exists(path):
+                        os.remove(path)
+
+    def submit(self) -> Tuple[TrainingJob, bool]:
+        """
+        Enqueues a training run, or returns the one already in progress.
+
+        :return: Tuple of (job, created) where created is False for a deduplicated request.
+        """
+        with self._state_lock() if self.state_dir is not None else nullcontext():
+            active = self._active_job()
+            if active is not None:
+                logging.info(f"Training job {active.job_id} already {active.status}; not starting another.")
+                return active, False
+
+            job = TrainingJob(job_id=uuid.uuid4().hex, stages={stage: "pending" for stage in self.stages})
+            self._jobs[job.job_id] = job
+            self._save(job)
+            self._trim_history()
+        self._update_gauge()
+
+        self._monitors[job.job_id] = asyncio.get_running_loop().create_task(self._run(job))
+        logging.info(f"Training job {job.job_id} queued.")
+        return job, True
+
+    def get(self, job_id: str) -> Optional[TrainingJob]:
+        """
+        Returns the job with the given id, or None if unknown.
+        """
+        job = self._jobs.get(job_id)
+        return job if job is not None else self._load(job_id)
+
+    async def cancel(self, job_id: str) -> Optional[TrainingJob]:
+        """
+        Cancels a queued or running job. A running job's process is terminated.
+
+        :return: The job, or None if unknown.
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return await self._cancel_shared(job_id)
+        if job.status not in ACTIVE_STATUSES:
+            return job
+
+        logging.info(f"Cancelling training job {job_id}.")
+        await self._terminate(job_id)
+
+        monitor = self._monitors.get(job_id)
+        if monitor is not None:
+            await asyncio.wait([monitor])
+        return job
+
+    async def _terminate(self, job_id: str) -> None:
+        self._cancelled.add(job_id)
+        process = self._processes.get(job_id)
+        if process is not None and process.is_alive():
+            process.terminate()
+            await asyncio.to_thread(process.join, self.cancel_grace_seconds)
+            if process.is_alive():
+                process.kill()
+
+    async def _cancel_shared(self, job_id: str) -> Optional[TrainingJob]:
+        """
+        Asks the worker owning a job to cancel it and waits for the outcome.
+        """
+        job = self._load(job_id)
+        if job is None or job.status not in ACTIVE_STATUSES:
+            return job
+
+        logging.info(f"Requesting cancellation of training job {job_id} from the worker running it.")
+        open(self._cancel_path(job_id), "w").close()
+        deadline = time.monotonic() + self.cancel_grace_seconds + 2 * self.poll_interval_seconds
+        while job.status in ACTIVE_STATUSES and time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval_seconds)
+            job = self._load(job_id) or job
+        return job
+
+    async def shutdown(self) -> None:
+        """
+        Cancels every active job, e.g. when the server stops.
+        """
+        for job in list(self._jobs.values()):
+            if job.status in ACTIVE_STATUSES:
+                await self.cancel(job.job_id)
+
+    @staticmethod
+    def _apply_progress(job: TrainingJob, stage: str, event: str) -> None:
+        if stage == "pipeline":
+            job.error = event
+            return
+        job.stages[stage] = event
+        if event == "started":
+            job.current_stage = stage
+
+    def _drain(self, job: TrainingJob, progress_queue) -> None:
+        while True:
+            try:
+                stage, event = progress_queue.get_nowait()
+            except queue.Empty:
+                return
+            self._apply_progress(job, stage, event)
+
+    async def _run(self, job: TrainingJob) -> None:
+        progress_queue = self._context.Queue()
+        process = self._context.Process(
+            target=_run_training_process,
+            kwargs={"progress_queue": progress_queue},
+            name=f"training-{job.job_id[:8]}",
+            daemon=True,
+        )
+        try:
+            if job.job_id in self._cancelled or self._cancel_requested(job.job_id):
+                self._cancelled.add(job.job_id)
+                return
+
+            process.start()
+            self._processes[job.job_id] = process
+            job.status = RUNNING
+            job.started_at = time.time()
+            logging.info(f"Training job {job.job_id} started in process {process.pid}.")
+
+            while process.is_alive():
+                self._drain(job, progress_queue)
+                self._save(job)
+                if self._cancel_requested(job.job_id) and job.job_id not in self._cancelled:
+                    logging.info(f"Cancelling training job {job.job_id} as requested by another worker.")
+                    await self._terminate(job.job_id)
+                    continue
+                await asyncio.sleep(self.poll_interval_seconds)
+
+            await asyncio.to_thread(process.join)
+            self._drain(job, progress_queue)
+
+            if job.job_id in self._cancelled:
+                return
+            if process.exitcode == 0:
+                job.status = SUCCEEDED
+            else:
+                job.status = FAILED
+                job.error = job.error or f"Training process exited with code {process.exitcode}."
+            logging.info(f"Training job {job.job_id} finished with status {job.status}.")
+
+        except Exception as e:
+            job.status = FAILED
+            job.error = f"{e}"
+            logging.error(f"Training job {job.job_id} failed to run: {e}")
+        finally:
+            if job.job_id in self._cancelled:
+                job.status = CANCELLED
+                self._cancelled.discard(job.job_id)
+            # The stage that was running when the job stopped takes the job's outcome
+            if job.current_stage and job.stages.get(job.current_stage) == "started" \
+                    and job.status in (FAILED, CANCELLED):
+                job.stages[job.current_stage] = job.status
+            job.finished_at = time.time()
+            self._save(job)
+            if self._cancel_requested(job.job_id):
+                os.remove(self._cancel_path(job.job_id))
+            self._processes.pop(job.job_id, None)
+            self._monitors.pop(job.job_id, None)
+            progress_queue.close()
+            self._update_gauge()
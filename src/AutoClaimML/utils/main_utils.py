@@ -2,6 +2,9 @@
 
 import os 
 import sys
+import mmap
+import pickle
+import struct
 import numpy as np 
 from pandas import DataFrame
 import dill 
@@ -140,4 +143,96 @@ def save_object(file_path: str, obj: object) -> None:
 
 
 
+# Layout of files written by save_mmap_object:
+#   magic | n_buffers | payload length | n_buffers x (offset, length) | pickle payload | buffers
+# Every buffer starts on an aligned offset so it can be viewed in place from the mapping.
+MMAP_OBJECT_MAGIC = b"ACMMAP01"
+MMAP_OBJECT_ALIGNMENT = 64
+_MMAP_HEADER = struct.Struct("<8sQQ")
+_MMAP_BUFFER_ENTRY = struct.Struct("<QQ")
 
+
+def _align(offset: int) -> int:
+    return -(-offset // MMAP_OBJECT_ALIGNMENT) * MMAP_OBJECT_ALIGNMENT
+
+
+def save_mmap_object(file_path: str, obj: object) -> None:
+    """
+    Saves a Python object in a memory-mappable format: the object is pickled
+    with protocol 5 and its contiguous numpy arrays are written out-of-band
+    as raw, aligned bytes after the pickle payload.
+
+    Args:
+        file_path (str): Path where the object should be saved.
+        obj (object): The Python object to serialize.
+    """
+    logging.info("Starting save_mmap_object...")
+
+    try:
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+
+        buffers = []
+        payload = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+        raw_buffers = [buffer.raw() for buffer in buffers]
+
+        offset = _MMAP_HEADER.size + _MMAP_BUFFER_ENTRY.size * len(raw_buffers) + len(payload)
+        entries = []
+        for raw in raw_buffers:
+            offset = _align(offset)
+            entries.append((offset, raw.nbytes))
+            offset += raw.nbytes
+
+        with open(file_path, "wb") as file_obj:
+            file_obj.write(_MMAP_HEADER.pack(MMAP_OBJECT_MAGIC, len(raw_buffers), len(payload)))
+            for entry in entries:
+                file_obj.write(_MMAP_BUFFER_ENTRY.pack(*entry))
+            file_obj.write(payload)
+            for (buffer_offset, _), raw in zip(entries, raw_buffers):
+                file_obj.write(b"\0" * (buffer_offset - file_obj.tell()))
+                file_obj.write(raw)
+
+        logging.info(f"Object saved with {len(raw_buffers)} mappable buffers at {file_path}")
+
+    except Exception as e:
+        logging.error("Failed to save mmap object.")
+        raise CustomException(e, sys)
+
+
+
+def load_mmap_object(file_path: str) -> object:
+    """
+    Loads an object written by save_mmap_object. Its numpy arrays are read-only
+    views of a shared, read-only mapping of the file, so every process loading
+    the same file shares one page-cache copy of them.
+
+    Args:
+        file_path (str): Path to the serialized file.
+
+    Returns:
+        object: The deserialized Python object.
+    """
+    try:
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found at path: {file_path}")
+
+        with open(file_path, "rb") as file_obj:
+            mapping = mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # The arrays keep the mapping alive through these views
+        view = memoryview(mapping)
+        magic, n_buffers, payload_length = _MMAP_HEADER.unpack_from(view, 0)
+        if magic != MMAP_OBJECT_MAGIC:
+            raise ValueError(f"{file_path} is not a memory-mappable object file.")
+
+        offset = _MMAP_HEADER.size
+        buffers = []
+        for _ in range(n_buffers):
+            buffer_offset, length = _MMAP_BUFFER_ENTRY.unpack_from(view, offset)
+            buffers.append(view[buffer_offset:buffer_offset + length])
+            offset += _MMAP_BUFFER_ENTRY.size
+
+        return pickle.loads(view[offset:offset + payload_length], buffers=buffers)
+
+    except Exception as e:
+        logging.error(f"Failed to load mmap object from file: {file_path}")
+        raise CustomException(e, sys)
@@ -0,0 +1,75 @@
+# stage_timing.py
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional
+
+# Callables receiving (stage, seconds) for every timed stage
+StageObserver = Callable[[str, float], None]
+
+_observers: List[StageObserver] = []
+
+# Stage totals of the request being handled, when a collector was started for it
+_request_stages: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_stages", default=None)
+
+
+def add_stage_observer(observer: StageObserver) -> None:
+    """
+    Registers a callable notified with (stage, seconds) after each timed stage,
+    e.g. the serving app's Prometheus histogram.
+    """
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def remove_stage_observer(observer: StageObserver) -> None:
+    """
+    Unregisters an observer added with add_stage_observer.
+    """
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+@contextmanager
+def timed_stage(stage: str) -> Iterator[None]:
+    """
+    Times the enclosed block as `stage` and reports it to the registered
+    observers. Without observers (training, offline jobs) nothing is timed.
+
+    Usage:
+        with timed_stage("transform"):
+            features = preprocessing_object.transform(dataframe)
+    """
+    if not _observers:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        for observer in _observers:
+            observer(stage, seconds)
+
+
+def start_request_stages() -> Dict[str, float]:
+    """
+    Starts collecting the stages timed in the current context (one request)
+    and returns the dict receiving their total seconds per stage.
+
+    Executor tasks must run in a copy of the request's context to report into it.
+    """
+    stages: Dict[str, float] = {}
+    _request_stages.set(stages)
+    return stages
+
+
+def record_request_stage(stage: str, seconds: float) -> None:
+    """
+    Stage observer adding `seconds` to the current request's collector, if any.
+    """
+    stages = _request_stages.get()
+    if stages is not None:
+        stages[stage] = stages.get(stage, 0.0) + seconds